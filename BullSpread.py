@@ -12,6 +12,7 @@ from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_
 from Vanilla.VanillaCall_Plotting import plot_call_payoff
 from exotic_greeks import (call_vomma,put_vomma,call_vanna,put_vanna,call_charm,put_charm,call_zomma,put_zomma,call_color,put_color,call_speed,put_speed,call_ultima,put_ultima,plot_vomma_,plot_vanna_,plot_charm_,plot_zomma_,plot_color_,plot_speed_,plot_ultima_)
  
+from implied_vol import implied_vol
 from Vanilla.vanilla_greeks import (phi, gamma, vega, call_delta, call_theta, call_rho, put_delta, put_theta, put_rho, plot_call_theta_, plot_gamma_, plot_call_rho_, plot_vega_, plot_call_delta_, plot_call_greeks_, plot_multiple_deltas, plot_all_greeks)
 
 
@@ -24,7 +25,7 @@ S = 32.21
 K = 32.21
 r = 3.97
 T = 1
-div_yield =
+div_yield = 0.0
  
 maturities = [2,1,0.5]
  
@@ -45,7 +46,6 @@ greek_you_want = 'delta'
 
 
 # the demo-parameters you will build
-u
  
 # N.B. Here, you choose the underlying price scenario yourself - this can be done with a Monte-carlo simulation if wanted, and you could extract 3 random prices if you wanted to, for example.  
  
@@ -66,7 +66,8 @@ def BullSpread_Price(
                     K,  #strike will always equal spot price * a parameter  
                     r,
                     T,
-                    show=True):
+                    show=True,
+                    leg_vols=None):
  
     '''
     Parameters:
@@ -74,19 +75,47 @@ def BullSpread_Price(
     short_call_strike = if otm (e.g. 120%) input 1.2
     short_put_strike = if atm then input = 1
     long_put_strike = if otm then (e.g. 80%), then input = 0.8
+    leg_vols = optional dict from mark_leg_vols (ATM_vol, short_call_vol, long_put_vol); default: the vols above
     '''
  
+    vols = {"ATM_vol": ATM_vol, "short_call_vol": short_call_vol, "long_put_vol": long_put_vol}
+    vols.update(leg_vols or {})
+
     # calculate option values
-    long_call = black_scholes_call_value(S, K * long_call_strike, r, T, ATM_vol)
-    short_call = black_scholes_call_value(S, K * short_call_strike, r, T, short_call_vol)
-    short_put = black_scholes_put_value(S, K * short_put_strike, r, T, ATM_vol)
-    long_put = black_scholes_put_value(S, K * long_put_strike, r, T, long_put_vol)
+    long_call = black_scholes_call_value(S, K * long_call_strike, r, T, vols["ATM_vol"])
+    short_call = black_scholes_call_value(S, K * short_call_strike, r, T, vols["short_call_vol"])
+    short_put = black_scholes_put_value(S, K * short_put_strike, r, T, vols["ATM_vol"])
+    long_put = black_scholes_put_value(S, K * long_put_strike, r, T, vols["long_put_vol"])
  
     BullSpread_Price = long_call - short_call - short_put + long_put # total value of the BullSpread Price
    
     return BullSpread_Price
 
 
+def mark_leg_vols(S, K, r, T, long_call_price, short_call_price, long_put_price, div_yield=0.0):
+    '''
+    Marks the leg vols from market quotes of the legs, in one vectorized implied-vol call
+    (quotes can be arrays, e.g. one per tick).
+
+    Parameters:
+    - S, K, r, T: Spot, reference strike, rate and maturity (strikes are K * the strike parameters above)
+    - long_call_price: Quote of the long_call_strike call (the ATM leg)
+    - short_call_price: Quote of the short_call_strike call
+    - long_put_price: Quote of the long_put_strike put
+    - div_yield: Continuous dividend yield (default is 0)
+
+    Returns:
+    - dict with 'ATM_vol', 'short_call_vol' and 'long_put_vol' (NaN where a quote is not arbitrage-free),
+      to pass as BullSpread_Price(..., leg_vols=...)
+    '''
+    quotes = np.stack(np.broadcast_arrays(long_call_price, short_call_price, long_put_price))
+    strikes = K * np.array([long_call_strike, short_call_strike, long_put_strike])
+    strikes = strikes.reshape((3,) + (1,) * (quotes.ndim - 1))
+    types = np.array(['call', 'call', 'put']).reshape(strikes.shape)
+    vols = implied_vol(quotes, S, strikes, r, T, div_yield, types)
+    return {"ATM_vol": vols[0], "short_call_vol": vols[1], "long_put_vol": vols[2]}
+
+
 def plot_BullSpread(
                     S, #initial price
                     K,  #strike will always equal spot price * a parameter  
@@ -1,4 +1,10 @@
 from miscellaneous import simulate_gbm
+from gbm import terminal_prices, regenerate_paths
+from mc_stats import reduce_payoffs
+from barrier_monitoring import barrier_hit
+from mc_greeks import barrier_greeks
+from barrier_analytic import barrier_price, closed_form_available, monitoring_interval
+from control_variate import vanilla_control_variate
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
@@ -20,48 +26,114 @@ dt = T / N
 discount_factor = np.exp(-r * T)
 observation = 'daily' #european if you want european
 div_yield = 0.003
+random_seed = 102 # with sampling='philox' any single path can be regenerated from (random_seed, index)
 
-
-# Let's simulate the GBM paths here --------------------------------------------------
-gbm_sims = simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt, n_sims=n_sims, N=N, div_yield=div_yield)
  
-def DownAndInPut(gbm_sims, K, BARRIER, discount_factor, observation='european'):
+def DownAndInPut_payoff(gbm_sims, K, BARRIER, observation='european', sigma=None, dt=None):
+    """
+    Per-path (undiscounted) pay-off of a down-and-in put, and the knock-in flags.
+    Works on the full path matrix, one block of it, or a gbm.PathSummary.
+    With sigma and dt (the simulation grid) the barrier check uses the Brownian-bridge
+    correction (see barrier_monitoring.barrier_hit) and hit is a knock-in probability.
+    """
+ 
+    hit = barrier_hit(gbm_sims, BARRIER, 'down', observation, sigma, dt)
+ 
+    # value if hit (checks each row to calculate the payoff with the last value(price) )
+    # terminal_prices takes the value at the final time-step T of every simulated path
+    payoff = hit * np.maximum(0, K - terminal_prices(gbm_sims))
+ 
+    return payoff, hit
+ 
+def DownAndInPut_estimate(gbm_sims, K, BARRIER, discount_factor, observation='european', paired=False,
+                          sigma=None, dt=None):
+    """
+    Monte-Carlo estimate (price, std error, variance, hit rate) of a down-and-in put.
+    gbm_sims is the full path matrix, a stream of blocks (gbm.stream_gbm) or a gbm.PathSummary.
+    paired = True for antithetic paths, so the std error is computed over pair means.
+    """
+    return reduce_payoffs(
+        gbm_sims,
+        lambda block: DownAndInPut_payoff(block, K, BARRIER, observation, sigma, dt),
+        discount_factor,
+        paired,
+    )
+ 
+def DownAndInPut_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield=0.0, observation='daily', paired=False):
+    """
+    Price, delta, gamma, vega and rho of the down-and-in put with their standard errors, all from the same
+    paths (see mc_greeks.barrier_greeks for the estimators); the paths must be simulated under Q.
+    """
+    return barrier_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield, 'down-and-in', 'put', observation, paired=paired)
+ 
+def DownAndInPut_cv_estimate(gbm_sims, K, BARRIER, S_0, r, T, sigma, div_yield=0.0, observation='european', paired=False,
+                             dt=None):
+    """
+    Control-variate estimate of the down-and-in put: the pay-off is regressed on the same-path
+    vanilla pay-off, whose exact price comes from Vanilla.blackscholesvanilla.
+    gbm_sims must be simulated with mu = r and the same div_yield.
+    Returns a control_variate.CVEstimate (price, std error, beta, variance reduction factor, ...).
+    """
+    return vanilla_control_variate(
+        gbm_sims,
+        lambda block: DownAndInPut_payoff(block, K, BARRIER, observation, sigma, dt),
+        K, S_0, r, T, sigma, div_yield, 'put', paired,
+    )
+ 
+def DownAndInPut(gbm_sims, K, BARRIER, discount_factor, observation='european', paired=False,
+                 sigma=None, dt=None, S_0=None, T=None, div_yield=0.0, rebate=0.0, method='mc'):
     """
     Prices an Down-And-In European Put with Monte-Carlo.
     observation = 'european' → barrier checked only at maturity
     observation = 'daily' → barrier checked every day
+    observation = 'continuous' → Brownian-bridge crossing probability (needs sigma, dt)
+    observation = ObservationSchedule → barrier checked on its dates only (paths from schedule.simulate)
+    paired = True when gbm_sims come from variance_reduction='antithetic'
+    sigma, dt = simulation vol and step; given on a coarse grid they switch on the bridge correction
+    S_0, T, div_yield = spot, maturity and dividend yield; with them (and sigma) method='analytic' prices a
+    'daily' or 'continuous' barrier in closed form (barrier_analytic), vectorized over arrays
+    of S_0, K and BARRIER, and gbm_sims may be None
+    rebate = cash rebate (closed form only)
+    method = 'mc' (default), 'analytic' or 'auto' (closed form when possible, else Monte-Carlo)
     """
  
-    if observation.lower() == 'european':
-        hit = gbm_sims[:, -1] < BARRIER # final prices min
-    else: # 'daily'
-        hit = gbm_sims.min(axis=1) < BARRIER # path-wise min
+    if np.any(np.asarray(BARRIER) > K):
+        print("You should input a Barrier < K")
  
-    payoff = np.where(
-        hit, #value if true (checks each row to calculate the payoff with the last value(price) )
-                                            # takes all rows (every simulated path) and -1 takes the last column (i.e. the value at the final time-step T)
-        np.maximum(0, K - gbm_sims[:, -1]),
-        0)
+    if method != 'mc' and closed_form_available(S_0, T, sigma, observation):
+        r = -np.log(discount_factor) / T
+        premium = barrier_price(S_0, K, BARRIER, r, T, sigma, div_yield, 'down-and-in', 'put',
+                                rebate, monitoring_interval(observation))
+        print(f"{Fore.RED}Closed-form price of the Down and In Put: {np.round(premium, 4)}{Style.RESET_ALL}")
+        return premium if premium.ndim else float(premium)
+    if method == 'analytic':
+        raise ValueError("the closed form needs S_0, T, sigma and observation='daily' or 'continuous'")
+    if rebate:
+        raise ValueError("rebates are only priced in closed form")
  
-    if BARRIER > K:
-        print("You should input a Barrier < K")
+    estimate = DownAndInPut_estimate(gbm_sims, K, BARRIER, discount_factor, observation, paired, sigma, dt)
  
-    premium = discount_factor * payoff.mean()
-    print(f"Price of the Down and In Put: {premium:.4f}")
+    premium = estimate.price
+    print(f"Price of the Down and In Put: {premium:.4f} (std error {estimate.std_error:.4f})")
  
-    hit = (gbm_sims.max(axis=1) >= BARRIER)
-    hit_rate = hit.mean()
+    hit_rate = estimate.hit_rate
     print(f"{Fore.RED}Hit rate from MC simulation: {hit_rate * 100:.2f}%{Style.RESET_ALL}")
  
     return premium
  
 # Sample of simulated paths + barrier / strike ----------------------------------------------
-def plot_MC_DownAndInPut(n_sims, gbm_sims, BARRIER, K, show=True):
+def plot_MC_DownAndInPut(n_sims, gbm_sims=None, BARRIER=BARRIER, K=K, show=True):
+    """gbm_sims=None rebuilds only the sampled paths from the module parameters (sampling='philox')."""
     plt.figure(figsize=(9,4))
     sample = np.random.choice(n_sims, size=min(30, n_sims), replace=False)
- 
-    for idx in sample:
-        plt.plot(gbm_sims[idx], alpha=0.4)
+    if gbm_sims is None:
+        sample_paths = regenerate_paths(sample, s_0=S_0, mu=r, sigma=sigma, dt=dt, N=N,
+                                        div_yield=div_yield, random_seed=random_seed)
+    else:
+        sample_paths = gbm_sims[sample]
+ 
+    for path in sample_paths:
+        plt.plot(path, alpha=0.4)
     plt.axhline(BARRIER, color='red', ls='--', label=f'Barrier = {BARRIER}')
     plt.axhline(K, color='green', ls=':', label=f'Strike = {K}')
     plt.title('Subset of GBM paths')
@@ -74,11 +146,7 @@ def plot_MC_DownAndInPut(n_sims, gbm_sims, BARRIER, K, show=True):
  
 # Histogram of Monte-Carlo pay-offs (discounted) -----------------------------------------------
 def plot_hist_DownAndInPut(show=True):        
-    hit = gbm_sims.max(axis=1) > BARRIER
-    payoffs = np.where(
-        hit,
-        np.maximum(0, K- gbm_sims[:,-1]),
-        0)
+    payoffs, _ = DownAndInPut_payoff(gbm_sims, K, BARRIER, observation) # knock-in on the path minimum
  
     disc_pay = discount_factor * payoffs
  
@@ -120,9 +188,13 @@ def plot_DownAndInPut(show=True):
    
 if __name__ == "__main__":
 
+    # Let's simulate the GBM paths here --------------------------------------------------
+    gbm_sims = simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt, n_sims=n_sims, N=N, div_yield=div_yield,
+                            random_seed=random_seed, sampling='philox')
+
     plot_DownAndInPut(show=False)
     DownAndInPut(gbm_sims=gbm_sims, K=K, BARRIER=BARRIER, discount_factor=discount_factor)
     plot_hist_DownAndInPut(show=False)
-    plot_MC_DownAndInPut(n_sims=n_sims, gbm_sims=gbm_sims, BARRIER=BARRIER, K=K,show=False)
+    plot_MC_DownAndInPut(n_sims=n_sims, BARRIER=BARRIER, K=K,show=False)
  
     plt.show()
\ No newline at end of file
@@ -0,0 +1,183 @@
+from gbm import simulate_gbm, terminal_prices
+from mc_stats import reduce_payoffs
+from barrier_monitoring import barrier_hit
+from mc_greeks import barrier_greeks
+from barrier_analytic import barrier_price, closed_form_available, monitoring_interval
+from barrier_option import knock_out_rebate_payoff, knock_time_histogram
+from barrier_pde import barrier_pde
+import matplotlib.pyplot as plt
+import numpy as np
+from colorama import Fore, Style
+
+# Parameters ---------------------------------------------------------------------------------------------------------params
+
+S_0 = 100
+r = 0.04
+sigma = 0.3
+T = 1
+N = 252
+BARRIER = 80
+K = 100
+n_sims = 100_000
+dt = T / N
+discount_factor = np.exp(-r * T)
+div_yield = 0.003
+rebate = 2.0
+random_seed = 102
+
+# ----------------------------------- CODING A DOWN AND OUT CALL (Or Put) ----------------------------------------------
+
+def DownAndOut_payoff(gbm_sims, K, BARRIER, observation='european', option_type='call', sigma=None, dt=None):
+    """
+    Per-path (undiscounted) pay-off of a down-and-out call or put, and the knock-out flags.
+    Works on the full path matrix, one block of it, or a gbm.PathSummary.
+    With sigma and dt the barrier check uses the Brownian-bridge correction (see barrier_monitoring.barrier_hit).
+    """
+    hit = barrier_hit(gbm_sims, BARRIER, 'down', observation, sigma, dt)
+
+    if option_type.lower() == 'call':
+        payoff = (1 - hit) * np.maximum(0, terminal_prices(gbm_sims) - K)
+    else:
+        payoff = (1 - hit) * np.maximum(0, K - terminal_prices(gbm_sims))
+
+    return payoff, hit
+
+def DownAndOut_estimate(gbm_sims, K, BARRIER, discount_factor, observation='european', option_type='call', paired=False,
+                        sigma=None, dt=None):
+    """
+    Monte-Carlo estimate (price, std error, variance, hit rate) of a down-and-out option.
+    gbm_sims is the full path matrix, a stream of blocks (gbm.stream_gbm) or a gbm.PathSummary.
+    """
+    return reduce_payoffs(
+        gbm_sims,
+        lambda block: DownAndOut_payoff(block, K, BARRIER, observation, option_type, sigma, dt),
+        discount_factor,
+        paired,
+    )
+
+def DownAndOut_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield=0.0, observation='daily', option_type='call', paired=False):
+    """
+    Price, delta, gamma, vega and rho of a down-and-out option with their standard errors, all from the same
+    paths (see mc_greeks.barrier_greeks for the estimators); the paths must be simulated under Q.
+    """
+    return barrier_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield, 'down-and-out', option_type, observation, paired=paired)
+ 
+def DownAndOut_pde(S_0, K, BARRIER, r, T, sigma, div_yield=0.0, observation='daily', option_type='call', rebate=0.0,
+                   rebate_at='hit', **grid):
+    """
+    Crank–Nicolson price, delta, gamma and theta of a down-and-out option (see barrier_pde.pde_price),
+    with no Monte-Carlo noise; observation is 'continuous', 'daily', 'european' or an ObservationSchedule.
+    """
+    return barrier_pde(S_0, K, BARRIER, r, T, sigma, div_yield, 'down-and-out', option_type, observation,
+                       rebate, rebate_at, **grid)
+
+def DownAndOut(gbm_sims, K, BARRIER, discount_factor, observation='european', option_type='call', paired=False,
+               sigma=None, dt=None, S_0=None, T=None, div_yield=0.0, rebate=0.0, method='mc'):
+    """
+
+    Prices a down-and-out European call or put; same arguments as UpAndOut.UpAndOut.
+    observation = 'european' → barrier checked only at maturity
+    observation = 'daily' → barrier checked every day
+    observation = 'continuous' → Brownian-bridge crossing probability (needs sigma, dt)
+    observation = ObservationSchedule → barrier checked on its dates only (paths from schedule.simulate)
+    S_0, T, div_yield = with them (and sigma) method='analytic' prices a 'daily' or 'continuous' barrier in closed form
+    rebate = cash rebate paid at the knock-out (Monte-Carlo needs T and dt, see DownAndOut_WithRebate)
+    method = 'mc' (default), 'analytic', 'auto' (closed form when possible, else Monte-Carlo) or 'pde'
+    (Crank–Nicolson, needs S_0, T and sigma)
+
+    """
+    if method == 'pde':
+        if S_0 is None or T is None or sigma is None:
+            raise ValueError("the PDE engine needs S_0, T and sigma")
+        result = DownAndOut_pde(S_0, K, BARRIER, -np.log(discount_factor) / T, T, sigma, div_yield, observation,
+                                option_type, rebate)
+        print(f"{Fore.RED}PDE price of the down-and-out {option_type}: {result.price:.4f} "
+              f"(delta {result.delta:.4f}, gamma {result.gamma:.5f}, theta {result.theta:.4f}){Style.RESET_ALL}")
+        return result.price
+    if method != 'mc' and closed_form_available(S_0, T, sigma, observation):
+        r = -np.log(discount_factor) / T
+        premium = barrier_price(S_0, K, BARRIER, r, T, sigma, div_yield, 'down-and-out', option_type,
+                                rebate, monitoring_interval(observation))
+        print(f"{Fore.RED}Closed-form price of the down-and-out {option_type}: {np.round(premium, 4)}{Style.RESET_ALL}")
+        return premium if premium.ndim else float(premium)
+    if method == 'analytic':
+        raise ValueError("the closed form needs S_0, T, sigma and observation='daily' or 'continuous'")
+    if rebate: # Monte-Carlo rebate paid at the knock-out date, needs the time grid
+        if T is None or dt is None:
+            raise ValueError("a Monte-Carlo rebate needs T and dt (or use the closed form)")
+        return DownAndOut_WithRebate(gbm_sims, K, BARRIER, rebate, -np.log(discount_factor) / T, T, dt,
+                                     observation, option_type, 'hit', paired)
+
+    estimate = DownAndOut_estimate(gbm_sims, K, BARRIER, discount_factor, observation, option_type, paired, sigma, dt)
+
+    premium = estimate.price
+    print(f"{Fore.RED}Price of the down-and-out {option_type}: {premium:.4f} (std error {estimate.std_error:.4f}){Style.RESET_ALL}")
+    print(f"{Fore.RED}Hit rate from MC simulation: {estimate.hit_rate * 100:.2f}%{Style.RESET_ALL}")
+
+    return premium
+
+# ----------------------------------- DOWN AND OUT WITH REBATE ----------------------------------------------
+
+def DownAndOut_WithRebate_estimate(gbm_sims, K, BARRIER, rebate, r, T, dt, observation='daily', option_type='call',
+                                   rebate_at='hit', paired=False):
+    """
+    Monte-Carlo estimate of a down-and-out option paying `rebate` on knock-out, either at the
+    knock-out date (rebate_at='hit', discounted from the first-passage step) or at expiry.
+    """
+    return reduce_payoffs(
+        gbm_sims,
+        lambda block: knock_out_rebate_payoff(block, K, BARRIER, rebate, r, T, dt, 'down', option_type,
+                                              observation, rebate_at),
+        np.exp(-r * T),
+        paired,
+    )
+
+def DownAndOut_WithRebate(gbm_sims, K, BARRIER, rebate, r, T, dt, observation='daily', option_type='call',
+                          rebate_at='hit', paired=False):
+    """
+
+    Prices a down-and-out European call or put with a rebate.
+    rebate_at = 'hit' → rebate paid on the day the barrier is hit
+    rebate_at = 'expiry' → rebate paid at maturity
+    r, T, dt = rate, maturity and simulation step (the rebate is discounted from its payment date)
+
+    """
+    estimate = DownAndOut_WithRebate_estimate(gbm_sims, K, BARRIER, rebate, r, T, dt, observation, option_type,
+                                              rebate_at, paired)
+
+    premium = estimate.price
+    print(f"{Fore.RED}Price of the down-and-out {option_type} with rebate {rebate} at {rebate_at}: "
+          f"{premium:.4f} (std error {estimate.std_error:.4f}){Style.RESET_ALL}")
+    print(f"{Fore.RED}Knock-out rate from MC simulation: {estimate.hit_rate * 100:.2f}%{Style.RESET_ALL}")
+
+    return premium
+
+# Knock-out time histogram -------------------------------------------------------------
+
+def DownAndOut_knock_time_hist(gbm_sims, BARRIER=BARRIER, show=True):
+
+    counts = knock_time_histogram(gbm_sims, BARRIER, 'down')
+
+    plt.figure(figsize=(6,4))
+    plt.bar(np.arange(counts.size), counts / len(gbm_sims), width=1.0, edgecolor='none')
+    plt.title('When the paths knock out')
+    plt.xlabel('Time step')
+    plt.ylabel('Fraction of paths knocked out')
+    plt.grid(True)
+    if show:
+        plt.show()
+
+#if you want to test out the file use: ---------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    gbm_sims = simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt, n_sims=n_sims, N=N, div_yield=div_yield,
+                            random_seed=random_seed)
+
+    for rebate_at in ('hit', 'expiry'):
+        DownAndOut_WithRebate(gbm_sims, K, BARRIER, rebate, r, T, dt, 'daily', 'call', rebate_at)
+
+    DownAndOut(None, K, BARRIER, discount_factor, 'daily', 'call', sigma=sigma, S_0=S_0, T=T,
+               div_yield=div_yield, rebate=rebate, method='analytic')
+
+    DownAndOut_knock_time_hist(gbm_sims)
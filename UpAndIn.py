@@ -1,4 +1,11 @@
 from miscellaneous import simulate_gbm
+from gbm import terminal_prices, regenerate_paths
+from mc_stats import reduce_payoffs
+from barrier_monitoring import barrier_hit
+from mc_greeks import barrier_greeks
+from barrier_analytic import barrier_price, closed_form_available, monitoring_interval
+from barrier_option import knock_time_histogram
+from control_variate import vanilla_control_variate
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
@@ -15,42 +22,99 @@ BARRIER = 200
 K = S_0 * 1.0 # change according to
 n_sims = 10000
 div_yield = 0.03833
+random_seed = 102 # with sampling='philox' any single path can be regenerated from (random_seed, index)
  
 observation = 'european' #change to daily if daily
  
 dt = T / N
 discount_factor = np.exp(-r * T)
  
-gbm_sims = simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt,n_sims=n_sims,N=N,div_yield=div_yield)
-print(gbm_sims.shape)
- 
-def UpAndInCall(gbm_sims, K, BARRIER, discount_factor, observation='european'):
+def UpAndInCall_payoff(gbm_sims, K, BARRIER, observation='european', sigma=None, dt=None):
     """
-   
-    Prices an up-and-in European call.
-    observation = 'european' → barrier checked only at maturity
-    observation = 'daily' → barrier checked every day
- 
+    Per-path (undiscounted) pay-off of an up-and-in call, and the knock-in flags.
+    Works on the full path matrix, one block of it, or a gbm.PathSummary.
+    With sigma and dt (the simulation grid) the barrier check uses the Brownian-bridge
+    correction (see barrier_monitoring.barrier_hit) and hit is a knock-in probability.
     """
-    if observation.lower() == 'european':
-        hit = gbm_sims[:, -1] >= BARRIER # final prices only
-    else: # 'daily'
-        hit = gbm_sims.max(axis=1) >= BARRIER # path-wise max
+    hit = barrier_hit(gbm_sims, BARRIER, 'up', observation, sigma, dt)
  
     # Payoff: (payoff function explained: if the hit condition is met, i.e. that the last MC path is >= to the BARRIER,
     # the payoff is the max between the last price - K or 0. In addition, if the condition is not met, then the output is also 0)
  
-    payoff = np.where(
-        hit, # final price of the MC paths that are subject to a >= barrier logic
-        np.maximum(0, gbm_sims[:, -1] - K), # array will be created based
-        0
+    payoff = hit * np.maximum(0, terminal_prices(gbm_sims) - K)
+ 
+    return payoff, hit
+ 
+def UpAndInCall_estimate(gbm_sims, K, BARRIER, discount_factor, observation='european', paired=False,
+                         sigma=None, dt=None):
+    """
+    Monte-Carlo estimate (price, std error, variance, hit rate) of an up-and-in call.
+    gbm_sims is the full path matrix, a stream of blocks (gbm.stream_gbm) or a gbm.PathSummary.
+    paired = True for antithetic paths, so the std error is computed over pair means.
+    """
+    return reduce_payoffs(
+        gbm_sims,
+        lambda block: UpAndInCall_payoff(block, K, BARRIER, observation, sigma, dt),
+        discount_factor,
+        paired,
     )
  
-    premium = discount_factor * payoff.mean()
-    print(f"{Fore.RED}Price of the up-and-in Call: {premium:.4f}{Style.RESET_ALL}")
+def UpAndInCall_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield=0.0, observation='daily', paired=False):
+    """
+    Price, delta, gamma, vega and rho of the up-and-in call with their standard errors, all from the same
+    paths (see mc_greeks.barrier_greeks for the estimators); the paths must be simulated under Q.
+    """
+    return barrier_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield, 'up-and-in', 'call', observation, paired=paired)
  
-    hit = (gbm_sims.max(axis=1) >= BARRIER)
-    hit_rate = hit.mean()
+def UpAndInCall_cv_estimate(gbm_sims, K, BARRIER, S_0, r, T, sigma, div_yield=0.0, observation='european', paired=False,
+                            dt=None):
+    """
+    Control-variate estimate of the up-and-in call: the pay-off is regressed on the same-path
+    vanilla pay-off, whose exact price comes from Vanilla.blackscholesvanilla.
+    gbm_sims must be simulated with mu = r and the same div_yield.
+    Returns a control_variate.CVEstimate (price, std error, beta, variance reduction factor, ...).
+    """
+    return vanilla_control_variate(
+        gbm_sims,
+        lambda block: UpAndInCall_payoff(block, K, BARRIER, observation, sigma, dt),
+        K, S_0, r, T, sigma, div_yield, 'call', paired,
+    )
+ 
+def UpAndInCall(gbm_sims, K, BARRIER, discount_factor, observation='european', paired=False,
+                sigma=None, dt=None, S_0=None, T=None, div_yield=0.0, rebate=0.0, method='mc'):
+    """
+   
+    Prices an up-and-in European call.
+    observation = 'european' → barrier checked only at maturity
+    observation = 'daily' → barrier checked every day
+    observation = 'continuous' → Brownian-bridge crossing probability (needs sigma, dt)
+    observation = ObservationSchedule → barrier checked on its dates only (paths from schedule.simulate)
+    paired = True when gbm_sims come from variance_reduction='antithetic'
+    sigma, dt = simulation vol and step; given on a coarse grid they switch on the bridge correction
+    S_0, T, div_yield = spot, maturity and dividend yield; with them (and sigma) method='analytic' prices a
+    'daily' or 'continuous' barrier in closed form (barrier_analytic), vectorized over arrays
+    of S_0, K and BARRIER, and gbm_sims may be None
+    rebate = cash rebate (closed form only)
+    method = 'mc' (default), 'analytic' or 'auto' (closed form when possible, else Monte-Carlo)
+
+    """
+    if method != 'mc' and closed_form_available(S_0, T, sigma, observation):
+        r = -np.log(discount_factor) / T
+        premium = barrier_price(S_0, K, BARRIER, r, T, sigma, div_yield, 'up-and-in', 'call',
+                                rebate, monitoring_interval(observation))
+        print(f"{Fore.RED}Closed-form price of the up-and-in Call: {np.round(premium, 4)}{Style.RESET_ALL}")
+        return premium if premium.ndim else float(premium)
+    if method == 'analytic':
+        raise ValueError("the closed form needs S_0, T, sigma and observation='daily' or 'continuous'")
+    if rebate:
+        raise ValueError("rebates are only priced in closed form")
+ 
+    estimate = UpAndInCall_estimate(gbm_sims, K, BARRIER, discount_factor, observation, paired, sigma, dt)
+ 
+    premium = estimate.price
+    print(f"{Fore.RED}Price of the up-and-in Call: {premium:.4f} (std error {estimate.std_error:.4f}){Style.RESET_ALL}")
+ 
+    hit_rate = estimate.hit_rate
     print(f"{Fore.RED}Hit rate from MC simulation: {hit_rate * 100:.2f}%{Style.RESET_ALL}")
  
     return premium
@@ -61,9 +125,12 @@ def UpAndInCall(gbm_sims, K, BARRIER, discount_factor, observation='european'):
 def plot_MC_UpAndInCall(show=True):
     plt.figure(figsize=(9,4))
     sample = np.random.choice(n_sims, size=min(30, n_sims), replace=False)
+    # only the sampled paths are rebuilt (counter-based RNG), the full matrix is not needed
+    sample_paths = regenerate_paths(sample, s_0=S_0, mu=r, sigma=sigma, dt=dt, N=N,
+                                    div_yield=div_yield, random_seed=random_seed)
  
-    for idx in sample:
-        plt.plot(gbm_sims[idx], alpha=0.4)
+    for path in sample_paths:
+        plt.plot(path, alpha=0.4)
     plt.axhline(BARRIER, color='red', ls='--', label=f'Barrier = {BARRIER}')
     plt.axhline(K, color='green', ls=':', label=f'Strike = {K}')
     plt.title('Subset of GBM paths')
@@ -76,11 +143,7 @@ def plot_MC_UpAndInCall(show=True):
 
 # 2) Histogram of Monte-Carlo pay-offs (discounted) -----------------------------------------
 def plot_hist_UpAndInCall(show=True):
-    hit = gbm_sims.max(axis=1) > BARRIER
-    payoffs = np.where(
-        hit,
-        np.maximum(0, gbm_sims[:,-1] - K),
-        0)
+    payoffs, _ = UpAndInCall_payoff(gbm_sims, K, BARRIER, observation)
  
     disc_pay = discount_factor * payoffs
  
@@ -96,11 +159,8 @@ def plot_hist_UpAndInCall(show=True):
 # Cumulative knock-in fraction (up-and-in) ------------------------------------------------------
  
 def plot_cum_KI(show=True):
-    cum_max = np.maximum.accumulate(gbm_sims, axis=1)
- 
-    cum_hit = (cum_max >= BARRIER)
- 
-    knockin_ratio = cum_hit.mean(axis=0)
+    # first-passage step of every path (chunked argmax), no running-max copy of the matrix
+    knockin_ratio = np.cumsum(knock_time_histogram(gbm_sims, BARRIER, 'up')) / n_sims
  
     plt.figure(figsize=(6, 4))
     plt.plot(knockin_ratio, lw=2)
@@ -147,4 +207,7 @@ def plot_all_UpAndIn():
     plt.show()
  
 if __name__ == "__main__":
+    gbm_sims = simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt,n_sims=n_sims,N=N,div_yield=div_yield,
+                            random_seed=random_seed, sampling='philox')
+    print(gbm_sims.shape)
     plot_all_UpAndIn()
\ No newline at end of file
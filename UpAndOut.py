@@ -1,4 +1,13 @@
 from miscellaneous import simulate_gbm
+from gbm import terminal_prices, regenerate_paths, PathSummary
+from mc_stats import reduce_payoffs
+from barrier_monitoring import barrier_hit
+from mc_greeks import barrier_greeks
+from barrier_analytic import barrier_price, closed_form_available, monitoring_interval
+from barrier_option import knock_out_rebate_payoff, knock_time_histogram
+from barrier_pde import barrier_pde
+from path_cache import cached_simulate_gbm
+from control_variate import vanilla_control_variate
 import matplotlib.pyplot as plt
 import pandas as pd
 import numpy as np
@@ -17,36 +26,158 @@ n_sims = 10000
 dt = T / N
 discount_factor = np.exp(-r * T)
 div_yield = 0.002
+random_seed = 102 # with sampling='philox' any single path can be regenerated from (random_seed, index)
  
 # ----------------------------------- CODING AN UP AND OUT CALL (Or Put) ----------------------------------------------
  
-def UpAndOut(gbm_sims, K, BARRIER, discount_factor, observation='european', option_type='call'):
+def UpAndOut_payoff(gbm_sims, K, BARRIER, observation='european', option_type='call', sigma=None, dt=None):
+    """
+    Per-path (undiscounted) pay-off of an up-and-out call or put, and the knock-out flags.
+    Works on the full path matrix, one block of it, or a gbm.PathSummary.
+    With sigma and dt (the simulation grid) the barrier check uses the Brownian-bridge
+    correction (see barrier_monitoring.barrier_hit) and hit is a knock-out probability.
+    """
+ 
+    # European, Daily or Continuous observation
+ 
+    hit = barrier_hit(gbm_sims, BARRIER, 'up', observation, sigma, dt)
+ 
+    # Option or call
+    if option_type.lower() == 'call':
+        payoff = (1 - hit) * np.maximum(0, terminal_prices(gbm_sims) - K)
+    else:
+        payoff = (1 - hit) * np.maximum(0, K - terminal_prices(gbm_sims))
+ 
+    return payoff, hit
+ 
+def UpAndOut_estimate(gbm_sims, K, BARRIER, discount_factor, observation='european', option_type='call', paired=False,
+                      sigma=None, dt=None):
+    """
+    Monte-Carlo estimate (price, std error, variance, hit rate) of an up-and-out option.
+    gbm_sims is the full path matrix, a stream of blocks (gbm.stream_gbm) or a gbm.PathSummary.
+    paired = True for antithetic paths, so the std error is computed over pair means.
+    """
+    return reduce_payoffs(
+        gbm_sims,
+        lambda block: UpAndOut_payoff(block, K, BARRIER, observation, option_type, sigma, dt),
+        discount_factor,
+        paired,
+    )
+ 
+def UpAndOut_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield=0.0, observation='daily', option_type='call', paired=False):
+    """
+    Price, delta, gamma, vega and rho of an up-and-out option with their standard errors, all from the same
+    paths (see mc_greeks.barrier_greeks for the estimators); the paths must be simulated under Q.
+    """
+    return barrier_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield, 'up-and-out', option_type, observation, paired=paired)
+ 
+def UpAndOut_cv_estimate(gbm_sims, K, BARRIER, S_0, r, T, sigma, div_yield=0.0, observation='european', option_type='call', paired=False,
+                         dt=None):
+    """
+    Control-variate estimate of the up-and-out option: the pay-off is regressed on the same-path
+    vanilla pay-off, whose exact price comes from Vanilla.blackscholesvanilla.
+    gbm_sims must be simulated with mu = r and the same div_yield.
+    Returns a control_variate.CVEstimate (price, std error, beta, variance reduction factor, ...).
+    """
+    return vanilla_control_variate(
+        gbm_sims,
+        lambda block: UpAndOut_payoff(block, K, BARRIER, observation, option_type, sigma, dt),
+        K, S_0, r, T, sigma, div_yield, option_type, paired,
+    )
+ 
+def UpAndOut_pde(S_0, K, BARRIER, r, T, sigma, div_yield=0.0, observation='daily', option_type='call', rebate=0.0,
+                 rebate_at='hit', **grid):
+    """
+    Crank–Nicolson price, delta, gamma and theta of an up-and-out option (see barrier_pde.pde_price),
+    with no Monte-Carlo noise; observation is 'continuous', 'daily', 'european' or an ObservationSchedule.
+    """
+    return barrier_pde(S_0, K, BARRIER, r, T, sigma, div_yield, 'up-and-out', option_type, observation,
+                       rebate, rebate_at, **grid)
+ 
+def UpAndOut(gbm_sims, K, BARRIER, discount_factor, observation='european', option_type='call', paired=False,
+             sigma=None, dt=None, S_0=None, T=None, div_yield=0.0, rebate=0.0, method='mc'):
     """
    
     Prices an up-and-out European call or put.
     observation = 'european' → barrier checked only at maturity
     observation = 'daily' → barrier checked every day
+    observation = 'continuous' → Brownian-bridge crossing probability (needs sigma, dt)
+    observation = ObservationSchedule → barrier checked on its dates only (paths from schedule.simulate)
+    paired = True when gbm_sims come from variance_reduction='antithetic'
+    sigma, dt = simulation vol and step; given on a coarse grid they switch on the bridge correction
+    S_0, T, div_yield = spot, maturity and dividend yield; with them (and sigma) method='analytic' prices a
+    'daily' or 'continuous' barrier in closed form (barrier_analytic), vectorized over arrays
+    of S_0, K and BARRIER, and gbm_sims may be None
+    rebate = cash rebate paid at the knock-out (Monte-Carlo needs T and dt, see UpAndOut_WithRebate)
+    method = 'mc' (default), 'analytic', 'auto' (closed form when possible, else Monte-Carlo) or 'pde'
+    (Crank–Nicolson, needs S_0, T and sigma)
+
+    """
+    if method == 'pde':
+        if S_0 is None or T is None or sigma is None:
+            raise ValueError("the PDE engine needs S_0, T and sigma")
+        result = UpAndOut_pde(S_0, K, BARRIER, -np.log(discount_factor) / T, T, sigma, div_yield, observation,
+                              option_type, rebate)
+        print(f"{Fore.RED}PDE price of the up-and-out {option_type}: {result.price:.4f} "
+              f"(delta {result.delta:.4f}, gamma {result.gamma:.5f}, theta {result.theta:.4f}){Style.RESET_ALL}")
+        return result.price
+    if method != 'mc' and closed_form_available(S_0, T, sigma, observation):
+        r = -np.log(discount_factor) / T
+        premium = barrier_price(S_0, K, BARRIER, r, T, sigma, div_yield, 'up-and-out', option_type,
+                                rebate, monitoring_interval(observation))
+        print(f"{Fore.RED}Closed-form price of the up-and-out {option_type}: {np.round(premium, 4)}{Style.RESET_ALL}")
+        return premium if premium.ndim else float(premium)
+    if method == 'analytic':
+        raise ValueError("the closed form needs S_0, T, sigma and observation='daily' or 'continuous'")
+    if rebate: # Monte-Carlo rebate paid at the knock-out date, needs the time grid
+        if T is None or dt is None:
+            raise ValueError("a Monte-Carlo rebate needs T and dt (or use the closed form)")
+        return UpAndOut_WithRebate(gbm_sims, K, BARRIER, rebate, -np.log(discount_factor) / T, T, dt,
+                                   observation, option_type, 'hit', paired)
+ 
+    estimate = UpAndOut_estimate(gbm_sims, K, BARRIER, discount_factor, observation, option_type, paired, sigma, dt)
+ 
+    premium = estimate.price
+    print(f"{Fore.RED}Price of the up-and-out {option_type}: {premium:.4f} (std error {estimate.std_error:.4f}){Style.RESET_ALL}")
+ 
+    hit_rate = estimate.hit_rate
+    print(f"{Fore.RED}Hit rate from MC simulation: {hit_rate * 100:.2f}%{Style.RESET_ALL}")
+ 
+    return premium
  
+# ----------------------------------- UP AND OUT WITH REBATE ----------------------------------------------
+ 
+def UpAndOut_WithRebate_estimate(gbm_sims, K, BARRIER, rebate, r, T, dt, observation='daily', option_type='call',
+                                 rebate_at='hit', paired=False):
+    """
+    Monte-Carlo estimate of an up-and-out option paying `rebate` on knock-out, either at the
+    knock-out date (rebate_at='hit', discounted from the first-passage step) or at expiry.
     """
+    return reduce_payoffs(
+        gbm_sims,
+        lambda block: knock_out_rebate_payoff(block, K, BARRIER, rebate, r, T, dt, 'up', option_type,
+                                              observation, rebate_at),
+        np.exp(-r * T),
+        paired,
+    )
  
-    # European or Daily observation
+def UpAndOut_WithRebate(gbm_sims, K, BARRIER, rebate, r, T, dt, observation='daily', option_type='call',
+                        rebate_at='hit', paired=False):
+    """
  
-    if observation.lower() == 'european':
-        hit = gbm_sims[:, -1] >= BARRIER # final prices only
-    else: # 'daily'
-        hit = gbm_sims.max(axis=1) >= BARRIER # path-wise max
+    Prices an up-and-out European call or put with a rebate.
+    rebate_at = 'hit' → rebate paid on the day the barrier is hit
+    rebate_at = 'expiry' → rebate paid at maturity
+    r, T, dt = rate, maturity and simulation step (the rebate is discounted from its payment date)
  
-    # Option or call
-    if option_type.lower() == 'call':
-        payoff = np.where(hit, 0, np.maximum(0, gbm_sims[:, -1] - K))
-    else:
-        payoff = np.where(hit, 0, np.maximum(0, K - gbm_sims[:, -1]))
-   
-    premium = discount_factor * payoff.mean()
-    print(f"{Fore.RED}Price of the up-and-in {option_type}: {premium:.4f}{Style.RESET_ALL}")
+    """
+    estimate = UpAndOut_WithRebate_estimate(gbm_sims, K, BARRIER, rebate, r, T, dt, observation, option_type,
+                                            rebate_at, paired)
  
-    hit_rate = hit.mean()
-    print(f"{Fore.RED}Hit rate from MC simulation: {hit_rate * 100:.2f}%{Style.RESET_ALL}")
+    premium = estimate.price
+    print(f"{Fore.RED}Price of the up-and-out {option_type} with rebate {rebate} at {rebate_at}: "
+          f"{premium:.4f} (std error {estimate.std_error:.4f}){Style.RESET_ALL}")
+    print(f"{Fore.RED}Knock-out rate from MC simulation: {estimate.hit_rate * 100:.2f}%{Style.RESET_ALL}")
  
     return premium
  
@@ -55,8 +186,11 @@ def UpAndOut(gbm_sims, K, BARRIER, discount_factor, observation='european', opti
 def UpAndOut_MC_plot():
     plt.figure(figsize=(9,4))
     sample = np.random.choice(n_sims, size=min(30, n_sims), replace=False)
-    for idx in sample:
-        plt.plot(gbm_sims[idx], alpha=0.4)
+    # only the sampled paths are rebuilt (counter-based RNG), the full matrix is not needed
+    sample_paths = regenerate_paths(sample, s_0=S_0, mu=r, sigma=sigma, dt=dt, N=N,
+                                    div_yield=div_yield, random_seed=random_seed)
+    for path in sample_paths:
+        plt.plot(path, alpha=0.4)
     plt.axhline(BARRIER, color='red', ls='--', label=f'Barrier = {BARRIER}')
     plt.axhline(K, color='green', ls=':', label=f'Strike = {K}')
     plt.title('Subset of GBM paths')
@@ -68,15 +202,7 @@ def UpAndOut_MC_plot():
 # Plot 2) Histogram of Monte-Carlo pay-offs (discounted)
 def UpAndOut_hist(option_type, discount_factor):
  
-    if observation.lower() == 'european':
-        hit = gbm_sims[:, -1] >= BARRIER # final prices only
-    else: # 'daily'
-        hit = gbm_sims.max(axis=1) >= BARRIER # path-wise max
- 
-    if option_type.lower() == 'call':
-        payoff = np.where(hit, 0, np.maximum(0, gbm_sims[:, -1] - K))
-    else:
-        payoff = np.where(hit, 0, np.maximum(0, K - gbm_sims[:, -1]))
+    payoff, _ = UpAndOut_payoff(gbm_sims, K, BARRIER, observation, option_type)
  
     disc_pay = discount_factor * payoff
  
@@ -88,6 +214,20 @@ def UpAndOut_hist(option_type, discount_factor):
     plt.grid(True)
     plt.show()
  
+# Plot 4) Knock-out time histogram -------------------------------------------------------------
+ 
+def UpAndOut_knock_time_hist():
+ 
+    counts = knock_time_histogram(gbm_sims, BARRIER, 'up')
+ 
+    plt.figure(figsize=(6,4))
+    plt.bar(np.arange(counts.size), counts / n_sims, width=1.0, edgecolor='none')
+    plt.title('When the paths knock out')
+    plt.xlabel('Time step')
+    plt.ylabel('Fraction of paths knocked out')
+    plt.grid(True)
+    plt.show()
+ 
 # Plot 3) Static payoff profile (undiscounted) ---------------------------------
  
 def UpAndOut_plot(option_type):
@@ -115,7 +255,8 @@ def UpAndOut_plot(option_type):
  
 if __name__ == "__main__":
  
-    gbm_sims = simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt,n_sims=n_sims,div_yield=div_yield)
+    gbm_sims = simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt,n_sims=n_sims,N=N,div_yield=div_yield,
+                            random_seed=random_seed, sampling='philox')
     print(f"The shape of the GeomBM paths is: {gbm_sims.shape}")
  
     observation = 'daily'
@@ -142,6 +283,11 @@ if __name__ == "__main__":
     )
  
     UpAndOut_MC_plot()
+ 
+    UpAndOut_knock_time_hist()
+ 
+    UpAndOut_WithRebate(gbm_sims, K, BARRIER, rebate=2.0, r=r, T=T, dt=dt,
+                        observation=observation, option_type=option_type, rebate_at='hit')
     print(f"All tasks completed. The calculated premium is: {premium:.4f}")
 
 
@@ -157,13 +303,32 @@ def up_and_out_mtm_matrix(
     N_per_year=252,
     option_type="call",
     observation="daily",
+    sampling="pseudo",                      # or "sobol" (quasi-Monte Carlo)
+    variance_reduction=None,                # or "antithetic" / "moment_matching"
     excel_file=r"M:\PB\Python_projects\UBP_Repo\up_and_out_mtm_matrix.xlsx"  # obviously here put in your own path!
     ):
  
     """
     Builds a price matrix (rows = spot factors, columns = tenors) and
     saves it to `excel_file`.
+ 
+    One set of unit-spot paths (s_0 = 1) covering the longest tenor is simulated and shared
+    by every cell (common random numbers):
+    - GBM is linear in s_0, so the S_start = S_0 * pf row prices the unit paths with
+      strike K / S_start and barrier BARRIER / S_start and scales the result by S_start;
+    - a shorter tenor reads the first N_per_year * T + 1 columns (a view) of the same paths.
+
+    Every N_per_year * T must be a whole number of steps (the tenor is simulated exactly), and the
+    barrier is checked on the grid: observation = 'european' or 'daily'.
     """
+    if observation not in ('european', 'daily'):
+        raise ValueError("up_and_out_mtm_matrix prices observation='european' or 'daily' only")
+    steps = {T: N_per_year * T for T in tenors}
+    for T, N in steps.items():
+        if abs(N - round(N)) > 1e-9:
+            raise ValueError(f"tenor {T} is not a whole number of steps at N_per_year={N_per_year}")
+    steps = {T: int(round(N)) for T, N in steps.items()}
+
     # Prepare empty DataFrame
     df = pd.DataFrame(
         index=[f"{int(pf*100)}%" for pf in price_factors],
@@ -171,34 +336,45 @@ def up_and_out_mtm_matrix(
         dtype=float,
     )
  
+    dt = 1.0 / N_per_year
+    N_max = max(steps.values())
+ 
+    # one simulation for the whole matrix (served from the path cache on a repeat run)
+    unit_sims = cached_simulate_gbm(
+        s_0=1.0,
+        mu=r,
+        sigma=sigma,
+        dt=dt,
+        n_sims=n_sims,
+        N=N_max,
+        sampling=sampling,
+        variance_reduction=variance_reduction,
+    )
+ 
     # Loop over all tenor / spot-factor combinations
     for T in tenors:
-        N = int(N_per_year * T)         # time steps ∝ tenor
-        dt = T / N
+        N = steps[T]                    # time steps ∝ tenor
         discount = np.exp(-r * T)
  
+        # the tenor's prefix, reduced once and shared by all spot factors
+        tenor_sims = unit_sims[:, :N + 1]
+        summary = PathSummary(terminal=tenor_sims[:, -1], running_max=tenor_sims.max(axis=1),
+                              running_min=None, first_hit={}, average=None)
+ 
         for pf in price_factors:
             S_start = S_0 * pf  # create the price as a percentage
  
-            # fresh GBM paths for this scenario
-            sims = simulate_gbm(
-                s_0=S_start,
-                mu=r,
-                sigma=sigma,
-                dt=dt,
-                n_sims=n_sims,
-            )
- 
-            price = UpAndOut(
-                gbm_sims=sims,
-                K=K,
-                BARRIER=BARRIER,
+            unit_price = UpAndOut_estimate(
+                gbm_sims=summary,
+                K=K / S_start,
+                BARRIER=BARRIER / S_start,
                 discount_factor=discount,
                 observation=observation,
                 option_type=option_type,
-            )
+                paired=(variance_reduction == "antithetic"),
+            ).price
  
-            df.loc[f"{int(pf*100)}%", T] = price
+            df.loc[f"{int(pf*100)}%", T] = S_start * unit_price
  
     # Save & echo
     df.to_excel(excel_file, float_format="%.6f")  # Save as Excel file
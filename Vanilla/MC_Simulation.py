@@ -7,6 +7,9 @@ Created on Mon Apr  7 16:05:01 2025
 import random
 import numpy as np
 import pandas as pd
+
+from gbm import simulate_gbm
+from longstaff_schwartz import longstaff_schwartz
  
 seed_value = 1234
  
@@ -25,7 +28,11 @@ def simulate_one_asset_path(N_train,
                             N,
                             dt,
                             sigma,
-                            S_0):
+                            S_0,
+                            r=0.0,
+                            div_yield=0.0,
+                            random_seed=seed_value,
+                            sampling='pseudo'):
    
     '''
     Simulate N_train trajectories for the asset over N time steps,
@@ -34,12 +41,62 @@ def simulate_one_asset_path(N_train,
     Params:
         N_train: no. of simulated trajectories
         N: no. of time steps
-        dt =
+        dt = time step (T / N)
+        sigma: volatility
+        S_0: initial asset price
+        r: risk-free rate (drift under Q)
+        div_yield: dividend yield
+        random_seed: seed for reproducibility
+        sampling: 'pseudo' or 'sobol' (quasi-Monte Carlo, Brownian-bridge ordering)
    
    
     Returns:
         Numpy array 'paths' of shape (N_train, N+1)
     '''
    
-    increments 4
- 
\ No newline at end of file
+    return simulate_gbm(s_0=S_0, mu=r, sigma=sigma, dt=dt, n_sims=N_train, N=N,
+                        div_yield=div_yield, random_seed=random_seed, sampling=sampling)
+
+
+def price_american_option(N_train,
+                          N_test,
+                          N,
+                          sigma,
+                          S_0,
+                          K,
+                          T,
+                          r=0.0,
+                          div_yield=0.0,
+                          option_type='put',
+                          exercise='american',
+                          basis='laguerre',
+                          random_seed=seed_value,
+                          sampling='pseudo'):
+
+    '''
+    Price an American (or Bermudan) option by Longstaff–Schwartz regression,
+    fitted on N_train trajectories and priced out-of-sample on N_test new ones
+
+    Params:
+        N_train: no. of trajectories used to fit the exercise policy
+        N_test: no. of fresh trajectories used to price it (low-biased price)
+        N: no. of time steps (exercise dates for 'american')
+        sigma: volatility
+        S_0: initial asset price
+        K: strike
+        T: maturity in years
+        r: risk-free rate (drift under Q)
+        div_yield: dividend yield
+        option_type: 'call' or 'put'
+        exercise: 'american' or an array of Bermudan exercise times
+        basis: 'laguerre' or 'polynomial'
+        random_seed: seed the training and test paths are spawned from
+        sampling: 'pseudo' or 'sobol'
+
+
+    Returns:
+        longstaff_schwartz.LSMResult (low: out-of-sample MCEstimate, in_sample price, coefficients)
+    '''
+
+    return longstaff_schwartz(S_0, K, r, T, sigma, div_yield, option_type, exercise, N, N_train, N_test,
+                              basis=basis, random_seed=random_seed, sampling=sampling)
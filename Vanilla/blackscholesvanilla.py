@@ -1,3 +1,4 @@
+import math
 import numpy as np
 from scipy.stats import norm
 import matplotlib.pyplot as plt
@@ -10,6 +11,39 @@ T = 164.0 / 365.0
 r = 0.02
 vol = 0.25
 S_ = np.arange(35.0, K * 1.6, 0.01)
+
+# scalar fast path ------------------------------------------------------------------------------------- scalar fast path
+# one trade quoted with plain floats does not need arrays: math.erfc / math.exp cost ~0.1 us where the NumPy
+# ufuncs and the scipy.stats dispatch of norm.cdf cost several us each
+# (the helpers below are shared with vanilla_greeks)
+
+REALS = (float, int) # np.float64 is a float subclass, so elements of an array loop take the fast path too
+_SQRT_2 = math.sqrt(2.0)
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+
+
+def scalar_inputs(S, K, r, T, vol):
+    """True when all inputs are plain numbers inside the pricing domain (anything else takes the array path)."""
+    return (isinstance(S, REALS) and isinstance(K, REALS) and isinstance(r, REALS) and isinstance(T, REALS)
+            and isinstance(vol, REALS) and S > 0 and K > 0 and T > 0 and vol > 0)
+
+
+def norm_cdf(x):
+    """Standard normal cdf of a float (erfc keeps the left tail accurate)."""
+    return 0.5 * math.erfc(-x / _SQRT_2)
+
+
+def norm_pdf(x):
+    """Standard normal pdf of a float."""
+    return math.exp(-0.5 * x * x) / _SQRT_2PI
+
+
+def d1_d2(S, K, r, T, vol):
+    """d1, d2 and vol * sqrt(T) of floats."""
+    vol_t = vol * math.sqrt(T)
+    d1 = (math.log(S / K) + (r + 0.5 * vol * vol) * T) / vol_t
+    return d1, d1 - vol_t, vol_t
+
  
 def black_scholes_call_value(S, K, r, T, vol):
     """ Black-Scholes call option
@@ -20,6 +54,9 @@ def black_scholes_call_value(S, K, r, T, vol):
     :param vol: volatility
     :return: BS call option value
     """
+    if scalar_inputs(S, K, r, T, vol):
+        d1, d2, _ = d1_d2(S, K, r, T, vol)
+        return norm_cdf(d1) * S - norm_cdf(d2) * K * math.exp(-r * T)
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     d2 = d1 - (vol * np.sqrt(T))
     call_value = norm.cdf(d1) * S - norm.cdf(d2) * K * np.exp(-r * T)
@@ -35,6 +72,9 @@ def black_scholes_put_value(S, K, r, T, vol):
     :param vol: volatility
     :return: BS put option value
     """
+    if scalar_inputs(S, K, r, T, vol):
+        d1, d2, _ = d1_d2(S, K, r, T, vol)
+        return norm_cdf(-d2) * K * math.exp(-r * T) - norm_cdf(-d1) * S
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     d2 = d1 - (vol * np.sqrt(T))
     put_value = norm.cdf(-d2) * K * np.exp(-r * T) - norm.cdf(-d1) * S
@@ -57,4 +97,21 @@ if __name__ == "__main__":
                              T=T,
                              vol=vol)
     print(f"Black Scholes put value: {put_value}")
+
+    # per-call latency of one quote: scalar fast path vs the array path (0-d arrays) and the norm.cdf formula
+    import timeit
+
+    def norm_cdf_call(S, K, r, T, vol):
+        d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
+        d2 = d1 - (vol * np.sqrt(T))
+        return norm.cdf(d1) * S - norm.cdf(d2) * K * np.exp(-r * T)
+
+    args = (S, K, r, T, vol)
+    boxed = tuple(np.asarray(x) for x in args)
+    n_calls = 20_000
+    for label, fn, inputs in (("scalar fast path", black_scholes_call_value, args),
+                              ("array path (0-d arrays)", black_scholes_call_value, boxed),
+                              ("norm.cdf formula", norm_cdf_call, args)):
+        latency = min(timeit.repeat(lambda: fn(*inputs), number=n_calls, repeat=5)) / n_calls
+        print(f"{label:>24}: {latency * 1e6:6.2f} us per call, value {float(fn(*inputs)):.12f}")
  
\ No newline at end of file
@@ -1,7 +1,11 @@
 # helper function phi
+import math
 import numpy as np
 from scipy.stats import norm
 import matplotlib.pyplot as plt
+
+from Vanilla.blackscholesvanilla import REALS, scalar_inputs, norm_cdf, norm_pdf, d1_d2
+from greek_surface import greek_surface, plot_greek_curves
  
 
 
@@ -17,6 +21,8 @@ vol = 0.2     # Volatility
 def phi(x):
     """ Phi helper function
     """
+    if isinstance(x, REALS):
+        return norm_pdf(x)
     return np.exp(-0.5 * x * x) / (np.sqrt(2.0 * np.pi))
  
 # gamma --------------------------------------------------------------------------------------------------gamma
@@ -38,6 +44,9 @@ def gamma(S, K, r, T, vol):
     :param vol: volatility
     :return: gamma
     """
+    if scalar_inputs(S, K, r, T, vol):
+        d1, _, vol_t = d1_d2(S, K, r, T, vol)
+        return norm_pdf(d1) / (S * vol_t)
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     return phi(d1) / (S * vol * np.sqrt(T))
  
@@ -52,6 +61,9 @@ def vega(S, K, r, T, vol):
     :param vol: volatility
     :return: vega
     """
+    if scalar_inputs(S, K, r, T, vol):
+        d1, _, _ = d1_d2(S, K, r, T, vol)
+        return S * norm_pdf(d1) * math.sqrt(T) / 100.0
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     return (S * phi(d1) * np.sqrt(T)) / 100.0
  
@@ -73,13 +85,15 @@ def call_delta(S, K, r, T, vol):
     :param vol: volatility
     :return: call delta
     """
+    if scalar_inputs(S, K, r, T, vol):
+        return norm_cdf(d1_d2(S, K, r, T, vol)[0])
     N = norm.cdf
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     return N(d1)
  
 # call theta -------------------------------------------------------------------------------------------call theta
  
-def call_theta(S, K, r, Theta, vol):
+def call_theta(S, K, r, T, vol):
     """ Black-Scholes call theta
     :param S: underlying
     :param K: strike price
@@ -88,6 +102,10 @@ def call_theta(S, K, r, Theta, vol):
     :param vol: volatility
     :return: call theta
     """
+    if scalar_inputs(S, K, r, T, vol):
+        d1, d2, _ = d1_d2(S, K, r, T, vol)
+        theta = -(S * norm_pdf(d1) * vol / (2.0 * math.sqrt(T))) - r * K * math.exp(-r * T) * norm_cdf(d2)
+        return theta / 365.0
     N = norm.cdf
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
  
@@ -106,6 +124,8 @@ def call_rho(S, K, r, T, vol):
     :param vol: volatility
     :return: call rho
     """
+    if scalar_inputs(S, K, r, T, vol):
+        return K * T * math.exp(-r * T) * norm_cdf(d1_d2(S, K, r, T, vol)[1]) / 100.0
     N = norm.cdf
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     d2 = d1 - (vol * np.sqrt(T))
@@ -130,12 +150,14 @@ def put_delta(S, K, r, T, vol):
     :param vol: volatility
     :return: put delta
     """
+    if scalar_inputs(S, K, r, T, vol):
+        return norm_cdf(d1_d2(S, K, r, T, vol)[0]) - 1.0
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     return norm.cdf(d1) - 1.0
  
 # put theta -------------------------------------------------------------------------------------------  put theta
  
-def put_theta(S, K, r, t, vol):
+def put_theta(S, K, r, T, vol):
     """ Black-Scholes put theta
     :param S: underlying
     :param K: strike price
@@ -144,6 +166,11 @@ def put_theta(S, K, r, t, vol):
     :param vol: volatility
     :return: put theta
     """
+    if scalar_inputs(S, K, r, T, vol):
+        d1, d2, _ = d1_d2(S, K, r, T, vol)
+        theta = -(S * norm_pdf(d1) * vol / (2.0 * math.sqrt(T))) + r * K * math.exp(-r * T) * norm_cdf(-d2)
+        return theta / 365.0
+    N = norm.cdf
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     d2 = d1 - (vol * np.sqrt(T))
     theta = -((S * phi(d1) * vol) / (2.0 * np.sqrt(T))) + (r * K * np.exp(-r * T) * N(-d2))
@@ -160,6 +187,9 @@ def put_rho(S, K, r, T, vol):
     :param vol: volatility
     :return: put rho
     """
+    if scalar_inputs(S, K, r, T, vol):
+        return -K * T * math.exp(-r * T) * norm_cdf(-d1_d2(S, K, r, T, vol)[1]) / 100.0
+    N = norm.cdf
     d1 = (1.0 / (vol * np.sqrt(T))) * (np.log(S / K) + (r + 0.5 * vol ** 2.0) * T)
     d2 = d1 - (vol * np.sqrt(T))
     rho = -K * T * np.exp(-r * T) * N(-d2)
@@ -174,120 +204,44 @@ def put_rho(S, K, r, T, vol):
 
 
 # Plotting theta -------------------------------------------------------------------------------------------plot theta
+# the plots are thin consumers of greek_surface: one vectorized evaluation per figure, no per-point loop
  
 def plot_call_theta_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    theta_values = []
-    for number in x:
-        thetas = call_theta(number, K, r, T, vol)
-        theta_values.append(thetas)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, theta_values, lw=2, label='Theta')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f" Vanilla Call Theta")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Theta ')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
+    return plot_greek_curves(call_theta, x, K, r, vol, T, title=" Vanilla Call Theta", label='Theta', show=show)
  
 # Plotting gamma ------------------------------------------------------------------------------------------- plot gamma
  
 def plot_gamma_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    gamma_values = []
-    for number in x:
-        gammas = gamma(number, K, r, T, vol)
-        gamma_values.append(gammas)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, gamma_values, lw=2, label='Gamma')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f" Vanilla Call Gamma")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Gamma ')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
+    return plot_greek_curves(gamma, x, K, r, vol, T, title=" Vanilla Call Gamma", label='Gamma', show=show)
  
  
 # Plotting rho ----------------------------------------------------------------------------------------------- plot rho
  
 def plot_call_rho_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    rho_values = []
-    for number in x:
-        rhos = call_rho(number, K, r, T, vol)
-        rho_values.append(rhos)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, rho_values, lw=2, label='Rho')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f" Vanilla Call Rho")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Rho ')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
+    return plot_greek_curves(call_rho, x, K, r, vol, T, title=" Vanilla Call Rho", label='Rho', show=show)
  
 # Plotting vega ------------------------------------------------------------------------------------------------- plot vega
  
 def plot_vega_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    vega_values = []
-    for number in x:
-        vegas = vega(number, K, r, T, vol)
-        vega_values.append(vegas)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, vega_values, lw=2, label='vega')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f" Vanilla Call vega")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('vega ')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
+    return plot_greek_curves(vega, x, K, r, vol, T, title=" Vanilla Call vega", label='vega', show=show)
  
 # Plotting delta ------------------------------------------------------------------------------------------------- plot delta
  
 def plot_call_delta_(show=True):
- 
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    delta_values = [call_delta(number, K, r, T, vol) for number in x]
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, delta_values, lw=2, label='delta')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f" Vanilla Call delta")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('delta ')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
+    return plot_greek_curves(call_delta, x, K, r, vol, T, title=" Vanilla Call delta", label='delta', show=show)
 
 
 # Plotting All Greeks -------------------------------------------------------------------------------------------- plot all greeks
  
 def plot_call_greeks_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    delta_values = [call_delta(number, K, r, T, vol) for number in x]
-    theta_values = [call_theta(number, K, r, T, vol) for number in x]
-    vega_values = [vega(number, K, r, T, vol) for number in x]
-    rho_values = [call_rho(number, K, r, T, vol) for number in x]
-    gamma_values = [gamma(number, K, r, T, vol) for number in x]
+    panels = (('Delta', call_delta), ('Theta', call_theta), ('Vega', vega), ('Rho', call_rho), ('Gamma', gamma))
+    curves = greek_surface([greek for _, greek in panels], x, vol, T, K, r, output='numpy')
  
     fig, axs = plt.subplots(5, figsize=(10, 15))
     fig.suptitle('Greeks', fontsize=20)
@@ -296,25 +250,10 @@ def plot_call_greeks_(show=True):
     plt.subplots_adjust(left=0.1, bottom=0.1, right=0.9,
                         top=0.9, wspace=0.4, hspace=0.6)
    
-    axs[0].plot(x, delta_values)
-    axs[0].axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    axs[0].title.set_text('Delta')
- 
-    axs[1].plot(x, theta_values)
-    axs[1].axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    axs[1].title.set_text('Theta')
- 
-    axs[2].plot(x, vega_values)
-    axs[2].axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    axs[2].title.set_text('Vega')
- 
-    axs[3].plot(x, rho_values)
-    axs[3].axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    axs[3].title.set_text('Rho')
- 
-    axs[4].plot(x, gamma_values)
-    axs[4].axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    axs[4].title.set_text('Gamma')
+    for ax, (title, greek) in zip(axs, panels):
+        ax.plot(x, curves[greek.__name__][:, 0, 0])
+        ax.axvline(K, color='green', ls=':', label=f'Strike = {K}')
+        ax.title.set_text(title)
  
     if show:
         plt.show()
@@ -331,21 +270,8 @@ def plot_multiple_deltas(K, r, vol, *maturities, show=True):
     - *maturities: Any number of maturities (T)
     """
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    plt.figure(figsize=(7, 4))
-   
-    for T in maturities:
-        delta_values = [call_delta(number, K, r, T, vol) for number in x]
-        plt.plot(x, delta_values, lw=2, label=f'Delta (T={T})')
-   
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title("Vanilla Call Delta for Different Maturities")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Delta')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
+    plot_greek_curves(call_delta, x, K, r, vol, maturities, title="Vanilla Call Delta for Different Maturities",
+                      label='Delta', show=show)
  
 # Correct function call
 # plot_multiple_deltas(100, 0.05, 0.2, 0.1, 0.2, 0.3, 0.4, 0.5, 1, 2)
@@ -362,5 +288,6 @@ def plot_all_greeks():
     plot_call_greeks_(show=False)
     plt.show()  # Display all plots together
    
+#if you want to test out the file use (from the repo root, so Vanilla and greek_surface import): python -m Vanilla.vanilla_greeks
 if __name__ == "__main__":
     plot_all_greeks()
\ No newline at end of file
@@ -0,0 +1,112 @@
+import numpy as np
+from scipy.special import ndtr
+
+from barrier_monitoring import DAILY, bgk_shift
+
+# ----------------------------------- CLOSED-FORM BARRIER OPTIONS ----------------------------------------------
+
+BARRIER_TYPES = ('up-and-out', 'up-and-in', 'down-and-out', 'down-and-in')
+
+# Reiner–Rubinstein building blocks (Haug's notation) for each barrier type / option type,
+# as (blocks when K >= BARRIER, blocks when K < BARRIER); "-X" subtracts block X
+_COMBINATIONS = {
+    ('down-and-in', 'call'): (('C', 'E'), ('A', '-B', 'D', 'E')),
+    ('up-and-in', 'call'): (('A', 'E'), ('B', '-C', 'D', 'E')),
+    ('down-and-in', 'put'): (('B', '-C', 'D', 'E'), ('A', 'E')),
+    ('up-and-in', 'put'): (('A', '-B', 'D', 'E'), ('C', 'E')),
+    ('down-and-out', 'call'): (('A', '-C', 'F'), ('B', '-D', 'F')),
+    ('up-and-out', 'call'): (('F',), ('A', '-B', 'C', '-D', 'F')),
+    ('down-and-out', 'put'): (('A', '-B', 'C', '-D', 'F'), ('F',)),
+    ('up-and-out', 'put'): (('B', '-D', 'F'), ('A', '-C', 'F')),
+}
+
+
+def monitoring_interval(observation):
+    """Monitoring interval of an observation type for the BGK shift (None = continuous)."""
+    observation = observation.lower()
+    if observation == 'continuous':
+        return None
+    if observation == 'daily':
+        return DAILY
+    raise ValueError(f"no closed form for observation='{observation}', use 'daily' or 'continuous'")
+
+
+def closed_form_available(S_0, T, sigma, observation):
+    """True when a pricer has everything `barrier_price` needs (flat GBM, daily or continuous barrier)."""
+    return (S_0 is not None and T is not None and sigma is not None
+            and isinstance(observation, str) and observation.lower() in ('daily', 'continuous'))
+
+
+def barrier_price(S, K, BARRIER, r, T, sigma, div_yield=0.0, barrier_type='up-and-out', option_type='call',
+                  rebate=0.0, monitoring_dt=None):
+    """
+    Reiner–Rubinstein price of a single-barrier European option under flat-parameter GBM.
+    Every numeric argument broadcasts, so one call prices whole arrays of spots, strikes and barriers.
+
+    Parameters:
+    - S: Spot price(s)
+    - K: Strike(s)
+    - BARRIER: Barrier level(s)
+    - r: Risk-free rate
+    - T: Time to maturity in years
+    - sigma: Volatility
+    - div_yield: Continuous dividend yield (default is 0)
+    - barrier_type: 'up-and-out', 'up-and-in', 'down-and-out' or 'down-and-in'
+    - option_type: 'call' or 'put'
+    - rebate: Cash rebate, paid at the hit for knock-outs and at maturity for knock-ins
+      that never knocked in (default is 0)
+    - monitoring_dt: None for a continuously monitored barrier; otherwise the monitoring interval
+      (e.g. 1/252) and the barrier is moved by the Broadie–Glasserman–Kou shift
+
+    Returns:
+    - price: Array (or 0-d array) of option prices
+    """
+    barrier_type, option_type = barrier_type.lower(), option_type.lower()
+    if (barrier_type, option_type) not in _COMBINATIONS:
+        raise ValueError(f"Invalid barrier/option type: {barrier_type} {option_type}")
+    up = barrier_type.startswith('up')
+    if monitoring_dt is not None:
+        BARRIER = bgk_shift(BARRIER, sigma, monitoring_dt, 'up' if up else 'down')
+
+    S, K, H, T, sigma, r, q, rebate = np.broadcast_arrays(
+        *(np.asarray(x, dtype=np.float64) for x in (S, K, BARRIER, T, sigma, r, div_yield, rebate)))
+    b = r - q # cost of carry
+    eta = -1.0 if up else 1.0
+    phi = 1.0 if option_type == 'call' else -1.0
+
+    vol_t = sigma * np.sqrt(T)
+    mu = (b - 0.5 * sigma**2) / sigma**2
+    lam = np.sqrt(mu**2 + 2 * r / sigma**2)
+    carry = np.exp((b - r) * T)
+    disc = np.exp(-r * T)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        h_s = H / S
+        x1 = np.log(S / K) / vol_t + (1 + mu) * vol_t
+        x2 = np.log(S / H) / vol_t + (1 + mu) * vol_t
+        y1 = np.log(H * H / (S * K)) / vol_t + (1 + mu) * vol_t
+        y2 = np.log(H / S) / vol_t + (1 + mu) * vol_t
+        z = np.log(H / S) / vol_t + lam * vol_t
+
+        blocks = {
+            'A': phi * S * carry * ndtr(phi * x1) - phi * K * disc * ndtr(phi * (x1 - vol_t)),
+            'B': phi * S * carry * ndtr(phi * x2) - phi * K * disc * ndtr(phi * (x2 - vol_t)),
+            'C': (phi * S * carry * h_s**(2 * (mu + 1)) * ndtr(eta * y1)
+                  - phi * K * disc * h_s**(2 * mu) * ndtr(eta * (y1 - vol_t))),
+            'D': (phi * S * carry * h_s**(2 * (mu + 1)) * ndtr(eta * y2)
+                  - phi * K * disc * h_s**(2 * mu) * ndtr(eta * (y2 - vol_t))),
+            'E': rebate * disc * (ndtr(eta * (x2 - vol_t)) - h_s**(2 * mu) * ndtr(eta * (y2 - vol_t))),
+            'F': rebate * (h_s**(mu + lam) * ndtr(eta * z) + h_s**(mu - lam) * ndtr(eta * (z - 2 * lam * vol_t))),
+        }
+
+        def combine(names):
+            return sum(-blocks[name[1:]] if name[0] == '-' else blocks[name] for name in names)
+
+        above, below = _COMBINATIONS[(barrier_type, option_type)]
+        price = np.where(K >= H, combine(above), combine(below))
+
+        # spot already through the barrier: knocked out (rebate now) or knocked in (vanilla)
+        knocked = S >= H if up else S < H # same convention as barrier_monitoring.barrier_hit
+        price = np.where(knocked, rebate if barrier_type.endswith('out') else blocks['A'], price)
+
+    return price
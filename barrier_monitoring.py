@@ -0,0 +1,150 @@
+import numpy as np
+
+from gbm import CHUNK_BYTES, PathSummary, _rows_per_chunk, simulate_gbm, terminal_prices, path_max, path_min
+
+# ----------------------------------- BARRIER MONITORING CORRECTIONS ----------------------------------------------
+
+# Broadie–Glasserman–Kou constant: -zeta(1/2) / sqrt(2 pi)
+BGK_BETA = 0.5826
+DAILY = 1 / 252 # monitoring interval of observation='daily'
+
+
+class ObservationSchedule:
+    """
+    Barrier observation dates (weekly, monthly, window, ...) as year fractions in (0, T].
+
+    The paths are simulated exactly at the observation dates and at maturity only (GBM has an
+    exact transition over any step), so a monthly barrier costs 12 steps instead of 252 with no
+    discretization bias. Pass the schedule as `observation=` to the barrier pricers, with paths
+    from `schedule.simulate(...)`.
+
+    Example:
+        monthly = ObservationSchedule(np.arange(1, 13) / 12, T=1)
+        gbm_sims = monthly.simulate(S_0, r, sigma, n_sims, div_yield)
+        UpAndOut(gbm_sims, K, BARRIER, discount_factor, observation=monthly)
+    """
+
+    def __init__(self, times, T):
+        times = np.unique(np.round(np.asarray(times, dtype=np.float64), 12))
+        if times.size == 0 or times[0] <= 0 or times[-1] > T + 1e-12:
+            raise ValueError("observation times must lie in (0, T]")
+        self.T = T
+        self.times = times
+        self.grid = np.union1d(times, [T]) # simulated dates after 0: observations and maturity
+        self.dt = np.diff(self.grid, prepend=0.0)
+        self.N = self.grid.size
+        self.columns = np.searchsorted(self.grid, times) + 1 # path-matrix columns of the observations
+
+    @classmethod
+    def every(cls, interval, T, start=0.0, end=None):
+        """Observation every `interval` years (1/52 weekly, 1/12 monthly) inside the window (start, end]."""
+        end = T if end is None else end
+        times = start + interval * np.arange(1, int(np.floor((end - start) / interval + 1e-9)) + 1)
+        return cls(times, T)
+
+    @classmethod
+    def from_dates(cls, dates, start, maturity, basis=365.0):
+        """Observation dates (datetime, 'YYYY-MM-DD', ...) as ACT/basis year fractions from `start`."""
+        def years(date):
+            return (np.datetime64(date, 'D') - np.datetime64(start, 'D')) / np.timedelta64(1, 'D') / basis
+        return cls([years(date) for date in dates], years(maturity))
+
+    def simulate(self, s_0, mu, sigma, n_sims, div_yield=0.0, random_seed=102, **sim_kwargs):
+        """`gbm.simulate_gbm` on the schedule grid: n_sims x (N + 1) paths, column 0 is s_0."""
+        return simulate_gbm(s_0, mu, sigma, self.dt, n_sims, self.N, div_yield, random_seed, **sim_kwargs)
+
+    def observed(self, gbm_sims):
+        """The observation-date columns of paths simulated on this schedule."""
+        if isinstance(gbm_sims, PathSummary):
+            raise ValueError("an observation schedule needs the simulated paths, not a PathSummary")
+        if gbm_sims.shape[-1] != self.N + 1:
+            raise ValueError(f"paths have {gbm_sims.shape[-1]} dates, the schedule simulates {self.N + 1}")
+        if self.columns.size == self.N: # maturity is an observation date: every column but s_0
+            return gbm_sims[..., 1:]
+        return gbm_sims[..., self.columns]
+
+
+def bgk_shift(BARRIER, sigma, monitoring_dt, direction='up'):
+    """
+    Broadie–Glasserman–Kou: a barrier monitored every `monitoring_dt` prices like a
+    continuously monitored barrier moved away from the spot by exp(beta * sigma * sqrt(dt)).
+    """
+    shift = np.exp(BGK_BETA * sigma * np.sqrt(monitoring_dt))
+    return BARRIER * shift if direction == 'up' else BARRIER / shift
+
+
+def bridge_hit_probability(gbm_sims, BARRIER, sigma, dt, direction='up'):
+    """
+    Probability, per path, that the continuous GBM path crossed the barrier somewhere
+    between the simulated dates, given the simulated values (Brownian-bridge crossing law):
+
+        P(no crossing on [t_i, t_i+1]) = 1 - exp(-2 ln(B / S_i) ln(B / S_i+1) / (sigma^2 dt))
+
+    for S_i, S_i+1 on the safe side of B; a grid value on the far side counts as a hit.
+
+    Parameters:
+    - gbm_sims: (n_sims x (N + 1)) path matrix or one block of it (not a PathSummary)
+    - BARRIER: Barrier level
+    - sigma: Volatility the paths were simulated with
+    - dt: Time step of the simulated grid, or an array of the N step sizes (ObservationSchedule.dt)
+    - direction: 'up' (hit at S >= B) or 'down' (hit at S < B)
+
+    Returns:
+    - hit_probability: Array of n_sims values in [0, 1]
+    """
+    if isinstance(gbm_sims, PathSummary):
+        raise ValueError("the Brownian-bridge correction needs the simulated grid, not a PathSummary")
+
+    n_sims, n_cols = gbm_sims.shape
+    scale = -2.0 / (sigma**2 * dt)
+    log_survival = np.empty(n_sims)
+    rows = _rows_per_chunk(n_cols, 8, CHUNK_BYTES)
+
+    for start in range(0, n_sims, rows):
+        block = gbm_sims[start:start + rows]
+        # distance to the barrier in log space, 0 once the grid value is on the far side
+        dist = np.log(BARRIER / block) if direction == 'up' else np.log(block / BARRIER)
+        np.maximum(dist, 0.0, out=dist)
+        p_cross = dist[:, :-1] * dist[:, 1:]
+        p_cross *= scale
+        np.exp(p_cross, out=p_cross)
+        with np.errstate(divide='ignore'):
+            np.log1p(-p_cross, out=p_cross)
+        log_survival[start:start + rows] = p_cross.sum(axis=1)
+
+    return -np.expm1(log_survival)
+
+
+def barrier_hit(gbm_sims, BARRIER, direction='up', observation='european', sigma=None, dt=None):
+    """
+    Knock indicator (or probability) for the barrier pricers.
+
+    - observation = 'european' → barrier checked only at maturity
+    - observation = 'daily' → barrier checked every day; on a grid coarser than daily with
+      sigma and dt given, the Brownian-bridge probability is used with the BGK-shifted barrier,
+      so 12-50 steps a year price daily monitoring without the coarse-grid bias
+    - observation = 'continuous' → Brownian-bridge probability at the barrier itself
+      (sigma and dt required)
+
+    - observation = ObservationSchedule → barrier checked on the schedule dates only
+
+    Returns a boolean array (grid checks) or a float array of hit probabilities.
+    """
+    if isinstance(observation, ObservationSchedule):
+        observed = observation.observed(gbm_sims)
+        return path_max(observed) >= BARRIER if direction == 'up' else path_min(observed) < BARRIER
+
+    observation = observation.lower()
+    if observation == 'european':
+        S_T = terminal_prices(gbm_sims)
+        return S_T >= BARRIER if direction == 'up' else S_T < BARRIER
+
+    if observation == 'continuous':
+        if sigma is None or dt is None:
+            raise ValueError("observation='continuous' needs sigma and dt for the Brownian-bridge correction")
+        return bridge_hit_probability(gbm_sims, BARRIER, sigma, dt, direction)
+
+    # 'daily'
+    if sigma is not None and dt is not None and np.any(np.asarray(dt) > DAILY * (1 + 1e-9)):
+        return bridge_hit_probability(gbm_sims, bgk_shift(BARRIER, sigma, DAILY, direction), sigma, dt, direction)
+    return path_max(gbm_sims) >= BARRIER if direction == 'up' else path_min(gbm_sims) < BARRIER
@@ -0,0 +1,257 @@
+import numpy as np
+import pandas as pd
+
+from gbm import CHUNK_BYTES, PathSummary, _rows_per_chunk, terminal_prices, first_hit_step
+from mc_stats import RunningMoments, iter_blocks
+from barrier_monitoring import ObservationSchedule, barrier_hit
+
+# ----------------------------------- FIRST PASSAGE & REBATES ----------------------------------------------
+
+def knock_out_rebate_payoff(gbm_sims, K, BARRIER, rebate, r, T, dt, direction='up', option_type='call',
+                            observation='daily', rebate_at='hit'):
+    """
+    Per-path pay-off of a knock-out call or put that pays `rebate` when it is knocked out, and the
+    knock-out flags. Like the other *_payoff functions the values are in maturity money (the caller
+    discounts them by exp(-r T)), so a rebate paid at the hit step tau is grown by exp(r (T - tau dt)).
+
+    Parameters:
+    - gbm_sims: Path matrix, one block of it, or a gbm.PathSummary simulated with barriers=(BARRIER,)
+    - K, BARRIER: Strike and barrier
+    - rebate: Cash paid on knock-out
+    - r, T, dt: Rate, maturity and simulation step (to discount the rebate from its payment date)
+    - direction: 'up' or 'down'
+    - option_type: 'call' or 'put'
+    - observation: 'european', 'daily' or an ObservationSchedule
+    - rebate_at: 'hit' (paid at the knock-out date) or 'expiry' (paid at T)
+    """
+    S_T = terminal_prices(gbm_sims)
+    vanilla = np.maximum(0, S_T - K) if option_type.lower() == 'call' else np.maximum(0, K - S_T)
+
+    if rebate_at not in ('hit', 'expiry'):
+        raise ValueError("rebate_at must be 'hit' or 'expiry'")
+    schedule = isinstance(observation, ObservationSchedule)
+    if rebate_at == 'expiry' or not (schedule or observation.lower() == 'daily'): # a European knock is at T anyway
+        hit = barrier_hit(gbm_sims, BARRIER, direction, observation)
+        return np.where(hit, rebate, vanilla), hit
+
+    if schedule: # first observation date at or beyond the barrier
+        steps = first_hit_step(observation.observed(gbm_sims), BARRIER, direction)
+        hit_time = observation.times[steps]
+    else:
+        steps = first_hit_step(gbm_sims, BARRIER, direction)
+        hit_time = steps * dt
+    hit = steps >= 0
+    rebate_value = rebate * np.exp(r * (T - hit_time))
+    return np.where(hit, rebate_value, vanilla), hit
+
+
+def knock_time_histogram(gbm_sims, BARRIER, direction='up', N=None):
+    """
+    Number of paths that first reach the barrier at each time step (knock-in time for an in option,
+    knock-out time for an out option), from `gbm.first_hit_step`; never-hit paths are not counted.
+    Its cumulative sum / n_sims is the fraction knocked so far.
+    N (the number of time steps) is read from a path matrix and must be given with a PathSummary.
+    """
+    if N is None:
+        if isinstance(gbm_sims, PathSummary):
+            raise ValueError("a PathSummary does not carry the number of time steps, pass N")
+        N = gbm_sims.shape[-1] - 1
+    steps = first_hit_step(gbm_sims, BARRIER, direction)
+    return np.bincount(steps[steps >= 0], minlength=N + 1)
+
+
+# ----------------------------------- SINGLE-PASS BARRIER ENGINE ----------------------------------------------
+
+def _prefix_moments(values, cuts):
+    """
+    Count, mean and centred sum of squares of values[:c] for every c in `cuts`. The segments between
+    consecutive cuts are folded into a RunningMoments in order (Chan's update), so no raw sum of
+    squares is ever differenced.
+    """
+    cuts = np.asarray(cuts)
+    unique_cuts, position = np.unique(cuts, return_inverse=True)
+    moments = RunningMoments()
+    mean, m2 = np.empty(unique_cuts.size), np.empty(unique_cuts.size)
+    previous = 0
+    for j, cut in enumerate(unique_cuts):
+        moments.update(values[previous:cut])
+        mean[j], m2[j] = moments.mean, moments.m2
+        previous = cut
+    return cuts, mean[position].reshape(cuts.shape), m2[position].reshape(cuts.shape)
+
+
+def summarize_paths(gbm_sims, schedule=None):
+    """
+    Terminal value, running max and running min of every path in one pass over the paths
+    (each row chunk is reduced to max and min while it is still in cache).
+    gbm_sims is a path matrix, a stream of blocks (gbm.stream_gbm) or already a PathSummary.
+    With an ObservationSchedule the extrema are taken over its observation dates only; a PathSummary
+    holds the extrema over every simulated date, so it is only accepted with a schedule that observes
+    every date of its grid.
+    """
+    partial_schedule = schedule is not None and schedule.columns.size != schedule.N
+    if isinstance(gbm_sims, PathSummary) and not partial_schedule:
+        return gbm_sims
+
+    terminal, running_max, running_min = [], [], []
+    for block in iter_blocks(gbm_sims):
+        if isinstance(block, PathSummary):
+            if partial_schedule:
+                raise ValueError("a PathSummary keeps the extrema over every simulated date, pass the paths to "
+                                 "observe the barrier on a schedule")
+            terminal.append(block.terminal)
+            running_max.append(block.running_max)
+            running_min.append(block.running_min)
+            continue
+        rows = _rows_per_chunk(block.shape[1], block.itemsize, CHUNK_BYTES)
+        for start in range(0, block.shape[0], rows):
+            chunk = block[start:start + rows]
+            observed = chunk if schedule is None else schedule.observed(chunk)
+            terminal.append(np.array(chunk[:, -1]))
+            running_max.append(observed.max(axis=1))
+            running_min.append(observed.min(axis=1))
+
+    return PathSummary(terminal=np.concatenate(terminal), running_max=np.concatenate(running_max),
+                       running_min=np.concatenate(running_min), first_hit={}, average=None)
+
+
+class BarrierOption:
+    """
+    Prices any number of single-barrier variants on one set of paths.
+
+    The paths are reduced once to (terminal, max, min); every variant is then priced from
+    those three arrays instead of rescanning the path matrix. Knock-out and knock-in of the same
+    strike/barrier share their hit flags (in-out parity: in = vanilla - out path by path), so
+    the matching knock-in costs one subtraction and both report the same hit rate.
+
+    Example:
+        book = BarrierOption(gbm_sims, discount_factor)
+        out_call, in_call = book.price_pair(K=60, BARRIER=80, direction='up', option_type='call')
+        prices = book.price_book([(60, 80, 'up-and-out', 'call'), (100, 80, 'down-and-in', 'put')])
+        grid = book.price_grid(strikes=np.arange(50, 71), barriers=np.arange(75, 101))
+    """
+
+    def __init__(self, gbm_sims, discount_factor=1.0, paired=False, observation='daily'):
+        """
+        Parameters:
+        - gbm_sims: Path matrix, stream of path blocks or gbm.PathSummary
+        - discount_factor: exp(-r * T)
+        - paired: True for variance_reduction='antithetic' paths
+        - observation: Default observation, 'european', 'daily' or an ObservationSchedule (then the
+          extrema are those of the schedule dates and 'daily' prices on the schedule)
+        """
+        schedule = observation if isinstance(observation, ObservationSchedule) else None
+        self.summary = summarize_paths(gbm_sims, schedule)
+        self.discount_factor = discount_factor
+        self.paired = paired
+        self.observation = 'daily' if schedule else observation
+        self._pairs = {}
+
+    def _estimate(self, payoff, hit):
+        return RunningMoments(self.paired).update(payoff, hit).estimate(self.discount_factor)
+
+    def price_pair(self, K, BARRIER, direction='up', option_type='call', observation=None):
+        """
+        Knock-out and knock-in estimates of one strike / barrier / direction / option type.
+
+        Returns:
+        - (out_estimate, in_estimate): two MCEstimate(price, std_error, variance, hit_rate, n_paths)
+        """
+        observation = (observation or self.observation).lower()
+        if observation not in ('european', 'daily'):
+            raise ValueError("BarrierOption prices 'european' or 'daily' observation from the path summary")
+        key = (K, BARRIER, direction, option_type.lower(), observation)
+        if key not in self._pairs:
+            summary = self.summary
+            hit = barrier_hit(summary, BARRIER, direction, observation)
+            if option_type.lower() == 'call':
+                vanilla = np.maximum(0, summary.terminal - K)
+            else:
+                vanilla = np.maximum(0, K - summary.terminal)
+            out_payoff = np.where(hit, 0, vanilla)
+            self._pairs[key] = (self._estimate(out_payoff, hit), self._estimate(vanilla - out_payoff, hit))
+        return self._pairs[key]
+
+    def price(self, K, BARRIER, barrier_type='up-and-out', option_type='call', observation=None):
+        """MCEstimate of one variant, barrier_type in 'up-and-out', 'up-and-in', 'down-and-out', 'down-and-in'."""
+        direction, _, knock = barrier_type.lower().split('-')
+        out_estimate, in_estimate = self.price_pair(K, BARRIER, direction, option_type, observation)
+        return out_estimate if knock == 'out' else in_estimate
+
+    def price_book(self, variants, observation=None):
+        """
+        Prices a list of (K, BARRIER, barrier_type, option_type) variants.
+
+        Returns:
+        - dict variant -> MCEstimate
+        """
+        return {variant: self.price(*variant, observation=observation) for variant in variants}
+
+    def price_grid(self, strikes, barriers, barrier_type='up-and-out', option_type='call', observation=None,
+                   std_error=False):
+        """
+        Prices a whole strike x barrier grid of one variant.
+
+        The paths are sorted once by the statistic the barrier is checked on (max, min or terminal),
+        so the paths that survive a barrier are a prefix of that order: for each strike a cumulative
+        sum of the pay-offs gives the knock-out sum of every barrier at once (searchsorted), and the
+        knock-in sum is the vanilla total minus it. Memory is O(n_sims) per strike, never
+        O(n_sims * |K| * |B|).
+
+        Parameters:
+        - strikes, barriers: 1-D arrays of strikes and barrier levels
+        - barrier_type: 'up-and-out', 'up-and-in', 'down-and-out' or 'down-and-in'
+        - option_type: 'call' or 'put'
+        - observation: 'european' or 'daily' (default is the engine's)
+        - std_error: True to also return the grid of standard errors
+
+        Returns:
+        - DataFrame of prices (index K, columns BARRIER), or (prices, std_errors) with std_error=True
+        """
+        if self.paired:
+            raise ValueError("price_grid needs unpaired paths (the prefix sums do not keep antithetic pairs together)")
+        observation = (observation or self.observation).lower()
+        direction, _, knock = barrier_type.lower().split('-')
+        strikes = np.asarray(strikes, dtype=np.float64)
+        barriers = np.asarray(barriers, dtype=np.float64)
+        summary = self.summary
+
+        if observation == 'european':
+            level = summary.terminal
+        elif observation == 'daily':
+            level = summary.running_max if direction == 'up' else summary.running_min
+        else:
+            raise ValueError("BarrierOption prices 'european' or 'daily' observation from the path summary")
+
+        # survivors of barrier B: level < B (up) or level >= B (down), a prefix of the sorted order
+        if direction == 'up':
+            order = np.argsort(level, kind='stable')
+            n_alive = np.searchsorted(level[order], barriers, side='left')
+        else:
+            order = np.argsort(-level, kind='stable')
+            n_alive = np.searchsorted(-level[order], -barriers, side='right')
+        terminal = summary.terminal[order]
+        n = terminal.size
+
+        sums = np.empty((strikes.size, barriers.size))
+        m2 = np.empty_like(sums) # centred sums of squares of the option pay-offs (std_error only)
+        for i, K in enumerate(strikes):
+            vanilla = np.maximum(0, terminal - K) if option_type.lower() == 'call' else np.maximum(0, K - terminal)
+            cum = np.concatenate(([0.0], np.cumsum(vanilla)))
+            sums[i] = cum[n_alive] # knock-out: surviving prefix
+            if knock == 'in':
+                sums[i] = cum[-1] - sums[i]
+            if std_error: # the paying paths are a prefix (out) or a suffix (in) of the order, the rest pay 0
+                if knock == 'out':
+                    count, paying_mean, paying_m2 = _prefix_moments(vanilla, n_alive)
+                else:
+                    count, paying_mean, paying_m2 = _prefix_moments(vanilla[::-1], n - n_alive)
+                m2[i] = paying_m2 + paying_mean**2 * count * (n - count) / n # Chan's update with the zeros
+
+        mean = sums / n
+        labels = dict(index=pd.Index(strikes, name='K'), columns=pd.Index(barriers, name='BARRIER'))
+        prices = pd.DataFrame(self.discount_factor * mean, **labels)
+        if not std_error:
+            return prices
+        variance = m2 / (n - 1)
+        return prices, pd.DataFrame(self.discount_factor * np.sqrt(variance / n), **labels)
@@ -0,0 +1,257 @@
+import numpy as np
+from collections import namedtuple
+from scipy.linalg import solve_banded
+
+from barrier_monitoring import DAILY, ObservationSchedule
+
+# ----------------------------------- CRANK–NICOLSON PDE ENGINE ----------------------------------------------
+
+PDEResult = namedtuple("PDEResult", ["price", "delta", "gamma", "theta"])
+
+
+def pde_grid(lo, hi, points, n_space=400, concentration=0.1, midpoints=()):
+    """
+    Non-uniform spot grid on [lo, hi] with n_space + 1 nodes, dense around each of `points` and
+    `midpoints` and coarse in the tails. The node density is
+    1 + sum_i 1 / sqrt(1 + ((S - c_i) / (concentration * c_i))^2); the nearest node is then moved onto
+    every point (strike kink, spot), and every midpoint (a discretely monitored barrier) is put halfway
+    between two nodes, where the knock-out step of the reset is second-order accurate.
+    """
+    points = [c for c in points if lo < c < hi]
+    midpoints = [c for c in midpoints if lo < c < hi]
+    fine = np.linspace(lo, hi, 20 * n_space + 1)
+    density = np.ones_like(fine)
+    for c in points + midpoints:
+        density += 1 / np.sqrt(1 + ((fine - c) / (concentration * c))**2)
+    cdf = np.concatenate(([0.0], np.cumsum(0.5 * (density[1:] + density[:-1]) * np.diff(fine))))
+    grid = np.interp(np.linspace(0, cdf[-1], n_space + 1), cdf, fine)
+
+    for c in points:
+        i = int(np.argmin(np.abs(grid - c)))
+        if 0 < i < n_space and grid[i - 1] < c < grid[i + 1]:
+            grid[i] = c
+    for c in midpoints:
+        i = int(np.searchsorted(grid, c))
+        if 1 < i < n_space:
+            h = grid[i] - grid[i - 1]
+            grid[i - 1], grid[i] = c - h / 2, c + h / 2
+    return grid
+
+
+def _monitoring_times(observation, T):
+    """Discrete monitoring dates (year fractions in (0, T]), or None for a continuously watched barrier."""
+    if isinstance(observation, ObservationSchedule):
+        return observation.times
+    observation = observation.lower()
+    if observation == 'continuous':
+        return None
+    if observation == 'daily':
+        return DAILY * np.arange(1, int(np.floor(T / DAILY + 1e-9)) + 1)
+    if observation == 'european':
+        return np.array([T])
+    raise ValueError(f"Invalid observation type for the PDE engine: {observation}")
+
+
+def _operator(S, r, sigma, div_yield):
+    """Tridiagonal Black–Scholes operator 0.5 sigma^2 S^2 V_SS + (r - q) S V_S - r V on a non-uniform grid."""
+    h_m = np.diff(S)[:-1]
+    h_p = np.diff(S)[1:]
+    s = S[1:-1]
+    diffusion = 0.5 * sigma**2 * s**2
+    convection = (r - div_yield) * s
+
+    lower, diag, upper = np.zeros_like(S), np.full_like(S, -r), np.zeros_like(S)
+    lower[1:-1] = (2 * diffusion - convection * h_p) / (h_m * (h_m + h_p))
+    upper[1:-1] = (2 * diffusion + convection * h_m) / (h_p * (h_m + h_p))
+    diag[1:-1] += -2 * diffusion / (h_m * h_p) + convection * (h_p - h_m) / (h_m * h_p)
+    return lower, diag, upper
+
+
+def pde_price(S_0, K, r, T, sigma, div_yield=0.0, option_type='call', upper=None, lower=None,
+              observation='continuous', rebate=0.0, rebate_at='hit', n_space=400, n_time=200, rannacher_steps=2,
+              steps_per_date=4):
+    """
+    Crank–Nicolson price, delta, gamma and theta of a European call / put, optionally knocked out at an
+    upper and / or lower barrier, under flat-parameter GBM.
+
+    The equation is solved backwards in time-to-maturity on a non-uniform spot grid (pde_grid) with a
+    banded tridiagonal solve per step. After the pay-off and after every discrete knock-out the next step
+    is replaced by `rannacher_steps` pairs of fully implicit half-steps, which damps the oscillations Crank–Nicolson
+    otherwise leaves at the kink and at the barrier, so the Greeks are smooth.
+
+    - observation = 'continuous' → the barrier is the edge of the grid (V = rebate there)
+    - observation = 'daily' / 'european' / ObservationSchedule → the grid extends past the barrier and the
+      value is reset to the rebate beyond it on each monitoring date (time steps land on every date)
+
+    Parameters:
+    - S_0, K: Spot and strike
+    - r, T, sigma, div_yield: Rate, maturity in years, volatility, continuous dividend yield
+    - option_type: 'call' or 'put'
+    - upper, lower: Knock-out barrier levels (None = no barrier on that side)
+    - rebate: Cash paid on knock-out, at the hit (rebate_at='hit') or at maturity (rebate_at='expiry')
+    - n_space, n_time: Number of spot intervals and (minimum) number of time steps
+    - rannacher_steps: Number of time steps taken as two implicit half-steps after each discontinuity
+      (0 = plain Crank–Nicolson)
+    - steps_per_date: Minimum number of time steps between two monitoring dates
+
+    Returns:
+    - PDEResult(price, delta, gamma, theta) at S_0 (theta per year)
+    """
+    option_type = option_type.lower()
+    if option_type not in ('call', 'put'):
+        raise ValueError(f"Invalid option type: {option_type}")
+    if rebate_at not in ('hit', 'expiry'):
+        raise ValueError("rebate_at must be 'hit' or 'expiry'")
+    monitoring = _monitoring_times(observation, T)
+
+    def rebate_value(tau):
+        return rebate if rebate_at == 'hit' else rebate * np.exp(-r * tau)
+
+    # already knocked out at the valuation date
+    if (upper is not None and S_0 >= upper) or (lower is not None and S_0 < lower):
+        return PDEResult(float(rebate_value(T)), 0.0, 0.0, 0.0 if rebate_at == 'hit' else float(r * rebate_value(T)))
+
+    # domain: continuous barriers are the grid edges; a discrete barrier resets everything beyond it on each
+    # date, so the grid only reaches ~6 standard deviations of one monitoring gap past it
+    hi = max(S_0, K) * np.exp(6 * sigma * np.sqrt(T))
+    lo = 0.0
+    if monitoring is None:
+        hi = upper if upper is not None else hi
+        lo = lower if lower is not None else lo
+    else:
+        reach = np.exp(6 * sigma * np.sqrt(np.diff(np.concatenate(([0.0], monitoring, [T]))).max()))
+        hi = upper * reach if upper is not None else hi
+        lo = lower / reach if lower is not None else lo
+    barriers = [b for b in (upper, lower) if b is not None]
+    if monitoring is None:
+        S = pde_grid(lo, hi, [K, S_0] + barriers, n_space)
+    else:
+        S = pde_grid(lo, hi, [K, S_0], n_space, midpoints=barriers)
+    V = np.maximum(0, S - K) if option_type == 'call' else np.maximum(0, K - S)
+
+    # time grid in tau = T - t: uniform steps between the monitoring dates, at least steps_per_date of them
+    # so that Crank–Nicolson steps follow the implicit start-up after each reset
+    resets = [] if monitoring is None else sorted({round(T - t, 12) for t in monitoring})
+    events = np.unique(np.concatenate(([0.0, T], [tau for tau in resets if 0 < tau < T])))
+    step = T / n_time
+    least = 1 if monitoring is None else steps_per_date
+    taus = np.concatenate([[0.0]] + [np.linspace(a, b, max(least, int(np.ceil((b - a) / step - 1e-9))) + 1)[1:]
+                                     for a, b in zip(events[:-1], events[1:])])
+
+    knocked = np.zeros(S.size, dtype=bool)
+    if monitoring is not None:
+        if upper is not None:
+            knocked |= S >= upper
+        if lower is not None:
+            knocked |= S < lower
+    if monitoring is not None and 0.0 in resets: # monitoring at maturity
+        V[knocked] = rebate_value(0.0)
+
+    op_lower, op_diag, op_upper = _operator(S, r, sigma, div_yield)
+    fixed = np.zeros(S.size, dtype=bool) # Dirichlet rows: the far edge, and continuous barriers
+    fixed[-1] = True
+    fixed[0] = lo > 0
+
+    def edge_values(tau):
+        values = np.empty(2)
+        if monitoring is None and lower is not None:
+            values[0] = rebate_value(tau)
+        else: # S = 0 row is the PDE itself (dV/dtau = -r V), not used
+            values[0] = 0.0
+        if monitoring is None and upper is not None:
+            values[1] = rebate_value(tau)
+        elif option_type == 'call':
+            values[1] = S[-1] * np.exp(-div_yield * tau) - K * np.exp(-r * tau)
+        else:
+            values[1] = 0.0
+        return values
+
+    banded = {} # (I - theta dtau L) in banded storage, per (dtau, theta): the steps repeat between dates
+
+    def theta_step(V, tau, dtau, theta):
+        explicit = V + (1 - theta) * dtau * (op_diag * V
+                                              + op_lower * np.concatenate(([0.0], V[:-1]))
+                                              + op_upper * np.concatenate((V[1:], [0.0])))
+        key = (round(dtau, 14), theta)
+        if key not in banded:
+            ab = np.zeros((3, S.size))
+            ab[0, 1:] = -theta * dtau * op_upper[:-1]
+            ab[1] = 1 - theta * dtau * op_diag
+            ab[2, :-1] = -theta * dtau * op_lower[1:]
+            # Dirichlet rows: identity
+            ab[1, fixed] = 1.0
+            ab[0, 1:][fixed[:-1]] = 0.0
+            ab[2, :-1][fixed[1:]] = 0.0
+            banded[key] = ab
+        explicit[0], explicit[-1] = np.where(fixed[[0, -1]], edge_values(tau + dtau), explicit[[0, -1]])
+        return solve_banded((1, 1), banded[key], explicit, overwrite_b=True, check_finite=False)
+
+    smooth = rannacher_steps # implicit start-up steps still owed after the last discontinuity
+    reset_set = set(resets)
+    for tau, tau_next in zip(taus[:-1], taus[1:]):
+        dtau = tau_next - tau
+        if smooth:
+            half = dtau / 2
+            V = theta_step(V, tau, half, 1.0)
+            V = theta_step(V, tau + half, half, 1.0)
+            smooth -= 1
+        else:
+            V = theta_step(V, tau, dtau, 0.5)
+        if round(tau_next, 12) in reset_set and tau_next < T - 1e-12:
+            V[knocked] = rebate_value(tau_next)
+            smooth = rannacher_steps
+
+    # Greeks at the spot node from the non-uniform three-point stencil; theta from the PDE itself
+    i = int(np.argmin(np.abs(S - S_0)))
+    i = min(max(i, 1), S.size - 2)
+    h_m, h_p = S[i] - S[i - 1], S[i + 1] - S[i]
+    delta = (-h_p / (h_m * (h_m + h_p)) * V[i - 1] + (h_p - h_m) / (h_m * h_p) * V[i]
+             + h_m / (h_p * (h_m + h_p)) * V[i + 1])
+    gamma = 2 * (V[i - 1] / (h_m * (h_m + h_p)) - V[i] / (h_m * h_p) + V[i + 1] / (h_p * (h_m + h_p)))
+    price = np.interp(S_0, S, V) if S[i] != S_0 else V[i]
+    theta = r * price - (r - div_yield) * S_0 * delta - 0.5 * sigma**2 * S_0**2 * gamma
+    return PDEResult(float(price), float(delta), float(gamma), float(theta))
+
+
+def barrier_pde(S_0, K, BARRIER, r, T, sigma, div_yield=0.0, barrier_type='up-and-out', option_type='call',
+                observation='daily', rebate=0.0, rebate_at='hit', **grid):
+    """
+    PDE price and Greeks of a single-barrier option; knock-ins by in–out parity (vanilla - knock-out).
+    Same barrier types as barrier_analytic.barrier_price, extra keyword arguments go to pde_price.
+
+    Returns:
+    - PDEResult(price, delta, gamma, theta)
+    """
+    direction, _, knock = barrier_type.lower().split('-')
+    if direction not in ('up', 'down') or knock not in ('in', 'out'):
+        raise ValueError(f"Invalid barrier type: {barrier_type}")
+    side = {'upper': BARRIER} if direction == 'up' else {'lower': BARRIER}
+    if knock == 'out':
+        return pde_price(S_0, K, r, T, sigma, div_yield, option_type, observation=observation, rebate=rebate,
+                         rebate_at=rebate_at, **side, **grid)
+    if rebate:
+        raise ValueError("the PDE engine prices knock-in options without rebate")
+    out = pde_price(S_0, K, r, T, sigma, div_yield, option_type, observation=observation, **side, **grid)
+    vanilla = pde_price(S_0, K, r, T, sigma, div_yield, option_type, **grid)
+    return PDEResult(*(v - o for v, o in zip(vanilla, out)))
+
+
+#if you want to test out the file use: ---------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_put_value
+    from barrier_analytic import barrier_price
+
+    S_0, K, r, T, sigma = 100, 100, 0.04, 1, 0.3
+
+    call = pde_price(S_0, K, r, T, sigma, option_type='call')
+    put = pde_price(S_0, K, r, T, sigma, option_type='put')
+    print(f"PDE call {call.price:.6f} vs Black-Scholes {black_scholes_call_value(S_0, K, r, T, sigma):.6f}")
+    print(f"PDE put  {put.price:.6f} vs Black-Scholes {black_scholes_put_value(S_0, K, r, T, sigma):.6f}")
+
+    for observation in ('continuous', 'daily'):
+        pde = barrier_pde(S_0, K, 130, r, T, sigma, barrier_type='up-and-out', observation=observation)
+        exact = barrier_price(S_0, K, 130, r, T, sigma, monitoring_dt=None if observation == 'continuous' else DAILY)
+        print(f"Up-and-out call ({observation}): PDE {pde.price:.6f} vs closed form {float(exact):.6f}, "
+              f"delta {pde.delta:.4f}, gamma {pde.gamma:.5f}, theta {pde.theta:.4f}")
@@ -0,0 +1,112 @@
+import numpy as np
+
+from gbm import CHUNK_BYTES, _normal_source, _rows_per_chunk
+from mc_stats import RunningMoments
+from mc_greeks import BarrierGreeks, GreekEstimate
+
+# ----------------------------------- BUMP-AND-REVALUE GREEKS ----------------------------------------------
+
+# relative spot bump, absolute vol bump, absolute rate bump
+DEFAULT_BUMPS = {'s_0': 0.01, 'sigma': 0.01, 'r': 0.001}
+
+# scenario order of the batch: base, then the up / down bump of each input
+SCENARIOS = (('base', 0), ('s_0', 1), ('s_0', -1), ('sigma', 1), ('sigma', -1), ('r', 1), ('r', -1))
+
+
+def bump_greeks(payoff_fn, s_0, r, sigma, T, n_sims, N=252, div_yield=0.0, random_seed=102, bumps=None, dt=None,
+                sampling='pseudo', variance_reduction=None, memory_budget=8 * CHUNK_BYTES):
+    """
+    Central-difference delta, gamma, vega and rho of any path pay-off, with common random numbers.
+
+    One set of normals is drawn; the base log-increments x = (r - q - sigma^2 / 2) dt + sigma sqrt(dt) z
+    are rescaled into the bumped ones (x' = a + (sigma' / sigma) x, s_0' = s_0 (1 + h)), and all seven
+    scenarios (base, s_0 +-, sigma +-, r +-) are built as one (7 x rows x (N + 1)) batch and priced by a
+    single payoff_fn call per block. Every Greek is the mean of per-path differences, so its standard
+    error is that of the difference, not of two independent prices.
+
+    Parameters:
+    - payoff_fn: block -> payoff or (payoff, hit) in maturity money, e.g.
+      functools.partial(UpAndOut_payoff, K=60, BARRIER=80, observation='daily')
+    - s_0, r, sigma, T, div_yield: Market inputs (the paths are simulated under Q, mu = r)
+    - n_sims: Number of paths
+    - N: Number of time steps (default is 252); ignored when dt is an array
+    - random_seed, sampling, variance_reduction: as in `gbm.simulate_gbm`
+    - bumps: Bump sizes, default DEFAULT_BUMPS ({'s_0': relative, 'sigma': absolute, 'r': absolute})
+    - dt: Time step (default is T / N) or an array of steps, e.g. ObservationSchedule.dt
+    - memory_budget: Bytes for the scenario batch of one block (default is 64 MB)
+
+    Returns:
+    - BarrierGreeks(price, delta, gamma, vega, rho), each a GreekEstimate(value, std_error)
+    """
+    bumps = dict(DEFAULT_BUMPS, **(bumps or {}))
+    if np.ndim(dt):
+        N = len(dt)
+    dt = T / N if dt is None else np.asarray(dt, dtype=np.float64)
+
+    # per-scenario inputs, shaped to broadcast against (scenario, path, step)
+    inputs = {'s_0': s_0, 'sigma': sigma, 'r': r}
+    shape = (len(SCENARIOS), 1, 1)
+    scen = {name: np.full(shape, value, dtype=np.float64) for name, value in inputs.items()}
+    h_s = s_0 * bumps['s_0']
+    for k, (name, direction) in enumerate(SCENARIOS):
+        if name != 'base':
+            scen[name][k] += direction * (h_s if name == 's_0' else bumps[name])
+
+    drift = (r - div_yield - 0.5 * sigma**2) * dt
+    ratio = scen['sigma'] / sigma
+    shift = (scen['r'] - div_yield - 0.5 * scen['sigma']**2) * dt - ratio * drift # x' = shift + ratio * x
+    discount = np.exp(-scen['r'][:, 0, 0] * T)
+
+    paired = variance_reduction == 'antithetic'
+    rng = _normal_source(N, random_seed, sampling, n_sims, variance_reduction)
+    rows = min(n_sims, _rows_per_chunk(N + 1, 8 * len(SCENARIOS), memory_budget))
+    z = np.empty((rows, N))
+    batch = np.empty((len(SCENARIOS), rows, N + 1))
+    moments = [RunningMoments(paired) for _ in BarrierGreeks._fields]
+
+    for start in range(0, n_sims, rows):
+        n = min(rows, n_sims - start)
+        rng.standard_normal(dtype=np.float64, out=z[:n])
+        base = z[:n] * (sigma * np.sqrt(dt)) + drift # base log-increments
+
+        paths = batch[:, :n]
+        np.multiply(ratio, base, out=paths[:, :, 1:])
+        paths[:, :, 1:] += shift
+        paths[:, :, 0] = np.log(scen['s_0'][:, 0])
+        np.cumsum(paths, axis=2, out=paths)
+        np.exp(paths, out=paths)
+
+        values = payoff_fn(paths.reshape(-1, N + 1))
+        values = values[0] if isinstance(values, tuple) else values
+        V = np.asarray(values, dtype=np.float64).reshape(len(SCENARIOS), n) * discount[:, None]
+
+        base_v, s_up, s_dn, v_up, v_dn, r_up, r_dn = V
+        for moment, sample in zip(moments, (
+                base_v,
+                (s_up - s_dn) / (2 * h_s),
+                (s_up - 2 * base_v + s_dn) / h_s**2,
+                (v_up - v_dn) / (2 * bumps['sigma']),
+                (r_up - r_dn) / (2 * bumps['r']))):
+            moment.update(sample)
+
+    return BarrierGreeks(*(GreekEstimate(float(m.mean), float(np.sqrt(m.variance / m.n))) for m in moments))
+
+
+#if you want to test out the file use: ---------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    from functools import partial
+    from UpAndOut import UpAndOut_payoff
+
+    S_0, r, sigma, T = 100, 0.04, 0.3, 1
+    K_1, K_2 = 95, 110 # long bull spread: long call K_1, short call K_2
+
+    legs = {
+        'bull spread': lambda paths: np.maximum(0, paths[:, -1] - K_1) - np.maximum(0, paths[:, -1] - K_2),
+        'up-and-out call': partial(UpAndOut_payoff, K=100, BARRIER=130, observation='daily'),
+    }
+    for name, payoff_fn in legs.items():
+        greeks = bump_greeks(payoff_fn, S_0, r, sigma, T, n_sims=50_000)
+        print(f"{name}: " + ", ".join(f"{field} {g.value:.4f} ({g.std_error:.4f})"
+                                      for field, g in zip(greeks._fields, greeks)))
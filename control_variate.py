@@ -0,0 +1,118 @@
+import numpy as np
+from collections import namedtuple
+
+from gbm import terminal_prices
+from mc_stats import iter_blocks
+from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_put_value
+
+# ----------------------------------- CONTROL VARIATES ----------------------------------------------
+
+# price: control-variate adjusted price, beta: regression coefficient on the control,
+# variance_reduction_factor: raw variance / adjusted variance (= 1 / (1 - corr**2)),
+# raw_price / raw_std_error: the plain Monte-Carlo mean for comparison
+CVEstimate = namedtuple("CVEstimate", ["price", "std_error", "beta", "variance_reduction_factor",
+                                       "raw_price", "raw_std_error", "hit_rate", "n_paths"])
+
+
+def vanilla_control_price(S_0, K, r, T, sigma, div_yield=0.0, option_type='call'):
+    """
+    Exact Black-Scholes price of the vanilla control. The dividend yield enters through
+    the forward-equivalent spot S_0 * exp(-q T), so the existing pricers are reused as is.
+    """
+    S_q = S_0 * np.exp(-div_yield * T)
+    if option_type.lower() == 'call':
+        return black_scholes_call_value(S_q, K, r, T, sigma)
+    return black_scholes_put_value(S_q, K, r, T, sigma)
+
+
+class ControlVariateMoments:
+    """
+    Streaming means, variances and covariance of (payoff, control), merged block by block
+    like `mc_stats.RunningMoments`. paired=True averages antithetic pairs first.
+    """
+
+    def __init__(self, paired=False):
+        self.paired = paired
+        self.n = 0
+        self.mean_y = 0.0
+        self.mean_x = 0.0
+        self.s_yy = 0.0
+        self.s_xx = 0.0
+        self.s_xy = 0.0
+        self.hits = 0
+
+    def update(self, y, x, hits=None):
+        y = np.asarray(y, dtype=np.float64).ravel()
+        x = np.asarray(x, dtype=np.float64).ravel()
+        if y.size == 0:
+            return self
+        self.hits += 0 if hits is None else float(np.sum(hits))
+        if self.paired:
+            y = y.reshape(-1, 2).mean(axis=1)
+            x = x.reshape(-1, 2).mean(axis=1)
+
+        n_a, n_b = self.n, y.size
+        n = n_a + n_b
+        mean_y_b, mean_x_b = y.mean(), x.mean()
+        dy_b, dx_b = y - mean_y_b, x - mean_x_b
+        delta_y, delta_x = mean_y_b - self.mean_y, mean_x_b - self.mean_x
+        weight = n_a * n_b / n
+
+        self.s_yy += dy_b @ dy_b + delta_y * delta_y * weight
+        self.s_xx += dx_b @ dx_b + delta_x * delta_x * weight
+        self.s_xy += dy_b @ dx_b + delta_y * delta_x * weight
+        self.mean_y += delta_y * n_b / n
+        self.mean_x += delta_x * n_b / n
+        self.n = n
+        return self
+
+    def estimate(self, control_mean, discount_factor=1.0):
+        """Adjusted estimator Y - beta (X - E[X]) with beta = Cov(Y, X) / Var(X)."""
+        n = self.n
+        n_paths = 2 * n if self.paired else n
+        beta = self.s_xy / self.s_xx if self.s_xx > 0 else 0.0
+        raw_var = self.s_yy / (n - 1)
+        adj_var = max(self.s_yy - beta * self.s_xy, 0.0) / (n - 2) if n > 2 else np.nan
+
+        adjusted = self.mean_y - beta * (self.mean_x - control_mean)
+        return CVEstimate(
+            price=float(discount_factor * adjusted),
+            std_error=float(discount_factor * np.sqrt(adj_var / n)),
+            beta=float(beta),
+            variance_reduction_factor=float(raw_var / adj_var) if adj_var > 0 else np.inf,
+            raw_price=float(discount_factor * self.mean_y),
+            raw_std_error=float(discount_factor * np.sqrt(raw_var / n)),
+            hit_rate=self.hits / n_paths,
+            n_paths=n_paths,
+        )
+
+
+def vanilla_control_variate(gbm_sims, payoff_fn, K, S_0, r, T, sigma, div_yield=0.0,
+                            option_type='call', paired=False):
+    """
+    Control-variate price of a path-dependent pay-off, using the same-path vanilla pay-off
+    (max(S_T - K, 0) or max(K - S_T, 0)) and its exact Black-Scholes price as the control.
+    The paths must be simulated under Q, i.e. with mu = r and the same div_yield.
+
+    Parameters:
+    - gbm_sims: Path matrix, gbm.PathSummary or a stream of path blocks
+    - payoff_fn: block -> (payoff, hit) per-path arrays, e.g. a *_payoff function
+    - K: Strike of the vanilla control
+    - S_0, r, T, sigma, div_yield: Parameters the paths were simulated with
+    - option_type: 'call' or 'put' vanilla control
+    - paired: True for antithetic paths
+
+    Returns:
+    - CVEstimate(price, std_error, beta, variance_reduction_factor, raw_price, raw_std_error, hit_rate, n_paths)
+    """
+    discount_factor = np.exp(-r * T)
+    control_mean = vanilla_control_price(S_0, K, r, T, sigma, div_yield, option_type) / discount_factor
+
+    moments = ControlVariateMoments(paired)
+    for block in iter_blocks(gbm_sims):
+        payoff, hit = payoff_fn(block)
+        S_T = terminal_prices(block)
+        control = np.maximum(0, S_T - K) if option_type.lower() == 'call' else np.maximum(0, K - S_T)
+        moments.update(payoff, control, hit)
+
+    return moments.estimate(control_mean, discount_factor)
@@ -14,7 +14,7 @@ def digital_price(S, K, r, sigma, T, option_type="call", cash_payoff=1.0):
     * option_type = "call"  → pays `cash_payoff` if  S_T > K
     * option_type = "put"   → pays `cash_payoff` if  S_T < K
     """
-    if T <= 0 or sigma <= 0:
+    if np.any(np.asarray(T) <= 0) or np.any(np.asarray(sigma) <= 0):
         raise ValueError("T and sigma must be strictly positive")
     d2 = (np.log(S / K) + (r - 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
     disc = np.exp(-r * T)
@@ -65,6 +65,8 @@ def digital_mtm_matrix(
 # 5.  Quick demo when run standalone
 # ----------------------------------------------------------------
 if __name__ == "__main__":
+
+    from digital_greeks import digital_greeks
     S0     = 55
     r      = 0.06
     sigma  = 0.20
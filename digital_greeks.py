@@ -1,3 +1,7 @@
+import numpy as np
+from scipy.stats import norm
+
+from digital import digital_price
 
 # ----------------------------------------------------------------
 #  Analytic Greeks
@@ -14,33 +18,32 @@ def digital_delta(S, K, r, sigma, T, option_type="call", cash_payoff=1.0):
 def digital_gamma(S, K, r, sigma, T, option_type="call", cash_payoff=1.0):
     d2 = (np.log(S / K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
     disc = np.exp(-r * T)
-    term = (-d2 / (S * S * sigma * np.sqrt(T))) - 1/(S * S * sigma * np.sqrt(T))
-    factor = cash_payoff * disc * _phi(d2) * term
+    d1 = d2 + sigma * np.sqrt(T)
+    factor = -cash_payoff * disc * _phi(d2) * d1 / (S * S * sigma * sigma * T)
     return factor if option_type.lower() == "call" else -factor
  
 def digital_vega(S, K, r, sigma, T, option_type="call", cash_payoff=1.0):
     d2 = (np.log(S / K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
     disc = np.exp(-r * T)
-    term = -d2 / sigma
-    factor = cash_payoff * disc * _phi(d2) * term
+    d1 = d2 + sigma * np.sqrt(T)
+    factor = -cash_payoff * disc * _phi(d2) * d1 / sigma
     return factor if option_type.lower() == "call" else -factor
  
 def digital_theta(S, K, r, sigma, T, option_type="call", cash_payoff=1.0):
     d2 = (np.log(S / K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
     disc = np.exp(-r * T)
     pdf   = _phi(d2)
-    part1 = -cash_payoff * r * disc * (norm.cdf(d2) if option_type=="call" else norm.cdf(-d2))
-    part2 = cash_payoff * disc * pdf * ( (r - 0.5*sigma**2)/(2*sigma*np.sqrt(T)) )
-    if option_type.lower() == "call":
-        return part1 + part2
-    else:
-        return -(part1 + part2)   # sign flips for put
+    sign  = 1.0 if option_type.lower() == "call" else -1.0
+    part1 = cash_payoff * r * disc * norm.cdf(sign * d2)                     # discounting: V decays at r
+    part2 = -sign * cash_payoff * disc * pdf * ((r - 0.5 * sigma**2) / (sigma * np.sqrt(T)) - d2 / (2 * T)) # d2 drifts
+    return part1 + part2   # dV/dt = -dV/dT, per year
  
 def digital_rho(S, K, r, sigma, T, option_type="call", cash_payoff=1.0):
     d2 = (np.log(S / K) + (r - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
     disc = np.exp(-r * T)
-    payoff_prob = norm.cdf(d2) if option_type.lower()=="call" else norm.cdf(-d2)
-    return -T * cash_payoff * disc * payoff_prob
+    sign = 1.0 if option_type.lower() == "call" else -1.0
+    payoff_prob = norm.cdf(sign * d2)
+    return -T * cash_payoff * disc * payoff_prob + sign * cash_payoff * disc * _phi(d2) * np.sqrt(T) / sigma
  
 # ----------------------------------------------------------------
 # 3.  Convenience wrapper: everything in one dict # ----------------------------------------------------------------
@@ -1,10 +1,19 @@
 import numpy as np
 from scipy.stats import norm
+
+from greek_surface import plot_greek_curves
  
 # Cumulative normal distribution function
 N = norm.cdf
 # Probability density function
 n = norm.pdf
+
+# Init parameters of the plots ------------------------------------------------------------------------------ init params
+
+K = 100       # Strike price
+r = 0.05      # Risk-free rate
+T = 1         # Time to expiration (in years)
+vol = 0.2     # Volatility
  
 ################################################################################
 #                                VOMMA (VOLGA)                                 #
@@ -112,150 +121,46 @@ def put_ultima(S, K, r, T, vol):
 
 
 ### Now for plotting ---------------------------------------------------------------------------------------------------------------
- 
+# every plot is one vectorized greek_surface evaluation over 600 spots (see greek_surface.plot_greek_curves)
+
 # Plotting Vomma -------------------------------------------------------------------------------------------- plot vomma
  
 def plot_vomma_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    vomma_values = []
-    for number in x:
-        vomma_val = vomma(number, K, r, T, vol)
-        vomma_values.append(vomma_val)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, vomma_values, lw=2, label='Vomma')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f"Vanilla Call Vomma")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Vomma')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
- 
+    return plot_greek_curves(call_vomma, x, K, r, vol, T, title="Vanilla Call Vomma", label="Vomma", show=show)
+
 # Plotting Vanna -------------------------------------------------------------------------------------------- plot vanna
  
 def plot_vanna_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    vanna_values = []
-    for number in x:
-        vanna_val = vanna(number, K, r, T, vol)
-        vanna_values.append(vanna_val)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, vanna_values, lw=2, label='Vanna')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f"Vanilla Call Vanna")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Vanna')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
- 
+    return plot_greek_curves(call_vanna, x, K, r, vol, T, title="Vanilla Call Vanna", label="Vanna", show=show)
+
 # Plotting Charm -------------------------------------------------------------------------------------------- plot charm
  
 def plot_charm_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    charm_values = []
-    for number in x:
-        charm_val = charm(number, K, r, T, vol)
-        charm_values.append(charm_val)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, charm_values, lw=2, label='Charm')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f"Vanilla Call Charm")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Charm')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
- 
+    return plot_greek_curves(call_charm, x, K, r, vol, T, title="Vanilla Call Charm", label="Charm", show=show)
+
 # Plotting Zomma -------------------------------------------------------------------------------------------- plot zomma
  
 def plot_zomma_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    zomma_values = []
-    for number in x:
-        zomma_val = zomma(number, K, r, T, vol)
-        zomma_values.append(zomma_val)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, zomma_values, lw=2, label='Zomma')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f"Vanilla Call Zomma")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Zomma')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
- 
+    return plot_greek_curves(call_zomma, x, K, r, vol, T, title="Vanilla Call Zomma", label="Zomma", show=show)
+
 # Plotting Color -------------------------------------------------------------------------------------------- plot color
  
 def plot_color_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    color_values = []
-    for number in x:
-        color_val = color(number, K, r, T, vol)
-        color_values.append(color_val)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, color_values, lw=2, label='Color')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f"Vanilla Call Color")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Color')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
- 
+    return plot_greek_curves(call_color, x, K, r, vol, T, title="Vanilla Call Color", label="Color", show=show)
+
 # Plotting Speed -------------------------------------------------------------------------------------------- plot speed
  
 def plot_speed_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    speed_values = []
-    for number in x:
-        speed_val = speed(number, K, r, T, vol)
-        speed_values.append(speed_val)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, speed_values, lw=2, label='Speed')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f"Vanilla Call Speed")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Speed')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
- 
+    return plot_greek_curves(call_speed, x, K, r, vol, T, title="Vanilla Call Speed", label="Speed", show=show)
+
 # Plotting Ultima ------------------------------------------------------------------------------------------- plot ultima
  
 def plot_ultima_(show=True):
     x = np.linspace(0.01, K * 1.6, 600)
-   
-    ultima_values = []
-    for number in x:
-        ultima_val = ultima(number, K, r, T, vol)
-        ultima_values.append(ultima_val)
- 
-    plt.figure(figsize=(7, 4))
-    plt.plot(x, ultima_values, lw=2, label='Ultima')
-    plt.axvline(K, color='green', ls=':', label=f'Strike = {K}')
-    plt.title(f"Vanilla Call Ultima")
-    plt.xlabel(r'Final underlying price $S_T$')
-    plt.ylabel('Ultima')
-    plt.legend()
-    plt.tight_layout()
-    if show:
-        plt.show()
\ No newline at end of file
+    return plot_greek_curves(call_ultima, x, K, r, vol, T, title="Vanilla Call Ultima", label="Ultima", show=show)
@@ -1,22 +1,531 @@
+import warnings
 import numpy as np
- 
+from collections import namedtuple
+from scipy.special import ndtri
+from scipy.stats import qmc
+
 T = 1 # 1year
 N = 252 #no of trad. days
 dt = T / N
- 
-def simulate_gbm(s_0, mu, sigma, dt, n_sims, random_seed=1):
-    """Simulate stock returns using Geometric Brownian Motion."""
-   
-    np.random.seed(random_seed)
- 
-    # scale is the standard deviation of the distribution (from which you take the draws)
-    # size is the output shape: n_sim rows and N columns
-        # n_sim rows (1000) by N columns (252)
-    # in discrete time, increments dt are scaled by the square root of time step to maintain the properties of the continuous process
-    dW = np.random.normal(scale=np.sqrt(dt), size=(n_sims, N + 1))
- 
-    # simulate the evolution of the process
-    S_t = s_0 * np.exp(np.cumsum((mu - 0.5 * sigma**2) * dt + sigma * dW, axis=1))
-    S_t[:, 0] = s_0 #corrects the first column value and places the first price inside of it
- 
-    return S_t
\ No newline at end of file
+
+CHUNK_BYTES = 8 * 2**20 # scratch size for the normal draws (8 MB), independent of n_sims
+MEMORY_BUDGET = 256 * 2**20 # default size of one streamed block of paths (256 MB)
+
+# ----------------------------------- GBM PATH ENGINE ----------------------------------------------
+
+def _rows_per_chunk(n_cols, itemsize, chunk_bytes=CHUNK_BYTES):
+    """
+    Number of rows of `n_cols` items each that fit inside `chunk_bytes`.
+    Always even, so antithetic pairs never straddle two blocks.
+    """
+    return max(2, int(chunk_bytes // (n_cols * itemsize)) & ~1)
+
+
+def _float_dtype(dtype):
+    """Validate the simulation dtype (float32 or float64 only)."""
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("dtype must be np.float32 or np.float64")
+    return dtype
+
+
+# ----------------------------------- NORMAL SOURCES ----------------------------------------------
+# Anything with a Generator-like `standard_normal(dtype=..., out=...)` filling the next rows of
+# (rows x N) unit-variance, time-ordered increments can drive the engine.
+
+def _brownian_bridge_schedule(N):
+    """
+    Brownian-bridge construction order for N unit time steps (Jäckel's layout):
+    dimension 0 sets W(N), each later dimension fills the midpoint of the widest remaining gap.
+    """
+    filled = np.zeros(N, dtype=bool)
+    point = np.empty(N, dtype=np.int64)
+    left = np.zeros(N, dtype=np.int64) # index of the known point to the left + 1 (0 = W(0) = 0)
+    right = np.zeros(N, dtype=np.int64)
+    left_weight = np.zeros(N)
+    right_weight = np.zeros(N)
+    std = np.empty(N)
+
+    filled[N - 1] = True
+    point[0] = N - 1
+    std[0] = np.sqrt(N)
+
+    j = 0
+    for i in range(1, N):
+        while filled[j]:
+            j += 1
+        k = j
+        while not filled[k]:
+            k += 1
+        l = j + ((k - 1 - j) >> 1)
+        filled[l] = True
+        point[i], left[i], right[i] = l, j, k
+        left_weight[i] = (k - l) / (k + 1 - j)
+        right_weight[i] = (l + 1 - j) / (k + 1 - j)
+        std[i] = np.sqrt((l + 1 - j) * (k - l) / (k + 1 - j))
+        j = k + 1
+        if j >= N:
+            j = 0
+
+    return point, left, right, left_weight, right_weight, std
+
+
+class SobolNormals:
+    """
+    Scrambled Sobol' normals with Brownian-bridge time ordering.
+
+    The first Sobol' coordinates (the best distributed ones) decide W(T) and the coarse
+    shape of each path; the increments handed back are in plain time order, so the rest
+    of the engine cannot tell them from pseudo-random draws.
+    """
+
+    def __init__(self, N, random_seed=None, n_sims=None):
+        if n_sims is not None and n_sims & (n_sims - 1):
+            warnings.warn("Sobol' sampling keeps its balance properties only when n_sims is a power of 2.",
+                          stacklevel=4)
+        self.sobol = qmc.Sobol(d=N, scramble=True, seed=np.random.default_rng(random_seed))
+        self.schedule = _brownian_bridge_schedule(N)
+
+    def standard_normal(self, dtype=np.float64, out=None):
+        n_rows, N = out.shape
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning) # balance is checked once, in __init__
+            u = self.sobol.random(n_rows)
+        np.clip(u, 1e-16, 1.0 - 1e-16, out=u) # scrambled points can land exactly on 0
+        z = ndtri(u, out=u)
+
+        point, left, right, left_weight, right_weight, std = self.schedule
+        W = np.empty_like(z) # W(1), ..., W(N) in unit time steps
+        W[:, point[0]] = std[0] * z[:, 0]
+        for i in range(1, N):
+            W[:, point[i]] = right_weight[i] * W[:, right[i]] + std[i] * z[:, i]
+            if left[i]:
+                W[:, point[i]] += left_weight[i] * W[:, left[i] - 1]
+
+        out[:, 0] = W[:, 0]
+        np.subtract(W[:, 1:], W[:, :-1], out=out[:, 1:])
+        return out
+
+
+# Philox4x32-10 (Salmon et al., "Parallel random numbers: as easy as 1, 2, 3"), vectorized:
+# every (path, step-pair) has its own counter, so any path can be generated on its own.
+PHILOX_M0, PHILOX_M1 = np.uint64(0xD2511F53), np.uint64(0xCD9E8D57)
+PHILOX_W0, PHILOX_W1 = 0x9E3779B9, 0xBB67AE85
+MASK_32 = np.uint64(0xFFFFFFFF)
+
+
+def philox4x32(c0, c1, c2, c3, key):
+    """
+    Philox4x32 with 10 rounds on arrays of 32-bit counter words (held as uint64).
+    key is a pair of 32-bit integers. Returns the four 32-bit output words.
+    """
+    shape = np.broadcast_shapes(*(np.shape(c) for c in (c0, c1, c2, c3)))
+    c0, c1, c2, c3 = (np.broadcast_to(np.asarray(c, dtype=np.uint64), shape).copy() for c in (c0, c1, c2, c3))
+    prod0, prod1 = np.empty(shape, dtype=np.uint64), np.empty(shape, dtype=np.uint64)
+    shift = np.uint64(32)
+    k0, k1 = int(key[0]), int(key[1])
+
+    for _ in range(10): # in place: every round reuses the same six buffers
+        np.multiply(c0, PHILOX_M0, out=prod0)
+        np.multiply(c2, PHILOX_M1, out=prod1)
+        np.right_shift(prod1, shift, out=c0)
+        c0 ^= c1
+        c0 ^= np.uint64(k0)
+        np.bitwise_and(prod1, MASK_32, out=c1)
+        np.right_shift(prod0, shift, out=c2)
+        c2 ^= c3
+        c2 ^= np.uint64(k1)
+        np.bitwise_and(prod0, MASK_32, out=c3)
+        k0 = (k0 + PHILOX_W0) & 0xFFFFFFFF
+        k1 = (k1 + PHILOX_W1) & 0xFFFFFFFF
+    return c0, c1, c2, c3
+
+
+def _philox_key(random_seed):
+    """Two 32-bit key words from an int / SeedSequence seed (None draws fresh entropy)."""
+    seed_seq = random_seed if isinstance(random_seed, np.random.SeedSequence) else np.random.SeedSequence(random_seed)
+    return seed_seq.generate_state(2, dtype=np.uint32)
+
+
+class PhiloxNormals:
+    """
+    Counter-based normals: increment j of path i is a pure function of (seed, i, j).
+    Counter = (j // 2, 0, i mod 2**32, i // 2**32); each output gives two 53-bit uniforms
+    that go through the inverse normal CDF.
+
+    Paths are handed out in the order of `path_ids` (default 0, 1, 2, ... from `first_path`),
+    which gives skip-ahead for parallel chunks and random access for path inspection.
+    """
+
+    def __init__(self, N, random_seed=None, first_path=0, path_ids=None):
+        self.key = _philox_key(random_seed)
+        self.next_path = first_path
+        self.path_ids = None if path_ids is None else np.asarray(path_ids, dtype=np.uint64)
+        self.position = 0
+        self.step_pairs = np.arange((N + 1) // 2, dtype=np.uint64)
+
+    def standard_normal(self, dtype=np.float64, out=None):
+        n_rows, N = out.shape
+        if self.path_ids is None:
+            ids = np.arange(self.next_path, self.next_path + n_rows, dtype=np.uint64)
+            self.next_path += n_rows
+        else:
+            ids = self.path_ids[self.position:self.position + n_rows]
+            self.position += n_rows
+
+        c0 = self.step_pairs[None, :]
+        c2 = (ids & MASK_32)[:, None]
+        c3 = (ids >> np.uint64(32))[:, None]
+        x0, x1, x2, x3 = philox4x32(c0, np.uint64(0), c2, c3, self.key)
+
+        u = np.empty((n_rows, 2 * len(self.step_pairs)))
+        # 53-bit uniforms in (0, 1), as in numpy's random_double, shifted by half an ulp
+        u[:, 0::2] = ((x0 >> np.uint64(5)) * np.uint64(1 << 26) + (x1 >> np.uint64(6))) + 0.5
+        u[:, 1::2] = ((x2 >> np.uint64(5)) * np.uint64(1 << 26) + (x3 >> np.uint64(6))) + 0.5
+        u *= 2.0**-53
+        np.clip(u, 2.0**-54, 1.0 - 2.0**-53, out=u) # k + 0.5 rounds up to 2**53 for the largest k
+        out[:] = ndtri(u[:, :N])
+        return out
+
+
+class AntitheticNormals:
+    """
+    Antithetic pairs: rows 2k and 2k + 1 use z and -z, so paired paths are adjacent rows.
+    Price paired samples with `paired=True` so the standard error is taken over pair means.
+    """
+
+    def __init__(self, source):
+        self.source = source
+
+    def standard_normal(self, dtype=np.float64, out=None):
+        n_rows, N = out.shape
+        if n_rows % 2:
+            raise ValueError("antithetic sampling needs an even number of paths")
+        z = self.source.standard_normal(dtype=out.dtype, out=np.empty((n_rows // 2, N), dtype=out.dtype))
+        out[0::2] = z
+        np.negative(z, out=out[1::2])
+        return out
+
+
+class MomentMatchedNormals:
+    """
+    Moment matching: every time step's draws are shifted and rescaled to sample mean 0 and
+    sample standard deviation 1 over the whole n_sims sample, however the rows are blocked.
+
+    Two passes over the same stream: the first accumulates the per-step mean and centred sum of
+    squares chunk by chunk (Chan's pairwise update, O(N) memory), the second re-draws the identical
+    normals from a fresh copy of the source and standardizes them. The normals are drawn twice.
+    """
+
+    def __init__(self, make_source, n_sims):
+        if n_sims is None or n_sims < 2:
+            raise ValueError("moment matching needs n_sims >= 2")
+        self.make_source = make_source
+        self.n_sims = n_sims
+        self.source = None
+
+    def _match(self, N, dtype):
+        source = self.make_source()
+        mean, m2, count = np.zeros(N), np.zeros(N), 0
+        rows = _rows_per_chunk(N, np.dtype(dtype).itemsize)
+        scratch = np.empty((min(rows, self.n_sims), N), dtype=dtype)
+        for start in range(0, self.n_sims, rows):
+            z = source.standard_normal(dtype=dtype, out=scratch[:min(rows, self.n_sims - start)])
+            n_block = len(z)
+            block_mean = z.mean(axis=0, dtype=np.float64)
+            delta = block_mean - mean
+            total = count + n_block
+            m2 += ((z - block_mean) ** 2).sum(axis=0) + delta**2 * count * n_block / total
+            mean += delta * n_block / total
+            count = total
+        self.mean = mean.astype(dtype)
+        self.std = np.sqrt(m2 / count).astype(dtype)
+        self.source = self.make_source()
+
+    def standard_normal(self, dtype=np.float64, out=None):
+        if self.source is None:
+            self._match(out.shape[1], out.dtype)
+        self.source.standard_normal(dtype=out.dtype, out=out)
+        out -= self.mean
+        out /= self.std
+        return out
+
+
+def _normal_source(N, random_seed, sampling, n_sims=None, variance_reduction=None, first_path=0):
+    """
+    'pseudo' → numpy Generator, 'sobol' → scrambled Sobol' + Brownian bridge,
+    'philox' → counter-based (paths numbered from first_path), optionally wrapped
+    for variance_reduction = 'antithetic' or 'moment_matching'.
+    """
+    if first_path and sampling != 'philox':
+        raise ValueError("first_path (skip-ahead) needs sampling='philox'")
+    if sampling not in ('pseudo', 'sobol', 'philox'):
+        raise ValueError("sampling must be 'pseudo', 'sobol' or 'philox'")
+    if random_seed is None and variance_reduction == 'moment_matching':
+        random_seed = np.random.SeedSequence() # fixed once: both moment-matching passes draw the same stream
+
+    def make_source():
+        if sampling == 'pseudo':
+            return np.random.default_rng(random_seed)
+        if sampling == 'sobol':
+            return SobolNormals(N, random_seed, n_sims)
+        return PhiloxNormals(N, random_seed, first_path)
+
+    if variance_reduction == 'moment_matching':
+        return MomentMatchedNormals(make_source, n_sims)
+    source = make_source()
+
+    if variance_reduction is None:
+        return source
+    if variance_reduction == 'antithetic':
+        if n_sims is not None and n_sims % 2:
+            raise ValueError("antithetic sampling needs an even n_sims")
+        return AntitheticNormals(source)
+    raise ValueError("variance_reduction must be None, 'antithetic' or 'moment_matching'")
+
+
+def _fill_log_paths(rng, out, s_0, mu, sigma, dt, div_yield):
+    """
+    Write the next `len(out)` GBM log-price paths drawn from `rng` (a normal source) into `out` (rows x (N + 1)).
+    Rows are drawn in order, so the paths do not depend on how the caller blocks them.
+    """
+    n_rows, n_cols = out.shape
+    N = n_cols - 1
+
+    # Adjust the drift term to account for the dividend yield
+    drift = (mu - div_yield - 0.5 * sigma**2) * dt
+    vol_step = sigma * np.sqrt(dt)
+    log_s_0 = np.log(s_0)
+
+    rows = _rows_per_chunk(N, out.dtype.itemsize)
+    scratch = np.empty((min(rows, n_rows), N), dtype=out.dtype)
+
+    for start in range(0, n_rows, rows):
+        stop = min(start + rows, n_rows)
+        z = scratch[:stop - start]
+        rng.standard_normal(dtype=out.dtype, out=z)
+
+        log_S = out[start:stop, 1:] # view: log-returns, then log-prices
+        np.multiply(z, vol_step, out=log_S)
+        log_S += drift
+        log_S[:, 0] += log_s_0 # folds s_0 into the cumsum instead of an extra pass
+        np.cumsum(log_S, axis=1, out=log_S)
+
+    out[:, 0] = log_s_0
+    return out
+
+
+def _fill_paths(rng, out, s_0, mu, sigma, dt, div_yield):
+    """Same as `_fill_log_paths`, exponentiated in place to prices."""
+    _fill_log_paths(rng, out, s_0, mu, sigma, dt, div_yield)
+    np.exp(out[:, 1:], out=out[:, 1:])
+    out[:, 0] = s_0 # places the initial price inside the first column
+    return out
+
+
+def simulate_gbm(s_0, mu, sigma, dt, n_sims, N=N, div_yield=0.0, random_seed=102, out=None, dtype=np.float64,
+                 sampling='pseudo', variance_reduction=None, first_path=0):
+    """
+    Simulate stock price paths using Geometric Brownian Motion with dividend yield.
+
+    The paths are built in log space (one cumsum along time) and exponentiated in place,
+    block of rows by block of rows, so the only full-size array ever touched is the output.
+
+    Parameters:
+    - s_0: Initial stock price
+    - mu: Risk-free rate
+    - sigma: Volatility
+    - dt: Time step, or an array of N step sizes for a non-uniform grid (GBM is simulated
+      exactly over any step, see barrier_monitoring.ObservationSchedule)
+    - n_sims: Number of simulations
+    - N: Number of time steps (default is 252)
+    - div_yield: Dividend yield (default is 0.0)
+    - random_seed: Seed for reproducibility (default is 102)
+    - out: Optional pre-allocated (n_sims x (N + 1)) array the paths are written into
+    - dtype: np.float64 (default) or np.float32, ignored when `out` is given
+    - sampling: 'pseudo' (default), 'sobol' (scrambled Sobol' with Brownian-bridge ordering;
+      use `mc_stats.randomized_qmc` for an error estimate) or 'philox' (counter-based: path i
+      depends only on (random_seed, i), see `regenerate_paths`)
+    - variance_reduction: None (default), 'antithetic' (rows 2k / 2k + 1 are mirrored pairs;
+      price them with paired=True) or 'moment_matching' (per-step mean 0 / std 1 over all n_sims paths;
+      needs n_sims >= 2 and draws the normals twice)
+    - first_path: Index of the first path (skip-ahead, sampling='philox' only; default is 0)
+
+    Returns:
+    - S_t: Simulated stock price paths (n_sims x (N + 1))
+    """
+    if out is None:
+        out = np.empty((n_sims, N + 1), dtype=_float_dtype(dtype))
+    else:
+        _float_dtype(out.dtype)
+        if out.shape != (n_sims, N + 1):
+            raise ValueError(f"out must have shape {(n_sims, N + 1)}, got {out.shape}")
+    if np.ndim(dt) and len(dt) != N:
+        raise ValueError(f"dt has {len(dt)} steps but N = {N}")
+
+    rng = _normal_source(N, random_seed, sampling, n_sims, variance_reduction, first_path)
+    return _fill_paths(rng, out, s_0, mu, sigma, dt, div_yield)
+
+
+def regenerate_paths(path_ids, s_0, mu, sigma, dt, N=N, div_yield=0.0, random_seed=102, dtype=np.float64):
+    """
+    Rebuild selected rows of `simulate_gbm(..., sampling='philox')` without simulating the others,
+    e.g. to plot a few paths after the full matrix has been priced and dropped.
+
+    Parameters:
+    - path_ids: Row indices of the paths to regenerate
+    - s_0, mu, sigma, dt, N, div_yield, random_seed, dtype: as used for the original simulation
+
+    Returns:
+    - S_t: The requested paths (len(path_ids) x (N + 1)), in the order given
+    """
+    path_ids = np.asarray(path_ids, dtype=np.uint64).ravel()
+    out = np.empty((len(path_ids), N + 1), dtype=_float_dtype(dtype))
+    rng = PhiloxNormals(N, random_seed, path_ids=path_ids)
+    return _fill_paths(rng, out, s_0, mu, sigma, dt, div_yield)
+
+
+# ----------------------------------- STREAMING MODE ----------------------------------------------
+
+def stream_gbm(s_0, mu, sigma, dt, n_sims, N=N, div_yield=0.0, random_seed=102,
+               memory_budget=MEMORY_BUDGET, dtype=np.float64, sampling='pseudo', variance_reduction=None,
+               first_path=0):
+    """
+    Generator version of `simulate_gbm`: yields the same paths in blocks of rows,
+    each block sized so that it fits inside `memory_budget` bytes.
+
+    Concatenating the blocks gives exactly `simulate_gbm(...)` for the same seed, with every sampling and
+    variance reduction (moment matching standardizes over all n_sims paths, not per block).
+    The block buffer is re-used between yields, so reduce each block (e.g. with
+    `mc_stats.reduce_payoffs`) before asking for the next one.
+
+    Parameters:
+    - s_0, mu, sigma, dt, n_sims, N, div_yield, random_seed, dtype, sampling,
+      variance_reduction, first_path: as in `simulate_gbm`
+    - memory_budget: Maximum size of one block in bytes (default is 256 MB)
+
+    Yields:
+    - block: Simulated stock price paths (rows x (N + 1)), rows <= n_sims
+    """
+    dtype = _float_dtype(dtype)
+    rows = min(n_sims, _rows_per_chunk(N + 1, dtype.itemsize, memory_budget))
+    buffer = np.empty((rows, N + 1), dtype=dtype)
+    rng = _normal_source(N, random_seed, sampling, n_sims, variance_reduction, first_path)
+
+    for start in range(0, n_sims, rows):
+        block = buffer[:min(rows, n_sims - start)]
+        yield _fill_paths(rng, block, s_0, mu, sigma, dt, div_yield)
+
+
+# ----------------------------------- SUMMARY-ONLY MODE ----------------------------------------------
+
+# Struct-of-arrays summary of n_sims paths: every field holds one value per path.
+# first_hit maps (barrier level, direction) to the first time step at which the path is at or
+# beyond it, -1 if it never gets there; direction is 'up' (>=) for barriers at or above s_0 and
+# 'down' (<) for barriers below.
+# average is the arithmetic average over the N + 1 dates, None unless it was tracked.
+PathSummary = namedtuple("PathSummary", ["terminal", "running_max", "running_min", "first_hit", "average"])
+
+
+def simulate_gbm_summary(s_0, mu, sigma, dt, n_sims, N=N, div_yield=0.0, random_seed=102,
+                         barriers=(), track_average=False, memory_budget=CHUNK_BYTES, dtype=np.float64,
+                         sampling='pseudo', variance_reduction=None, first_path=0):
+    """
+    Simulate the same paths as `simulate_gbm` but keep only what the pricers read:
+    terminal value, running max / min, first barrier-hit step and (optionally) the average.
+
+    Blocks of log-paths are reduced in log space and only the per-path results are
+    exponentiated, so memory is O(n_sims) plus one block of `memory_budget` bytes.
+
+    Parameters:
+    - s_0, mu, sigma, dt, n_sims, N, div_yield, random_seed, dtype, sampling,
+      variance_reduction, first_path: as in `simulate_gbm`
+    - barriers: Barrier levels whose first-hit step should be recorded
+    - track_average: Also record the arithmetic average of each path (costs the exps)
+    - memory_budget: Size of the scratch block of log-paths in bytes (default is 8 MB)
+
+    Returns:
+    - PathSummary(terminal, running_max, running_min, first_hit, average)
+    """
+    dtype = _float_dtype(dtype)
+    rows = min(n_sims, _rows_per_chunk(N + 1, dtype.itemsize, memory_budget))
+    buffer = np.empty((rows, N + 1), dtype=dtype)
+    rng = _normal_source(N, random_seed, sampling, n_sims, variance_reduction, first_path)
+
+    log_barriers = {B: np.log(B) for B in barriers}
+    terminal = np.empty(n_sims, dtype=dtype)
+    running_max = np.empty(n_sims, dtype=dtype)
+    running_min = np.empty(n_sims, dtype=dtype)
+    first_hit = {(B, 'up' if B >= s_0 else 'down'): np.empty(n_sims, dtype=np.int32) for B in barriers}
+    average = np.empty(n_sims, dtype=dtype) if track_average else None
+
+    for start in range(0, n_sims, rows):
+        stop = min(start + rows, n_sims)
+        log_S = _fill_log_paths(rng, buffer[:stop - start], s_0, mu, sigma, dt, div_yield)
+
+        terminal[start:stop] = log_S[:, -1]
+        np.max(log_S[:, 1:], axis=1, out=running_max[start:stop])
+        np.min(log_S[:, 1:], axis=1, out=running_min[start:stop])
+
+        for (B, direction), steps in first_hit.items():
+            crossed = log_S >= log_barriers[B] if direction == 'up' else log_S < log_barriers[B]
+            step = crossed.argmax(axis=1) # first True, 0 when there is none
+            step[~crossed[np.arange(len(step)), step]] = -1
+            steps[start:stop] = step
+
+        if track_average:
+            np.exp(log_S, out=log_S)
+            np.mean(log_S, axis=1, out=average[start:stop])
+
+    for log_values in (terminal, running_max, running_min):
+        np.exp(log_values, out=log_values)
+    # s_0 itself (not exp(log(s_0))) is part of every path, as in simulate_gbm
+    np.maximum(running_max, s_0, out=running_max)
+    np.minimum(running_min, s_0, out=running_min)
+
+    return PathSummary(terminal, running_max, running_min, first_hit, average)
+
+
+# ----------------------------------- PATH ACCESSORS ----------------------------------------------
+# The pricers read paths only through these, so they accept a path matrix (or block) and a PathSummary alike.
+
+def terminal_prices(paths):
+    """S_T per path."""
+    return paths.terminal if isinstance(paths, PathSummary) else paths[..., -1]
+
+
+def path_max(paths):
+    """Path-wise maximum of S_t."""
+    return paths.running_max if isinstance(paths, PathSummary) else paths.max(axis=-1)
+
+
+def path_min(paths):
+    """Path-wise minimum of S_t."""
+    return paths.running_min if isinstance(paths, PathSummary) else paths.min(axis=-1)
+
+
+def first_hit_step(paths, BARRIER, direction='up'):
+    """
+    First time step at which each path is at or beyond the barrier (>= for 'up', < for 'down'),
+    -1 if it never gets there. A path matrix is scanned in row chunks with argmax on a boolean
+    chunk, so no running-max copy of the matrix is made; a PathSummary must have been simulated
+    with the barrier in `barriers`, and it records an up barrier when BARRIER >= s_0, a down one otherwise.
+    """
+    if isinstance(paths, PathSummary):
+        if (BARRIER, direction) not in paths.first_hit:
+            recorded = [d for B, d in paths.first_hit if B == BARRIER]
+            if recorded:
+                raise ValueError(f"the summary recorded {BARRIER} as a '{recorded[0]}' barrier, not '{direction}'")
+            raise ValueError(f"simulate_gbm_summary was not given barriers=({BARRIER},)")
+        return paths.first_hit[BARRIER, direction]
+
+    n_sims, n_cols = paths.shape
+    steps = np.empty(n_sims, dtype=np.int32)
+    rows = _rows_per_chunk(n_cols, 1)
+    for start in range(0, n_sims, rows):
+        block = paths[start:start + rows]
+        crossed = block >= BARRIER if direction == 'up' else block < BARRIER
+        step = crossed.argmax(axis=1) # first True, 0 when there is none
+        step[~crossed[np.arange(len(step)), step]] = -1
+        steps[start:start + rows] = step
+    return steps
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+
+from bs_kernel import GREEKS, bs_greeks
+from digital import digital_price
+from digital_greeks import digital_delta, digital_gamma, digital_vega, digital_theta, digital_rho
+
+try: # optional: labelled cubes; without it the surface comes back as a DataFrame
+    import xarray as xr
+except ImportError:
+    xr = None
+
+# ----------------------------------- GREEK SURFACES ----------------------------------------------
+
+DIMS = ('spot', 'vol', 'tenor')
+
+# digital (cash-or-nothing) Greeks by name: f(S, K, r, sigma, T, option_type, cash_payoff)
+DIGITAL_GREEKS = {
+    'digital_price': digital_price,
+    'digital_delta': digital_delta,
+    'digital_gamma': digital_gamma,
+    'digital_vega': digital_vega,
+    'digital_theta': digital_theta,
+    'digital_rho': digital_rho,
+}
+
+
+def _axis(values):
+    """1-D float axis from a scalar or a sequence."""
+    return np.atleast_1d(np.asarray(values, dtype=np.float64)).ravel()
+
+
+def greek_surface(greeks, spots, vols, tenors, K, r, div_yield=0.0, option_type='call', cash_payoff=1.0,
+                  output=None):
+    """
+    Any Greek (or several) over a spot x vol x tenor grid in one vectorized evaluation: the three axes are
+    broadcast as (n_spot, 1, 1), (1, n_vol, 1) and (1, 1, n_tenor), so a 500 x 50 x 20 risk cube is a single
+    pass of array operations instead of 500,000 scalar calls.
+
+    Greeks are given as:
+    - names of bs_kernel.GREEKS ('price', 'delta', 'gamma', 'vega', 'theta', 'rho', 'vanna', 'charm', 'vomma',
+      'speed', 'zomma', 'color', 'ultima'): all of them together in one fused bs_kernel pass, raw derivatives
+      (vega per unit of vol, theta per year) with the dividend yield
+    - 'digital_price', 'digital_delta', ... 'digital_rho': the cash-or-nothing digital closed forms
+    - any function f(S, K, r, T, vol) of the vanilla / exotic modules (e.g. vanilla_greeks.call_theta,
+      exotic_greeks.call_charm), labelled by its __name__ and in that module's units
+
+    Parameters:
+    - greeks: One Greek or a sequence of them (names and / or functions)
+    - spots, vols, tenors: The grid axes (a scalar gives an axis of length 1)
+    - K, r: Strike and rate
+    - div_yield: Continuous dividend yield (bs_kernel Greeks only, default is 0)
+    - option_type: 'call' or 'put' (names only; functions carry their own call / put)
+    - cash_payoff: Pay-off of the digital Greeks (default is 1)
+    - output: 'xarray' (DataArray for one Greek, Dataset for several), 'frame' (DataFrame indexed by
+      (spot, vol, tenor), one column per Greek) or 'numpy' (dict name -> cube); default 'xarray' when xarray is
+      installed, else 'frame'
+
+    Returns:
+    - The labelled cube(s) of shape (len(spots), len(vols), len(tenors))
+    """
+    single = isinstance(greeks, str) or callable(greeks)
+    greeks = [greeks] if single else list(greeks)
+    output = output or ('xarray' if xr is not None else 'frame')
+    if output not in ('xarray', 'frame', 'numpy'):
+        raise ValueError(f"Invalid output: {output}, use 'xarray', 'frame' or 'numpy'")
+    if output == 'xarray' and xr is None:
+        raise ValueError("output='xarray' needs xarray installed, use output='frame' or 'numpy'")
+    for greek in greeks:
+        if not callable(greek) and greek not in GREEKS and greek not in DIGITAL_GREEKS:
+            raise ValueError(f"Unknown Greek: {greek}, choose from {GREEKS + tuple(DIGITAL_GREEKS)} or pass a function")
+
+    spots, vols, tenors = _axis(spots), _axis(vols), _axis(tenors)
+    shape = (spots.size, vols.size, tenors.size)
+    S, vol, T = spots[:, None, None], vols[None, :, None], tenors[None, None, :]
+
+    kernel = [greek for greek in greeks if not callable(greek) and greek in GREEKS]
+    cubes = bs_greeks(S, K, r, T, vol, div_yield, option_type, kernel) if kernel else {}
+    for greek in greeks:
+        if callable(greek):
+            cubes[greek.__name__] = np.broadcast_to(greek(S, K, r, T, vol), shape)
+        elif greek in DIGITAL_GREEKS:
+            cubes[greek] = np.broadcast_to(DIGITAL_GREEKS[greek](S, K, r, vol, T, option_type, cash_payoff), shape)
+    names = [greek.__name__ if callable(greek) else greek for greek in greeks]
+
+    if output == 'numpy':
+        return {name: cubes[name] for name in names}
+    if output == 'frame':
+        index = pd.MultiIndex.from_product([spots, vols, tenors], names=DIMS)
+        return pd.DataFrame({name: cubes[name].reshape(-1) for name in names}, index=index)
+    coords = {'spot': spots, 'vol': vols, 'tenor': tenors}
+    arrays = {name: xr.DataArray(cubes[name], coords=coords, dims=DIMS, name=name) for name in names}
+    return arrays[names[0]] if single else xr.Dataset(arrays)
+
+
+def plot_greek_curves(greek, spots, K, r, vol, tenors, title=None, label=None, ax=None, show=True, **kwargs):
+    """
+    One curve of a Greek against the spot per tenor, from a single greek_surface call.
+
+    Parameters:
+    - greek: A Greek name or function (see greek_surface)
+    - spots: Spot axis; K, r, vol: Strike, rate and volatility; tenors: One tenor or several (one curve each)
+    - title, label, ax: Plot title, curve / y-axis label (default: the Greek's name) and optional matplotlib axes
+    - kwargs: Passed to greek_surface (div_yield, option_type, cash_payoff)
+    """
+    import matplotlib.pyplot as plt
+
+    name = greek.__name__ if callable(greek) else greek
+    cube = greek_surface(greek, spots, vol, tenors, K, r, output='numpy', **kwargs)[name]
+    label = label or name
+    tenors = _axis(tenors)
+    if ax is None:
+        plt.figure(figsize=(7, 4))
+        ax = plt.gca()
+    for j, T in enumerate(tenors):
+        ax.plot(spots, cube[:, 0, j], lw=2, label=f'{label} (T={T:g})' if tenors.size > 1 else label)
+    ax.axvline(K, color='green', ls=':', label=f'Strike = {K}')
+    ax.set_title(title or label)
+    ax.set_xlabel(r'Final underlying price $S_T$')
+    ax.set_ylabel(label)
+    ax.legend()
+    plt.tight_layout()
+    if show:
+        plt.show()
+    return ax
+
+
+def plot_greek_heatmap(greek, spots, vols, K, r, tenor, title=None, ax=None, show=True, **kwargs):
+    """
+    Spot x vol heatmap of a Greek at one tenor, from a single greek_surface call.
+
+    Parameters:
+    - greek: A Greek name or function (see greek_surface)
+    - spots, vols: The heatmap axes; K, r, tenor: Strike, rate and tenor
+    - title, ax: Plot title and optional matplotlib axes to draw on
+    - kwargs: Passed to greek_surface (div_yield, option_type, cash_payoff)
+    """
+    import matplotlib.pyplot as plt
+
+    name = greek.__name__ if callable(greek) else greek
+    cube = greek_surface(greek, spots, vols, tenor, K, r, output='numpy', **kwargs)[name]
+    if ax is None:
+        plt.figure(figsize=(8, 5))
+        ax = plt.gca()
+    mesh = ax.pcolormesh(_axis(spots), _axis(vols), cube[:, :, 0].T, shading='auto', cmap='RdBu_r')
+    plt.colorbar(mesh, ax=ax, label=name)
+    ax.set_title(title or f"{name} at T = {float(tenor):g}")
+    ax.set_xlabel('Spot')
+    ax.set_ylabel('Volatility')
+    plt.tight_layout()
+    if show:
+        plt.show()
+    return ax
+
+
+#if you want to test out the file use: ---------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    import time
+    from Vanilla.vanilla_greeks import call_theta
+    from exotic_greeks import call_vanna
+
+    spots = np.linspace(50, 150, 500)
+    vols = np.linspace(0.05, 0.8, 50)
+    tenors = np.linspace(0.05, 3, 20)
+
+    start = time.perf_counter()
+    cube = greek_surface(('delta', 'gamma', 'vega', 'vanna', 'digital_delta', call_theta, call_vanna),
+                         spots, vols, tenors, K=100, r=0.04, output='numpy')
+    print(f"7 Greeks over a {len(spots)} x {len(vols)} x {len(tenors)} grid in {time.perf_counter() - start:.3f} s")
+
+    start = time.perf_counter()
+    frame = greek_surface(('delta', 'gamma'), spots, vols, tenors, K=100, r=0.04, output='frame')
+    print(f"as a DataFrame ({len(frame):,} rows) in {time.perf_counter() - start:.3f} s")
+    print(frame.loc[(spots[250], vols[10])].head())
+
+    plot_greek_heatmap('gamma', spots, vols, K=100, r=0.04, tenor=0.5, show=False)
+    plot_greek_curves('delta', spots, K=100, r=0.04, vol=0.2, tenors=(0.25, 1, 2))
@@ -0,0 +1,142 @@
+import numpy as np
+from scipy.special import ndtr
+
+# ----------------------------------- IMPLIED VOLATILITY ----------------------------------------------
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+S_MAX = 20.0 # largest total vol sigma sqrt(T) searched
+
+
+def _normalized_otm_call(x, s):
+    """
+    Normalized out-of-the-money call b(x, s) = e^{x/2} N(x/s + s/2) - e^{-x/2} N(x/s - s/2), x = ln(F/K) <= 0,
+    with its first three derivatives in the total vol s = sigma sqrt(T) (as ratios to the first).
+    """
+    d1 = x / s + 0.5 * s
+    d2 = d1 - s
+    b = np.exp(0.5 * x) * ndtr(d1) - np.exp(-0.5 * x) * ndtr(d2)
+    vega = np.exp(0.5 * x - 0.5 * d1 * d1) / _SQRT_2PI
+    d1d2 = d1 * d2
+    return b, vega, d1d2 / s, (d1d2 * d1d2 - d1d2 - d1 * d1 - d2 * d2) / (s * s)
+
+
+def implied_vol(price, S, K, r, T, div_yield=0.0, option_type='call', tol=1e-12, max_iter=20):
+    """
+    Black–Scholes implied volatility of whole arrays of option prices (an option chain, a book of quotes).
+
+    Every quote is mapped to the normalized price of the out-of-the-money option (put-call parity turns
+    in-the-money quotes into their out-of-the-money twin, where the price is not swamped by intrinsic value).
+    A rational initial guess (Corrado–Miller) is refined with third-order Householder steps on the quotes
+    that have not converged yet (per-element masks); each quote keeps a bracket [lo, hi] of its total vol
+    and a step that leaves it is replaced by bisection, so deep in/out-of-the-money and near-expiry quotes
+    cannot diverge.
+
+    Parameters:
+    - price: Option price(s)
+    - S, K: Spot(s) and strike(s)
+    - r, T, div_yield: Rate(s), maturities in years and continuous dividend yields (default is 0)
+    - option_type: 'call', 'put' or an array of them
+    - tol: Relative tolerance on the price and on the vol
+    - max_iter: Maximum number of Householder / bisection steps
+
+    Returns:
+    - vol: Array of implied vols (float for scalar input); 0 at intrinsic value; NaN where the price is outside
+      the no-arbitrage bounds (below intrinsic value or above the forward / discounted strike), T <= 0, or
+      the quote did not converge (a price that carries no vol information in double precision)
+    """
+    option_type = np.char.lower(np.asarray(option_type, dtype=str))
+    if not np.isin(option_type, ('call', 'put')).all():
+        raise ValueError(f"Invalid option type: {option_type}")
+    arrays = np.broadcast_arrays(*(np.asarray(v, dtype=np.float64) for v in (price, S, K, r, T, div_yield)),
+                                 option_type)
+    shape = arrays[0].shape
+    price, S, K, r, T, q = (np.ravel(a) for a in arrays[:-1])
+    call = np.ravel(arrays[-1]) == 'call'
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        forward = S * np.exp((r - q) * T)
+        undiscounted = price * np.exp(r * T)
+        x = np.log(forward / K)
+        # out-of-the-money price: call when K >= F, put otherwise (by parity), normalized by sqrt(F K)
+        otm = np.where(call == (x <= 0), undiscounted, undiscounted - np.where(call, forward - K, K - forward))
+        # a time value within rounding of the quoted price (deep in the money, near expiry) has no vol in it
+        resolvable = (otm == 0) | (otm > 16 * np.finfo(np.float64).eps * undiscounted)
+        beta = np.where(resolvable, otm, np.nan) / np.sqrt(forward * K)
+        x = -np.abs(x) # b_put(x, s) = b_call(-x, s): every quote is an OTM call with x <= 0
+        upper_bound = np.exp(0.5 * x)
+
+        vol = np.full(S.size, np.nan)
+        vol[(T > 0) & (beta == 0)] = 0.0 # priced at intrinsic value
+        idx = np.nonzero((T > 0) & (beta > 0) & (beta < upper_bound) & np.isfinite(beta))[0]
+        x, beta = x[idx], beta[idx]
+        log_beta = np.log(beta)
+
+        # Corrado–Miller guess (in units of sqrt(F K)), clipped into the search range
+        half_gap = 0.5 * (np.exp(0.5 * x) - np.exp(-0.5 * x))
+        centre = beta - half_gap
+        s = _SQRT_2PI / (2 * np.cosh(0.5 * x)) * (centre + np.sqrt(np.maximum(centre**2 - 4 * half_gap**2 / np.pi, 0)))
+        s = np.clip(np.where(np.isfinite(s) & (s > 0), s, 0.5), 1e-4, S_MAX)
+        lo, hi = np.zeros_like(s), np.full_like(s, S_MAX)
+        converged = np.zeros(s.size, dtype=bool)
+
+        # Householder steps on f(s) = ln b(x, s) - ln beta: the log makes the tolerance relative, so a quote
+        # worth 1e-10 of the forward converges as well as an at-the-money one
+        active = np.arange(idx.size)
+        for _ in range(max_iter):
+            b, vega, a, c = _normalized_otm_call(x[active], s[active])
+            f = np.log(b) - log_beta[active] # b rounded to 0 gives -inf: too low
+            lo[active] = np.where(f > 0, lo[active], s[active])
+            hi[active] = np.where(f > 0, s[active], hi[active])
+
+            w = vega / b # derivatives of ln b from those of b
+            h = f / w
+            first, second = a - w, c - 3 * w * a + 2 * w * w
+            step = h * (1 + 0.5 * first * h) / (1 + first * h + second * h * h / 6)
+            new = s[active] - step
+            outside = ~np.isfinite(new) | (new <= lo[active]) | (new >= hi[active])
+            new = np.where(outside, 0.5 * (lo[active] + hi[active]), new)
+
+            done = (np.abs(f) <= tol) | (np.abs(new - s[active]) <= tol * s[active])
+            s[active] = np.where(np.abs(f) <= tol, s[active], new)
+            converged[active[done]] = True
+            active = active[~done]
+            if active.size == 0:
+                break
+        # not converged, or a bracket collapsed onto the edge of the search range: no vol
+        s[~converged | (s <= 1e-12) | (s >= S_MAX * (1 - 1e-9))] = np.nan
+
+        vol[idx] = s / np.sqrt(T[idx])
+
+    vol = vol.reshape(shape)
+    return vol if vol.ndim else float(vol)
+
+
+#if you want to test out the file use: ---------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    import time
+    from bs_kernel import bs_greeks
+
+    rng = np.random.default_rng(0)
+    n_quotes = 10_000
+    S = 100.0
+    K = rng.uniform(40, 250, n_quotes)
+    T = rng.uniform(1 / 365, 3, n_quotes)
+    true_vol = rng.uniform(0.05, 1.0, n_quotes)
+    types = rng.choice(['call', 'put'], n_quotes)
+    quotes = bs_greeks(S, K, 0.03, T, true_vol, 0.01, types, ('price', 'vega'))
+
+    start = time.perf_counter()
+    vols = implied_vol(quotes['price'], S, K, 0.03, T, 0.01, types)
+    elapsed = time.perf_counter() - start
+
+    # quotes with (almost) no vega have no vol information left in a double-precision price
+    sensitive = quotes['vega'] > 1e-4
+    solved = vols > 0 # NaN (no vol information) and 0 (priced at intrinsic value) excluded
+    repriced = bs_greeks(S, K[solved], 0.03, T[solved], vols[solved], 0.01, types[solved], ('price',))['price']
+    print(f"{n_quotes:,} quotes inverted in {elapsed * 1000:.1f} ms")
+    print(f"vega > 1e-4: {np.isfinite(vols[sensitive]).mean() * 100:.2f}% solved, "
+          f"max vol error {np.max(np.abs(vols - true_vol)[sensitive]):.1e}")
+    print(f"all solved quotes ({solved.mean() * 100:.2f}%): max relative repricing error "
+          f"{np.max(np.abs(repriced / quotes['price'][solved] - 1)):.1e}")
@@ -0,0 +1,174 @@
+import numpy as np
+
+from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_put_value
+from barrier_analytic import barrier_price
+
+# ----------------------------------- BINOMIAL / TRINOMIAL LATTICE ----------------------------------------------
+
+TRINOMIAL_STRETCH = np.sqrt(1.5) # Kamrad–Ritchken lambda: node spacing lambda * sigma * sqrt(dt)
+
+
+def _exercise_mask(exercise, T, steps):
+    """(n_options x (steps + 1)) flags of the steps at which early exercise is allowed."""
+    n = T.size
+    if isinstance(exercise, str):
+        exercise = exercise.lower()
+        if exercise not in ('american', 'european'):
+            raise ValueError(f"Invalid exercise: {exercise}, use 'american', 'european' or Bermudan exercise times")
+        return np.full((n, steps + 1), exercise == 'american')
+    # Bermudan: exercise times (year fractions) rounded to the nearest step of each option's tree
+    times = np.asarray(exercise, dtype=np.float64)
+    mask = np.zeros((n, steps + 1), dtype=bool)
+    idx = np.rint(times[None, :] / T[:, None] * steps).astype(int)
+    valid = (idx >= 0) & (idx <= steps)
+    mask[np.nonzero(valid)[0], idx[valid]] = True
+    return mask
+
+
+def _backward(S, K, r, T, sigma, q, phi, exercisable, steps, method, BARRIER, up, rebate):
+    """
+    Backward induction of a batch of trees, one row per option; the loop is over time steps only and every
+    step is a handful of array operations over (options x nodes). Returns (value, European value).
+    """
+    dt = (T / steps)[:, None]
+    sqdt = sigma[:, None] * np.sqrt(dt)
+    disc = np.exp(-r[:, None] * dt)
+    K, phi, rebate = K[:, None], phi[:, None], rebate[:, None]
+
+    if method == 'binomial': # Cox–Ross–Rubinstein
+        u = np.exp(sqdt)
+        d = 1 / u
+        p = (np.exp((r - q)[:, None] * dt) - d) / (u - d)
+        probs = (disc * p, disc * (1 - p))
+        prices = S[:, None] * np.exp((2 * np.arange(steps + 1) - steps)[None, :] * sqdt)
+    elif method == 'trinomial': # Kamrad–Ritchken, spacing stretched so that a barrier lies on a node layer
+        stretch = np.full_like(S, TRINOMIAL_STRETCH)
+        if BARRIER is not None:
+            eta = np.abs(np.log(BARRIER / S)) / sqdt[:, 0] # barrier distance in sigma sqrt(dt) units
+            layers = np.maximum(np.floor(eta / TRINOMIAL_STRETCH), 1)
+            aligned = eta / layers >= 1 # needs lambda >= 1 for a non-negative middle probability
+            stretch = np.where(aligned, eta / layers, stretch)
+        lam = stretch[:, None]
+        drift = (r - q - 0.5 * sigma**2)[:, None] * np.sqrt(dt) / (2 * lam * sigma[:, None])
+        probs = (disc * (0.5 / lam**2 + drift), disc * (1 - 1 / lam**2), disc * (0.5 / lam**2 - drift))
+        dx = lam * sqdt
+        prices = S[:, None] * np.exp(np.arange(-steps, steps + 1)[None, :] * dx)
+        down = np.exp(-dx)
+    else:
+        raise ValueError(f"Invalid lattice method: {method}, use 'binomial' or 'trinomial'")
+
+    def knock_out(values, prices):
+        if BARRIER is not None:
+            B = BARRIER[:, None] * (1 - 1e-12) if up else BARRIER[:, None] * (1 + 1e-12)
+            np.copyto(values, rebate, where=(prices >= B) if up else (prices <= B))
+
+    value = np.maximum(phi * (prices - K), 0)
+    knock_out(value, prices)
+    european = value.copy()
+    for i in range(steps - 1, -1, -1):
+        if method == 'binomial':
+            prices = prices[:, 1:] * d
+            value = probs[0] * value[:, 1:] + probs[1] * value[:, :-1]
+            european = probs[0] * european[:, 1:] + probs[1] * european[:, :-1]
+        else:
+            prices = prices[:, 2:] * down
+            value = probs[0] * value[:, 2:] + probs[1] * value[:, 1:-1] + probs[2] * value[:, :-2]
+            european = probs[0] * european[:, 2:] + probs[1] * european[:, 1:-1] + probs[2] * european[:, :-2]
+        np.maximum(value, phi * (prices - K), out=value, where=exercisable[:, i:i + 1])
+        knock_out(value, prices)
+        knock_out(european, prices)
+
+    return value[:, 0], european[:, 0]
+
+
+def lattice_price(S, K, r, T, sigma, div_yield=0.0, option_type='put', exercise='american', steps=200,
+                  method='binomial', BARRIER=None, barrier_type='up-and-out', rebate=0.0, richardson=False,
+                  control=False):
+    """
+    Lattice price of a batch of European, American or Bermudan calls / puts, optionally knocked out at a
+    barrier watched at every lattice step. Every numeric argument (and option_type) broadcasts, so thousands
+    of options with different spots, strikes, maturities and vols are priced by one backward induction.
+
+    Parameters:
+    - S, K: Spot(s) and strike(s)
+    - r, T, sigma, div_yield: Rate(s), maturities in years, volatilities, continuous dividend yields
+    - option_type: 'call', 'put' or an array of them
+    - exercise: 'american', 'european' or an array of Bermudan exercise times (year fractions)
+    - steps: Number of time steps of each tree
+    - method: 'binomial' (Cox–Ross–Rubinstein) or 'trinomial' (Kamrad–Ritchken; with a barrier the node
+      spacing is stretched so that the barrier lies exactly on a node layer, which removes the
+      saw-tooth convergence of barrier trees)
+    - BARRIER, barrier_type, rebate: Knock-out barrier(s), 'up-and-out' or 'down-and-out', and the rebate
+      paid at the knock-out (default is no barrier)
+    - richardson: True for the Richardson extrapolation 2 V(steps) - V(steps / 2)
+    - control: True to use the European price as a control variate, V + (exact European - lattice European),
+      exact from Vanilla.blackscholesvanilla (or the continuous-barrier closed form)
+
+    Returns:
+    - price: Array of prices (float for scalar inputs)
+    """
+    if richardson:
+        kwargs = dict(div_yield=div_yield, option_type=option_type, exercise=exercise, method=method,
+                      BARRIER=BARRIER, barrier_type=barrier_type, rebate=rebate, control=control)
+        return 2 * lattice_price(S, K, r, T, sigma, steps=steps, **kwargs) - \
+            lattice_price(S, K, r, T, sigma, steps=steps // 2, **kwargs)
+
+    option_type = np.char.lower(np.asarray(option_type, dtype=str))
+    if not np.isin(option_type, ('call', 'put')).all():
+        raise ValueError(f"Invalid option type: {option_type}")
+    barrier_type = barrier_type.lower()
+    if BARRIER is not None and barrier_type not in ('up-and-out', 'down-and-out'):
+        raise ValueError("the lattice prices knock-out barriers: 'up-and-out' or 'down-and-out'")
+    up = barrier_type.startswith('up')
+
+    arrays = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in
+                                   (S, K, r, T, sigma, div_yield, rebate, np.nan if BARRIER is None else BARRIER)),
+                                 option_type)
+    shape = arrays[0].shape
+    S, K, r, T, sigma, q, rebate, H = (np.ravel(a).astype(np.float64) for a in arrays[:-1])
+    call = np.ravel(arrays[-1]) == 'call'
+    phi = np.where(call, 1.0, -1.0)
+    H = None if BARRIER is None else H
+
+    value, european = _backward(S, K, r, T, sigma, q, phi, _exercise_mask(exercise, T, steps), steps,
+                                method.lower(), H, up, rebate)
+
+    if control:
+        if H is None: # Black–Scholes with dividend yield: the forward-adjusted spot S e^{-qT}
+            forward_spot = S * np.exp(-q * T)
+            exact = np.where(call, black_scholes_call_value(forward_spot, K, r, T, sigma),
+                             black_scholes_put_value(forward_spot, K, r, T, sigma))
+        else:
+            exact = np.where(call, barrier_price(S, K, H, r, T, sigma, q, barrier_type, 'call', rebate),
+                             barrier_price(S, K, H, r, T, sigma, q, barrier_type, 'put', rebate))
+        value = value + (exact - european)
+
+    price = value.reshape(shape)
+    return price if price.ndim else float(price)
+
+
+#if you want to test out the file use: ---------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    import time
+
+    # American put, S = K = 100, r = 6%, sigma = 20%, T = 1
+    for method in ('binomial', 'trinomial'):
+        for steps in (100, 200, 400):
+            plain = lattice_price(100, 100, 0.06, 1, 0.2, steps=steps, method=method)
+            extrapolated = lattice_price(100, 100, 0.06, 1, 0.2, steps=steps, method=method, richardson=True, control=True)
+            print(f"{method} {steps} steps: {plain:.5f}, Richardson + control {extrapolated:.5f}")
+
+    rng = np.random.default_rng(0)
+    n = 2000
+    S = rng.uniform(80, 120, n)
+    vols = rng.uniform(0.15, 0.45, n)
+    tenors = rng.uniform(0.25, 2, n)
+    types = rng.choice(['call', 'put'], n)
+    start = time.perf_counter()
+    prices = lattice_price(S, 100, 0.04, tenors, vols, 0.02, types, steps=100)
+    print(f"{n} American options (100 steps) in {time.perf_counter() - start:.3f} s")
+
+    print(f"Up-and-out call: trinomial {lattice_price(100, 100, 0.04, 1, 0.3, 0.0, 'call', 'european', 400, 'trinomial', 130):.5f}"
+          f" vs closed form {float(barrier_price(100, 100, 130, 0.04, 1, 0.3)):.5f}")
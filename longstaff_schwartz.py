@@ -0,0 +1,172 @@
+import numpy as np
+from collections import namedtuple
+from numpy.polynomial.laguerre import lagvander
+
+from gbm import CHUNK_BYTES, MEMORY_BUDGET, _rows_per_chunk, stream_gbm
+from mc_stats import RunningMoments
+
+# ----------------------------------- LONGSTAFF–SCHWARTZ ----------------------------------------------
+
+# low: out-of-sample MCEstimate (a lower bound: the fitted policy is sub-optimal on fresh paths),
+# in_sample: price on the training paths, coefficients: (n_dates x n_basis) regression coefficients,
+# exercise_times: the exercise dates (year fractions) the coefficients belong to
+LSMResult = namedtuple("LSMResult", ["low", "in_sample", "coefficients", "exercise_times"])
+
+
+def basis_functions(S, K, basis='laguerre', degree=3):
+    """
+    Regression basis of the continuation value, evaluated on moneyness x = S / K.
+    - 'polynomial' → 1, x, ..., x^degree
+    - 'laguerre' → exp(-x / 2) L_n(x), n = 0..degree (weighted Laguerre polynomials, as in Longstaff–Schwartz)
+
+    Returns:
+    - (len(S) x (degree + 1)) design matrix
+    """
+    x = np.asarray(S, dtype=np.float64) / K
+    if basis == 'polynomial':
+        return np.vander(x, degree + 1, increasing=True)
+    if basis == 'laguerre':
+        return np.exp(-0.5 * x)[:, None] * lagvander(x, degree)
+    raise ValueError(f"Invalid basis: {basis}, use 'polynomial' or 'laguerre'")
+
+
+def _exercise_steps(exercise, T, N):
+    """Simulation steps (1..N) at which the holder may exercise."""
+    if isinstance(exercise, str):
+        if exercise.lower() != 'american':
+            raise ValueError(f"Invalid exercise: {exercise}, use 'american' or Bermudan exercise times")
+        return np.arange(1, N + 1)
+    steps = np.unique(np.rint(np.asarray(exercise, dtype=np.float64) / T * N).astype(int))
+    if steps.size == 0 or steps[0] < 1 or steps[-1] > N:
+        raise ValueError("exercise times must lie in (0, T]")
+    return steps
+
+
+def _observed(paths_fn, steps, n_sims, n_dates):
+    """
+    Spot at the exercise dates of every path, read block by block from a path stream. The full
+    (N + 1)-column matrix is never built, but the result is n_sims x n_dates: the backward induction
+    visits every date of every path, so this is the O(N_train * n_dates) part of the training memory.
+    """
+    S = np.empty((n_sims, n_dates))
+    start = 0
+    for block in paths_fn():
+        S[start:start + len(block)] = block[:, steps]
+        start += len(block)
+    return S
+
+
+def longstaff_schwartz(S_0, K, r, T, sigma, div_yield=0.0, option_type='put', exercise='american', N=50,
+                       N_train=50_000, N_test=100_000, basis='laguerre', degree=3, intrinsic=None,
+                       random_seed=102, test_seed=None, memory_budget=MEMORY_BUDGET, **sim_kwargs):
+    """
+    Longstaff–Schwartz price of an American or Bermudan option on one GBM underlying.
+
+    Training: N_train paths are streamed from the path engine and only their values at the exercise dates
+    are kept, an N_train x n_dates float64 array (8 * N_train * n_dates bytes, e.g. 20 MB for 50,000 paths
+    and 50 dates), which bounds N_train; memory_budget only limits the path blocks. Going backwards over the dates, the discounted realized cash flow of the in-the-money paths is
+    regressed on the basis, and the paths whose exercise value beats the fitted continuation value exercise.
+    The normal equations X'X b = X'y are accumulated over row chunks, so the design matrix never exceeds
+    one chunk however large N_train is.
+
+    Test: the fitted exercise policy is applied to N_test fresh paths (another seed), again block by block;
+    that price is unbiased for a sub-optimal policy, so it is a low-biased estimate of the true price.
+
+    Parameters:
+    - S_0, K: Spot and strike
+    - r, T, sigma, div_yield: Rate, maturity in years, volatility, continuous dividend yield
+    - option_type: 'call' or 'put' (ignored when `intrinsic` is given)
+    - exercise: 'american' (every simulation step) or an array of Bermudan exercise times
+    - N: Number of simulation steps
+    - N_train, N_test: Number of training and out-of-sample paths
+    - basis, degree: Regression basis ('laguerre' or 'polynomial') and its highest order
+    - intrinsic: Optional S -> exercise value function (e.g. a structured-note call schedule)
+    - random_seed: Seed (int, SeedSequence or None) the training and test streams are spawned from
+    - test_seed: Optional seed of the test paths, overriding the spawned one
+    - memory_budget: Size of one block of streamed paths in bytes
+    - sim_kwargs: Passed to gbm.stream_gbm (sampling, variance_reduction, ...)
+
+    Returns:
+    - LSMResult(low, in_sample, coefficients, exercise_times)
+    """
+    if intrinsic is None:
+        if option_type.lower() not in ('call', 'put'):
+            raise ValueError(f"Invalid option type: {option_type}")
+        phi = 1.0 if option_type.lower() == 'call' else -1.0
+        intrinsic = lambda S: np.maximum(phi * (S - K), 0)
+    seed_seq = random_seed if isinstance(random_seed, np.random.SeedSequence) else np.random.SeedSequence(random_seed)
+    train_seed, spawned_test_seed = seed_seq.spawn(2) # independent streams, whatever kind of seed was given
+    test_seed = spawned_test_seed if test_seed is None else test_seed
+    dt = T / N
+    steps = _exercise_steps(exercise, T, N)
+    if steps[-1] != N: # the holder can always take the pay-off at maturity
+        steps = np.append(steps, N)
+    times = steps * dt
+    growth = np.exp(-r * np.diff(times)) # discount between consecutive exercise dates
+    rows = _rows_per_chunk(degree + 1, 8, CHUNK_BYTES)
+
+    def paths(n_sims, seed):
+        return lambda: stream_gbm(S_0, r, sigma, dt, n_sims, N, div_yield, seed, memory_budget, **sim_kwargs)
+
+    # ---- training: backward induction with chunked regressions
+    S = _observed(paths(N_train, train_seed), steps, N_train, steps.size)
+    value = intrinsic(S[:, -1]) # realized cash flow, discounted to the current date
+    coefficients = np.zeros((steps.size, degree + 1))
+    for k in range(steps.size - 2, -1, -1):
+        value *= growth[k]
+        gram = np.zeros((degree + 1, degree + 1))
+        moment = np.zeros(degree + 1)
+        for start in range(0, N_train, rows):
+            S_k = S[start:start + rows, k]
+            itm = intrinsic(S_k) > 0
+            X = basis_functions(S_k[itm], K, basis, degree)
+            gram += X.T @ X
+            moment += X.T @ value[start:start + rows][itm]
+        beta = np.linalg.lstsq(gram, moment, rcond=None)[0]
+        coefficients[k] = beta
+        for start in range(0, N_train, rows):
+            S_k = S[start:start + rows, k]
+            exercise_value = intrinsic(S_k)
+            stop = (exercise_value > 0) & (exercise_value >= basis_functions(S_k, K, basis, degree) @ beta)
+            value[start:start + rows][stop] = exercise_value[stop]
+    in_sample = float(np.exp(-r * times[0]) * value.mean())
+    del S
+
+    # ---- test: apply the fitted policy to fresh paths, block by block
+    discount = np.exp(-r * times)
+    moments = RunningMoments(sim_kwargs.get('variance_reduction') == 'antithetic')
+    for block in paths(N_test, test_seed)():
+        S_b = block[:, steps]
+        cash = np.zeros(len(block))
+        alive = np.ones(len(block), dtype=bool)
+        for k in range(steps.size):
+            exercise_value = intrinsic(S_b[:, k])
+            if k == steps.size - 1:
+                stop = alive
+            else:
+                continuation = basis_functions(S_b[:, k], K, basis, degree) @ coefficients[k]
+                stop = alive & (exercise_value > 0) & (exercise_value >= continuation)
+            cash[stop] = discount[k] * exercise_value[stop]
+            alive &= ~stop
+        moments.update(cash)
+
+    return LSMResult(low=moments.estimate(), in_sample=in_sample, coefficients=coefficients, exercise_times=times)
+
+
+#if you want to test out the file use: ---------------------------------------------------------------------
+
+if __name__ == "__main__":
+
+    from lattice import lattice_price
+
+    S_0, K, r, T, sigma = 100, 100, 0.06, 1, 0.2
+    for basis in ('laguerre', 'polynomial'):
+        result = longstaff_schwartz(S_0, K, r, T, sigma, option_type='put', N=50, basis=basis)
+        print(f"LSM American put ({basis}): {result.low.price:.4f} (std error {result.low.std_error:.4f}), "
+              f"in-sample {result.in_sample:.4f}")
+
+    bermudan = np.arange(1, 13) / 12
+    result = longstaff_schwartz(S_0, K, r, T, sigma, option_type='put', exercise=bermudan, N=48)
+    print(f"LSM monthly Bermudan put: {result.low.price:.4f} (std error {result.low.std_error:.4f}) vs "
+          f"trinomial {lattice_price(S_0, K, r, T, sigma, exercise=bermudan, steps=1200, method='trinomial'):.4f}")
+    print(f"Trinomial American put: {lattice_price(S_0, K, r, T, sigma, steps=1000, method='trinomial'):.4f}")
@@ -0,0 +1,171 @@
+import numpy as np
+from collections import namedtuple
+
+from gbm import CHUNK_BYTES, PathSummary, _rows_per_chunk
+from mc_stats import RunningMoments
+from barrier_monitoring import BGK_BETA, DAILY, ObservationSchedule, barrier_hit
+
+# ----------------------------------- MONTE-CARLO GREEKS ----------------------------------------------
+
+GreekEstimate = namedtuple("GreekEstimate", ["value", "std_error"])
+BarrierGreeks = namedtuple("BarrierGreeks", ["price", "delta", "gamma", "vega", "rho"])
+
+
+def _vanilla(S_T, K, option_type):
+    """Terminal pay-off and its derivative with respect to log S_T."""
+    if option_type == 'call':
+        return np.maximum(0, S_T - K), np.where(S_T > K, S_T, 0.0)
+    return np.maximum(0, K - S_T), np.where(S_T < K, -S_T, 0.0)
+
+
+def _smoothed_samples(S, K, BARRIER, r, T, sigma, div_yield, dt, direction, knock, option_type, observation):
+    """
+    Pathwise samples for 'daily' / 'continuous' barriers. The knock indicator is replaced by the
+    Brownian-bridge survival probability between grid dates (at the BGK-shifted barrier for 'daily'),
+    which is smooth in s_0, sigma and r, so delta, vega and rho are pathwise derivatives.
+    Gamma is the likelihood-ratio derivative (first step) of the pathwise delta.
+    """
+    n_rows, n_cols = S.shape
+    t = np.concatenate(([0.0], np.cumsum(np.broadcast_to(dt, (n_cols - 1,)))))
+    step = np.diff(t)
+    L = np.log(S)
+    s_0 = S[0, 0]
+    drift = r - div_yield - 0.5 * sigma**2
+
+    def brownian(rows, cols): # W_t at the given entries, from the log-paths
+        return (L[rows, cols] - L[rows, 0] - drift * t[cols]) / sigma
+
+    sign = -1.0 if direction == 'up' else 1.0 # a = distance to the barrier in log space
+    log_B = np.log(BARRIER)
+    dshift = 0.0
+    if observation == 'daily':
+        dshift = BGK_BETA * np.sqrt(DAILY)
+        log_B = log_B - sign * dshift * sigma
+    a = L - log_B
+    a *= sign
+    alive = (a > 0).all(axis=1)
+
+    # crossing probability p_i = exp(-x_i) per step; only steps with x_i < 40 (p_i > 4e-18) matter,
+    # which are few (paths near the barrier), so the derivatives are summed over those entries only
+    x = a[:, :-1] * a[:, 1:]
+    x *= 2 / (sigma**2 * step)
+    rows, cols = np.nonzero((x < 40) & alive[:, None])
+    x = x[rows, cols]
+    a_0, a_1 = a[rows, cols], a[rows, cols + 1]
+    scale = 2 / (sigma**2 * step[cols])
+    odds = 1 / np.expm1(x) # p_i / (1 - p_i)
+    survival = np.exp(np.bincount(rows, np.log(-np.expm1(-x)), minlength=n_rows)) * alive
+
+    def dlog_survival(da_0, da_1, explicit=0.0):
+        # d log(prod(1 - p_i)) = -sum(dp_i / (1 - p_i)), dp_i = -p_i dx_i
+        dx = scale * (da_0 * a_1 + a_0 * da_1) + explicit
+        return np.bincount(rows, odds * dx, minlength=n_rows)
+
+    f, df = _vanilla(S[:, -1], K, option_type)
+    last = np.full(n_rows, n_cols - 1)
+    dL_T = {'s_0': 1.0, 'sigma': brownian(np.arange(n_rows), last) - sigma * T, 'r': T}
+    dsurv = {
+        's_0': dlog_survival(sign, sign),
+        'sigma': dlog_survival(sign * (brownian(rows, cols) - sigma * t[cols]) + dshift,
+                               sign * (brownian(rows, cols + 1) - sigma * t[cols + 1]) + dshift,
+                               -2 * x / sigma),
+        'r': dlog_survival(sign * t[cols], sign * t[cols + 1]),
+    }
+
+    if knock == 'out':
+        value = survival * f
+        dV = {k: survival * (f * dsurv[k] + df * dL_T[k]) for k in dsurv}
+    else:
+        value = (1 - survival) * f
+        dV = {k: -survival * f * dsurv[k] + (1 - survival) * df * dL_T[k] for k in dsurv}
+
+    disc = np.exp(-r * T)
+    z_1 = (L[:, 1] - L[:, 0] - drift * step[0]) / (sigma * np.sqrt(step[0]))
+    return (disc * value,
+            disc * dV['s_0'] / s_0,
+            disc * dV['s_0'] * (z_1 / (sigma * np.sqrt(step[0])) - 1) / s_0**2,
+            disc * dV['sigma'],
+            disc * (dV['r'] - T * value))
+
+
+def _likelihood_ratio_samples(S, K, BARRIER, r, T, sigma, div_yield, dt, direction, knock, option_type, observation):
+    """
+    Likelihood-ratio samples: the pay-off is only evaluated, the derivatives sit in the score of the
+    path density. With observation='european' only S_T matters and the terminal score is used;
+    with an ObservationSchedule the paths are exact at the observation dates, so the score of the
+    first step (delta, gamma), of every step (vega) and of W_T (rho) gives unbiased Greeks.
+    """
+    f, _ = _vanilla(S[:, -1], K, option_type)
+    hit = barrier_hit(S, BARRIER, direction, observation)
+    value = np.where(hit, 0, f) if knock == 'out' else np.where(hit, f, 0)
+    s_0 = S[0, 0]
+    disc = np.exp(-r * T)
+
+    n_cols = S.shape[1]
+    step = np.broadcast_to(dt, (n_cols - 1,))
+    L = np.log(S)
+    W = np.diff(L, axis=1) - (r - div_yield - 0.5 * sigma**2) * step
+    W /= sigma # Brownian increments
+    W_T = W.sum(axis=1)
+
+    if isinstance(observation, ObservationSchedule):
+        z = W / np.sqrt(step)
+        h_1 = step[0]
+        z_1 = z[:, 0]
+        vega_score = ((z * z - 1) / sigma - z * np.sqrt(step)).sum(axis=1)
+    else: # a function of S_T only: one step from 0 to T
+        h_1 = T
+        z_1 = W_T / np.sqrt(T)
+        vega_score = (z_1 * z_1 - 1) / sigma - z_1 * np.sqrt(T)
+
+    vol_1 = sigma * np.sqrt(h_1)
+    return (disc * value,
+            disc * value * z_1 / (s_0 * vol_1),
+            disc * value * (z_1 * z_1 - 1 - z_1 * vol_1) / (s_0 * vol_1)**2,
+            disc * value * vega_score,
+            disc * value * (W_T / sigma - T))
+
+
+def barrier_greeks(gbm_sims, K, BARRIER, r, T, sigma, div_yield=0.0, barrier_type='up-and-out', option_type='call',
+                   observation='daily', dt=None, paired=False):
+    """
+    Price, delta, gamma, vega and rho of a single-barrier option from one set of simulated paths,
+    each with its Monte-Carlo standard error (no re-simulation with bumped inputs).
+
+    - observation = 'european' → likelihood-ratio weights on S_T (the knock and the strike are jumps of S_T)
+    - observation = 'daily' / 'continuous' → pathwise derivatives of the Brownian-bridge-smoothed
+      pay-off ('daily' through the BGK shift, like barrier_monitoring.barrier_hit on a coarse grid);
+      gamma by likelihood ratio on the pathwise delta
+    - observation = ObservationSchedule → exact likelihood ratio on the schedule grid
+
+    Parameters:
+    - gbm_sims: (n_sims x (N + 1)) path matrix simulated under Q (mu = r) with `sigma`, `div_yield`
+    - K, BARRIER: Strike and barrier
+    - r, T, sigma, div_yield: Parameters the paths were simulated with
+    - barrier_type: 'up-and-out', 'up-and-in', 'down-and-out' or 'down-and-in'
+    - option_type: 'call' or 'put'
+    - dt: Simulation step (default is T / N; the schedule's steps for an ObservationSchedule)
+    - paired: True for variance_reduction='antithetic' paths
+
+    Returns:
+    - BarrierGreeks(price, delta, gamma, vega, rho), each a GreekEstimate(value, std_error)
+    """
+    if isinstance(gbm_sims, PathSummary):
+        raise ValueError("Greeks need the simulated paths, not a PathSummary")
+    direction, _, knock = barrier_type.lower().split('-')
+    if isinstance(observation, ObservationSchedule):
+        dt, samples = observation.dt, _likelihood_ratio_samples
+    else:
+        observation = observation.lower()
+        dt = T / (gbm_sims.shape[1] - 1) if dt is None else dt
+        samples = _likelihood_ratio_samples if observation == 'european' else _smoothed_samples
+
+    moments = [RunningMoments(paired) for _ in BarrierGreeks._fields]
+    rows = _rows_per_chunk(gbm_sims.shape[1], 4 * 8, CHUNK_BYTES) # ~4 path-sized temporaries per chunk
+    for start in range(0, gbm_sims.shape[0], rows):
+        block = np.asarray(gbm_sims[start:start + rows], dtype=np.float64)
+        for moment, values in zip(moments, samples(block, K, BARRIER, r, T, sigma, div_yield, dt,
+                                                   direction, knock, option_type.lower(), observation)):
+            moment.update(values)
+
+    return BarrierGreeks(*(GreekEstimate(float(m.mean), float(np.sqrt(m.variance / m.n))) for m in moments))
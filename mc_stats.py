@@ -0,0 +1,161 @@
+import numpy as np
+from collections import namedtuple
+
+from gbm import PathSummary, simulate_gbm
+
+# ----------------------------------- MONTE-CARLO REDUCTIONS ----------------------------------------------
+
+# price: discounted mean pay-off, variance: variance of the discounted pay-off per path,
+# std_error: standard error of `price`, hit_rate: fraction of paths that hit the barrier
+MCEstimate = namedtuple("MCEstimate", ["price", "std_error", "variance", "hit_rate", "n_paths"])
+
+
+class RunningMoments:
+    """
+    Streaming mean / variance / hit-count accumulator.
+
+    Blocks are folded in with the pairwise update of Chan et al., so the result does
+    not depend on how the pay-offs were split into blocks (up to float rounding).
+
+    With paired=True (antithetic paths in adjacent rows) each pair is averaged first and the
+    moments are those of the pair means, which is what the standard error must be based on.
+    """
+
+    def __init__(self, paired=False):
+        self.paired = paired
+        self.n = 0 # number of samples (pairs when paired)
+        self.mean = 0.0
+        self.m2 = 0.0 # sum of squared deviations from the mean
+        self.hits = 0
+
+    def update(self, values, hits=None):
+        """Fold a block of per-path pay-offs (and optional hit flags or probabilities) in."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if values.size == 0:
+            return self
+        block_hits = 0 if hits is None else float(np.sum(hits)) # flags or hit probabilities
+        if self.paired:
+            values = values.reshape(-1, 2).mean(axis=1)
+        block_mean = values.mean()
+        block_m2 = np.square(values - block_mean).sum()
+        return self._combine(values.size, block_mean, block_m2, block_hits)
+
+    def merge(self, other):
+        """Fold another accumulator in (e.g. the result of a different worker)."""
+        if other.n == 0:
+            return self
+        if other.paired != self.paired:
+            raise ValueError("cannot merge paired and unpaired moments")
+        return self._combine(other.n, other.mean, other.m2, other.hits)
+
+    def _combine(self, n_b, mean_b, m2_b, hits_b):
+        n_a = self.n
+        n = n_a + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta * delta * n_a * n_b / n
+        self.hits += hits_b
+        self.n = n
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def n_paths(self):
+        return 2 * self.n if self.paired else self.n
+
+    def estimate(self, discount_factor=1.0):
+        """
+        Discounted price, its standard error and the hit rate as an `MCEstimate`.
+        When paired, `variance` is the per-path variance an iid sample would need to
+        reach the same standard error (half the pair-mean variance times two paths).
+        """
+        variance = discount_factor**2 * self.variance # of one sample (pair mean when paired)
+        std_error = np.sqrt(variance / self.n) if self.n else np.nan
+        return MCEstimate(
+            price=float(discount_factor * self.mean),
+            std_error=float(std_error),
+            variance=float(std_error**2 * self.n_paths) if self.n else np.nan,
+            hit_rate=self.hits / self.n_paths if self.n else np.nan,
+            n_paths=self.n_paths,
+        )
+
+
+def iter_blocks(gbm_sims):
+    """A path matrix or a PathSummary is a single block; anything else (e.g. `stream_gbm`) is iterated."""
+    if isinstance(gbm_sims, (np.ndarray, PathSummary)):
+        return (gbm_sims,)
+    return gbm_sims
+
+
+def reduce_payoffs(gbm_sims, payoff_fn, discount_factor=1.0, paired=False):
+    """
+    Price from a path matrix or a stream of path blocks without keeping the blocks.
+
+    Parameters:
+    - gbm_sims: (n_sims x (N + 1)) array, a gbm.PathSummary, or an iterable of path blocks (see `gbm.stream_gbm`)
+    - payoff_fn: block -> (payoff, hit) per-path arrays
+    - discount_factor: exp(-r * T)
+    - paired: True for variance_reduction='antithetic' paths (adjacent rows are pairs)
+
+    Returns:
+    - MCEstimate(price, std_error, variance, hit_rate, n_paths)
+    """
+    moments = RunningMoments(paired)
+    for block in iter_blocks(gbm_sims):
+        payoff, hit = payoff_fn(block)
+        moments.update(payoff, hit)
+    return moments.estimate(discount_factor)
+
+
+# ----------------------------------- RANDOMIZED QMC ----------------------------------------------
+
+def randomized_qmc(estimate_fn, s_0, mu, sigma, dt, n_sims, N=252, div_yield=0.0, random_seed=102,
+                   n_replicates=8, simulator=simulate_gbm, **sim_kwargs):
+    """
+    Price with independent scramblings of the Sobol' + Brownian-bridge paths and use the
+    spread between the replicate prices as the error estimate (QMC points are not iid,
+    so the per-path variance does not give a valid standard error).
+
+    The gain depends on how smooth the pay-off is in the normals: on a daily up-and-out
+    (S_0 = K = 100, B = 130, sigma = 0.3, r = 0.04, 252 steps) 8 x 4096 Sobol' paths have a
+    path-equivalent variance of 5-10 against about 22 for pseudo-random paths (2-5x), while a
+    European call on the same paths gains over 1000x.
+
+    Parameters:
+    - estimate_fn: paths -> MCEstimate (or a float price), e.g.
+      lambda paths: UpAndOut_estimate(paths, K, BARRIER, discount_factor, 'daily')
+    - s_0, mu, sigma, dt, n_sims, N, div_yield, random_seed: as in `gbm.simulate_gbm`
+      (n_sims is per replicate, ideally a power of 2)
+    - n_replicates: Number of independent scramblings (default is 8)
+    - simulator: gbm.simulate_gbm (default), gbm.simulate_gbm_summary or gbm.stream_gbm
+    - sim_kwargs: Forwarded to the simulator (e.g. barriers=..., memory_budget=...)
+
+    Returns:
+    - MCEstimate(price, std_error, variance, hit_rate, n_paths); variance is the per-path
+      variance an iid estimator would need for the same std_error
+    """
+    seeds = np.random.SeedSequence(random_seed).spawn(n_replicates)
+    prices = np.empty(n_replicates)
+    hit_rates = np.empty(n_replicates)
+
+    for i, seed in enumerate(seeds):
+        paths = simulator(s_0=s_0, mu=mu, sigma=sigma, dt=dt, n_sims=n_sims, N=N, div_yield=div_yield,
+                          random_seed=seed, sampling='sobol', **sim_kwargs)
+        estimate = estimate_fn(paths)
+        if isinstance(estimate, MCEstimate):
+            prices[i], hit_rates[i] = estimate.price, estimate.hit_rate
+        else:
+            prices[i], hit_rates[i] = estimate, np.nan
+
+    std_error = prices.std(ddof=1) / np.sqrt(n_replicates) if n_replicates > 1 else np.nan
+    n_paths = n_sims * n_replicates
+    return MCEstimate(
+        price=float(prices.mean()),
+        std_error=float(std_error),
+        variance=float(std_error**2 * n_paths),
+        hit_rate=float(hit_rates.mean()),
+        n_paths=n_paths,
+    )
@@ -1,5 +1,4 @@
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
  
 # import bql # to import only when using this file within bloomberg. 0
@@ -49,40 +48,8 @@ dt = T / N         # Time step
 n_sims = 10000     # Number of simulations
 div_yield = 0.02   # Dividend yield
  
-def simulate_gbm(s_0, mu, sigma, dt, n_sims, N, div_yield=0.0, random_seed=102):
-    """
-    Simulate stock returns using Geometric Brownian Motion with dividend yield.
- 
-    Parameters:
-    - s_0: Initial stock price
-    - mu: Risk-free rate
-    - sigma: Volatility
-    - dt: Time step
-    - n_sims: Number of simulations
-    - N: Number of time steps
-    - div_yield: Dividend yield (default is 0.0)
-    - random_seed: Seed for reproducibility (default is 102)
- 
-    Returns:
-    - S_t: Simulated stock price paths (n_sims x (N + 1))
-    """
-    np.random.seed(random_seed)
- 
-    # Initialize the stock price array
-    S_t = np.zeros((n_sims, N + 1))
-    S_t[:, 0] = s_0  # Set the initial stock price
- 
-    # Generate random normal increments
-    dW = np.random.normal(scale=np.sqrt(dt), size=(n_sims, N))
- 
-    # Adjust the drift term to account for the dividend yield
-    drift = (mu - div_yield - 0.5 * sigma**2) * dt
- 
-    # Simulate the evolution of the process
-    for t in range(1, N + 1):
-        S_t[:, t] = S_t[:, t - 1] * np.exp(drift + sigma * dW[:, t - 1])
- 
-    return S_t
+# simulate_gbm now lives in the shared path engine (gbm.py); re-exported here so existing imports keep working
+from gbm import simulate_gbm
 
 
 # Simulate GBM paths
@@ -0,0 +1,67 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from gbm import simulate_gbm
+from mc_stats import RunningMoments, iter_blocks
+
+# ----------------------------------- PARALLEL MONTE-CARLO ----------------------------------------------
+
+def _run_chunk(task):
+    """Worker: simulate one chunk of paths from its own spawned seed and reduce it to moments."""
+    payoff_fn, simulator, seed, n_paths, sim_kwargs, paired = task
+    moments = RunningMoments(paired)
+    for block in iter_blocks(simulator(n_sims=n_paths, random_seed=seed, **sim_kwargs)):
+        payoff, hit = payoff_fn(block)
+        moments.update(payoff, hit)
+    return moments
+
+
+def parallel_mc(payoff_fn, s_0, mu, sigma, dt, n_sims, N=252, div_yield=0.0, random_seed=None,
+                discount_factor=1.0, n_workers=None, chunk_size=2**14, simulator=simulate_gbm, **sim_kwargs):
+    """
+    Monte-Carlo price with n_sims split across a process pool.
+
+    n_sims is cut into fixed chunks of `chunk_size` paths and every chunk gets its own
+    generator spawned from np.random.SeedSequence(random_seed). The chunk moments are merged
+    in chunk order, so for a given seed the result is bit-identical whatever n_workers is.
+    With sampling='philox' the chunks instead share the seed and skip ahead to their first
+    path, so the paths are exactly those of one serial simulate_gbm(..., sampling='philox').
+
+    Parameters:
+    - payoff_fn: block -> (payoff, hit); must be picklable, e.g.
+      functools.partial(UpAndOut_payoff, K=60, BARRIER=80, observation='daily')
+    - s_0, mu, sigma, dt, n_sims, N, div_yield: as in `gbm.simulate_gbm`
+    - random_seed: int or SeedSequence; None draws fresh entropy (different paths on every call)
+    - discount_factor: exp(-r * T)
+    - n_workers: Number of processes (default is os.cpu_count()); 1 runs in-process
+    - chunk_size: Paths per chunk (default is 16384); keep it even for antithetic sampling
+    - simulator: gbm.simulate_gbm (default), gbm.simulate_gbm_summary or gbm.stream_gbm
+    - sim_kwargs: Forwarded to the simulator (sampling=..., variance_reduction=..., barriers=...)
+
+    Returns:
+    - MCEstimate(price, std_error, variance, hit_rate, n_paths)
+    """
+    seed_seq = random_seed if isinstance(random_seed, np.random.SeedSequence) else np.random.SeedSequence(random_seed)
+    n_chunks = -(-n_sims // chunk_size)
+    seeds = seed_seq.spawn(n_chunks)
+    paired = sim_kwargs.get('variance_reduction') == 'antithetic'
+
+    sim_kwargs = dict(sim_kwargs, s_0=s_0, mu=mu, sigma=sigma, dt=dt, N=N, div_yield=div_yield)
+    tasks = []
+    for i, seed in enumerate(seeds):
+        chunk_kwargs = sim_kwargs
+        if sim_kwargs.get('sampling') == 'philox': # counter-based: skip ahead instead of spawning
+            seed, chunk_kwargs = seed_seq, dict(sim_kwargs, first_path=i * chunk_size)
+        tasks.append((payoff_fn, simulator, seed, min(chunk_size, n_sims - i * chunk_size), chunk_kwargs, paired))
+
+    n_workers = min(n_workers or os.cpu_count() or 1, n_chunks)
+    total = RunningMoments(paired)
+    if n_workers == 1:
+        for moments in map(_run_chunk, tasks):
+            total.merge(moments)
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            for moments in pool.map(_run_chunk, tasks): # map keeps chunk order
+                total.merge(moments)
+    return total.estimate(discount_factor)
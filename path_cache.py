@@ -0,0 +1,134 @@
+import os
+import shutil
+import hashlib
+import tempfile
+import weakref
+import numpy as np
+from collections import OrderedDict
+
+from gbm import simulate_gbm
+
+# ----------------------------------- PATH CACHE ----------------------------------------------
+
+RAM_BUDGET = 1 * 2**30 # default in-RAM budget of the cache (1 GB)
+DISK_BUDGET = 8 * 2**30 # default budget of the spilled .npy files (8 GB)
+
+
+def _remove_spill(disk, spill_dir, own_dir):
+    """Delete the spilled files (and the directory when the cache created it)."""
+    for file in disk.values():
+        if os.path.exists(file):
+            os.remove(file)
+    disk.clear()
+    if own_dir and spill_dir is not None:
+        shutil.rmtree(spill_dir, ignore_errors=True)
+
+
+class PathCache:
+    """
+    LRU cache of simulated path matrices keyed by the simulation parameters.
+
+    Entries live in RAM up to `max_bytes`; the least recently used ones are then spilled to
+    .npy files in `spill_dir` and served back memory-mapped, so a repeat request costs a
+    dictionary lookup (RAM) or a page-cache read (disk) instead of a simulation.
+    The spilled files are capped at `max_disk_bytes` (least recently used deleted first) and
+    removed by `clear()`, when the cache is garbage-collected, or at interpreter exit; a
+    temporary spill directory created by the cache is removed with them.
+    Cached arrays are read-only: the pricers never write to their paths.
+    """
+
+    def __init__(self, max_bytes=RAM_BUDGET, spill_dir=None, max_disk_bytes=DISK_BUDGET):
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.spill_dir = spill_dir
+        self.ram_bytes = 0
+        self.disk_bytes = 0
+        self._ram = OrderedDict() # key -> array, oldest first
+        self._disk = OrderedDict() # key -> .npy file, oldest first
+        self._own_dir = False
+        self._cleanup = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(s_0, mu, sigma, dt, n_sims, N, div_yield, random_seed, dtype, sampling, variance_reduction):
+        if isinstance(random_seed, np.random.SeedSequence):
+            random_seed = (random_seed.entropy, random_seed.spawn_key)
+        # an array of step sizes (ObservationSchedule.dt) is keyed by its bytes
+        dt = np.asarray(dt, dtype=np.float64).tobytes() if np.ndim(dt) else float(dt)
+        return (float(s_0), float(mu), float(sigma), dt, int(n_sims), int(N), float(div_yield),
+                random_seed, np.dtype(dtype).str, sampling, variance_reduction)
+
+    def simulate_gbm(self, s_0, mu, sigma, dt, n_sims, N=252, div_yield=0.0, random_seed=102,
+                     dtype=np.float64, sampling='pseudo', variance_reduction=None):
+        """
+        Same arguments and paths as `gbm.simulate_gbm`, served from the cache when possible.
+        random_seed=None is never cached (every call must give fresh paths).
+        """
+        if random_seed is None:
+            return simulate_gbm(s_0, mu, sigma, dt, n_sims, N, div_yield, None, dtype=dtype,
+                                sampling=sampling, variance_reduction=variance_reduction)
+
+        key = self.make_key(s_0, mu, sigma, dt, n_sims, N, div_yield, random_seed, dtype, sampling, variance_reduction)
+
+        if key in self._ram:
+            self._ram.move_to_end(key)
+            self.hits += 1
+            return self._ram[key]
+        if key in self._disk:
+            self._disk.move_to_end(key)
+            self.hits += 1
+            return np.load(self._disk[key], mmap_mode='r')
+
+        self.misses += 1
+        paths = simulate_gbm(s_0, mu, sigma, dt, n_sims, N, div_yield, random_seed, dtype=dtype,
+                             sampling=sampling, variance_reduction=variance_reduction)
+        paths.flags.writeable = False
+        self._ram[key] = paths
+        self.ram_bytes += paths.nbytes
+        self._evict()
+        return paths
+
+    def _evict(self):
+        """Spill least recently used entries to disk until the RAM budget is met (the newest always stays)."""
+        while self.ram_bytes > self.max_bytes and len(self._ram) > 1:
+            key, paths = self._ram.popitem(last=False)
+            self.ram_bytes -= paths.nbytes
+            if self.spill_dir is None:
+                self.spill_dir = tempfile.mkdtemp(prefix="gbm_path_cache_")
+                self._own_dir = True
+            if self._cleanup is None:
+                self._cleanup = weakref.finalize(self, _remove_spill, self._disk, self.spill_dir, self._own_dir)
+            file = os.path.join(self.spill_dir, hashlib.sha1(repr(key).encode()).hexdigest() + ".npy")
+            np.save(file, paths)
+            self._disk[key] = file
+            self.disk_bytes += os.path.getsize(file)
+
+        # disk budget: delete the least recently used spilled files
+        while self.disk_bytes > self.max_disk_bytes and self._disk:
+            _, file = self._disk.popitem(last=False)
+            self.disk_bytes -= os.path.getsize(file)
+            os.remove(file)
+
+    def clear(self):
+        """Drop every entry, delete the spilled files and the temporary spill directory."""
+        if self._cleanup is not None:
+            self._cleanup() # runs _remove_spill once and unregisters it
+            self._cleanup = None
+        if self._own_dir:
+            self.spill_dir = None
+            self._own_dir = False
+        self._ram.clear()
+        self.ram_bytes = 0
+        self.disk_bytes = 0
+
+
+# shared cache used by the pricing modules
+default_cache = PathCache()
+
+
+def cached_simulate_gbm(s_0, mu, sigma, dt, n_sims, N=252, div_yield=0.0, random_seed=102,
+                        dtype=np.float64, sampling='pseudo', variance_reduction=None):
+    """`gbm.simulate_gbm` through the shared `default_cache`."""
+    return default_cache.simulate_gbm(s_0, mu, sigma, dt, n_sims, N, div_yield, random_seed,
+                                      dtype, sampling, variance_reduction)
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from barrier_analytic import barrier_price, monitoring_interval
+from barrier_monitoring import barrier_hit
+
+# ----------------------------------- BARRIER CLOSED FORM ----------------------------------------------
+
+# Haug, The Complete Guide to Option Pricing Formulas, Table 4-13:
+# S = 100, r = 0.08, q = 0.04, T = 0.5, rebate = 3; prices for K = 90, 100, 110 at sigma = 0.25 / 0.30
+HAUG_TABLE = {
+    ('down-and-out', 'call', 95): [(9.0246, 8.8334), (6.7924, 7.0285), (4.8759, 5.4137)],
+    ('down-and-out', 'call', 100): [(3.0000, 3.0000)] * 3,
+    ('up-and-out', 'call', 105): [(2.6789, 2.6341), (2.3580, 2.4389), (2.3453, 2.4315)],
+    ('down-and-in', 'call', 95): [(7.7627, 9.0093), (4.0109, 5.1370), (2.0576, 2.8517)],
+    ('down-and-in', 'call', 100): [(13.8333, 14.8816), (7.8494, 9.2045), (3.9795, 5.3043)],
+    ('up-and-in', 'call', 105): [(14.1112, 15.2098), (8.4482, 9.7278), (4.5910, 5.8350)],
+    ('down-and-out', 'put', 95): [(2.2798, 2.4170), (2.2947, 2.4258), (2.6252, 2.6246)],
+    ('down-and-out', 'put', 100): [(3.0000, 3.0000)] * 3,
+    ('up-and-out', 'put', 105): [(3.7760, 4.2293), (5.4932, 5.8032), (7.5187, 7.5649)],
+    ('down-and-in', 'put', 95): [(2.9586, 3.8769), (6.5677, 7.7989), (11.9752, 13.3078)],
+    ('down-and-in', 'put', 100): [(2.2845, 3.3328), (5.9085, 7.2636), (11.6465, 12.9713)],
+    ('up-and-in', 'put', 105): [(1.4653, 2.0658), (3.3721, 4.4226), (7.0846, 8.3686)],
+}
+
+
+@pytest.mark.parametrize('barrier_type, option_type, BARRIER', list(HAUG_TABLE))
+def test_barrier_price_matches_haug_table(barrier_type, option_type, BARRIER):
+    expected = np.array(HAUG_TABLE[barrier_type, option_type, BARRIER])
+    K = np.array([90.0, 100.0, 110.0])[:, None]
+    sigma = np.array([0.25, 0.30])[None, :]
+    prices = barrier_price(100, K, BARRIER, 0.08, 0.5, sigma, 0.04, barrier_type, option_type, rebate=3)
+    np.testing.assert_allclose(prices, expected, atol=5e-4)
+
+
+def test_in_out_parity_and_the_knocked_convention():
+    S = np.array([90.0, 95.0, 100.0, 110.0])
+    args = (100.0, 95.0, 0.05, 1.0, 0.3, 0.01)
+    parity = barrier_price(S, *args, 'down-and-out', 'call') + barrier_price(S, *args, 'down-and-in', 'call')
+    np.testing.assert_allclose(parity, barrier_price(S, 100.0, 1e9, 0.05, 1.0, 0.3, 0.01, 'up-and-out', 'call'), rtol=1e-10)
+    np.testing.assert_allclose(barrier_price(S, 100.0, 1e-9, 0.05, 1.0, 0.3, 0.01, 'down-and-in', 'call'), 0.0, atol=1e-12)
+
+    # a down barrier knocks strictly below it, as barrier_hit does on the paths
+    at_barrier = np.full((1, 3), 95.0)
+    assert not barrier_hit(at_barrier, 95.0, 'down', 'daily')[0]
+    assert barrier_price(95.0, *args, 'down-and-out', 'call', rebate=3.0) == pytest.approx(3.0)
+    assert barrier_price(94.0, *args, 'down-and-out', 'call', rebate=3.0) == 3.0
+
+
+def test_barrier_pricers_default_to_monte_carlo():
+    from gbm import simulate_gbm
+    from UpAndOut import UpAndOut, UpAndOut_estimate
+
+    S_0, K, BARRIER, r, T, sigma, N = 100.0, 100.0, 130.0, 0.05, 1.0, 0.25, 50
+    dt, df = T / N, np.exp(-r * T)
+    paths = simulate_gbm(S_0, r, sigma, dt, 2000, N=N, random_seed=3)
+    kwargs = dict(observation='daily', sigma=sigma, dt=dt, S_0=S_0, T=T)
+
+    mc = UpAndOut_estimate(paths, K, BARRIER, df, 'daily', sigma=sigma, dt=dt).price
+    assert UpAndOut(paths, K, BARRIER, df, **kwargs) == pytest.approx(mc)
+    analytic = barrier_price(S_0, K, BARRIER, r, T, sigma, 0.0, 'up-and-out', 'call', 0.0, monitoring_interval('daily'))
+    assert UpAndOut(None, K, BARRIER, df, method='analytic', **kwargs) == pytest.approx(float(analytic))
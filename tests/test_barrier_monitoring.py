@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from gbm import simulate_gbm
+from barrier_monitoring import DAILY, ObservationSchedule, barrier_hit, bridge_hit_probability
+
+
+def continuous_hit_probability(S_0, BARRIER, mu, sigma, T):
+    """P(max of the GBM over [0, T] >= BARRIER), reflection principle for a drifted Brownian motion."""
+    b, nu = np.log(BARRIER / S_0), mu - 0.5 * sigma**2
+    s = sigma * np.sqrt(T)
+    return norm.cdf((-b + nu * T) / s) + np.exp(2 * nu * b / sigma**2) * norm.cdf((-b - nu * T) / s)
+
+
+# ----------------------------------- BROWNIAN-BRIDGE CORRECTION ----------------------------------------------
+
+def test_bridge_on_a_coarse_grid_matches_continuous_monitoring():
+    S_0, BARRIER, mu, sigma, T, N = 100.0, 120.0, 0.03, 0.3, 1.0, 12
+    paths = simulate_gbm(S_0, mu, sigma, T / N, 100_000, N, random_seed=1)
+    hit = bridge_hit_probability(paths, BARRIER, sigma, T / N, 'up')
+    assert ((0 <= hit) & (hit <= 1)).all()
+    grid_only = (paths.max(axis=1) >= BARRIER).mean()
+    exact = continuous_hit_probability(S_0, BARRIER, mu, sigma, T)
+    assert abs(hit.mean() - exact) < 4 * hit.std() / np.sqrt(hit.size) < exact - grid_only
+
+
+def test_barrier_hit_continuous_needs_sigma_and_dt():
+    paths = simulate_gbm(100.0, 0.03, 0.3, 1 / 12, 100, 12)
+    with pytest.raises(ValueError):
+        barrier_hit(paths, 120.0, 'up', 'continuous')
+    np.testing.assert_array_equal(barrier_hit(paths, 120.0, 'up', 'european'), paths[:, -1] >= 120.0)
+
+
+# ----------------------------------- OBSERVATION SCHEDULES ----------------------------------------------
+
+def test_schedule_paths_observe_only_the_schedule_dates():
+    window = ObservationSchedule.every(1 / 12, T=1, start=0.25, end=0.75) # monthly inside a window
+    assert window.N == window.times.size + 1 and window.dt.sum() == pytest.approx(1.0)
+    paths = window.simulate(100.0, 0.03, 0.25, 2000, random_seed=3)
+    assert paths.shape == (2000, window.N + 1)
+    observed = paths[:, 1:-1]
+    np.testing.assert_array_equal(barrier_hit(paths, 110.0, 'up', window), observed.max(axis=1) >= 110.0)
+
+
+def test_daily_barrier_on_a_schedule_grid_uses_the_bridge():
+    monthly = ObservationSchedule.every(1 / 12, T=1)
+    paths = monthly.simulate(100, 0.03, 0.25, 2000)
+    hit = barrier_hit(paths, 120, 'up', 'daily', sigma=0.25, dt=monthly.dt)
+    assert hit.dtype == np.float64 and ((0 <= hit) & (hit <= 1)).all()
+    # on a daily grid the daily check stays a plain grid check
+    daily = simulate_gbm(100, 0.03, 0.25, np.full(20, DAILY), 2000, 20)
+    assert barrier_hit(daily, 120, 'up', 'daily', sigma=0.25, dt=np.full(20, DAILY)).dtype == bool
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from gbm import simulate_gbm, simulate_gbm_summary
+from barrier_monitoring import ObservationSchedule, barrier_hit
+from mc_stats import RunningMoments
+from barrier_option import BarrierOption, knock_time_histogram, summarize_paths
+
+
+@pytest.fixture(scope='module')
+def paths():
+    return simulate_gbm(100.0, 0.05, 0.3, 1 / 50, 3000, N=50, random_seed=5)
+
+
+# ----------------------------------- SINGLE-PASS BARRIER ENGINE ----------------------------------------------
+
+def test_summary_is_terminal_max_min(paths):
+    summary = summarize_paths(paths)
+    np.testing.assert_array_equal(summary.terminal, paths[:, -1])
+    np.testing.assert_array_equal(summary.running_max, paths.max(axis=1))
+    np.testing.assert_array_equal(summary.running_min, paths.min(axis=1))
+
+
+def test_summary_on_a_schedule_needs_the_paths():
+    monthly = ObservationSchedule.every(1 / 12, T=1)
+    paths = monthly.simulate(100.0, 0.03, 0.25, 1000, random_seed=4)
+    np.testing.assert_array_equal(summarize_paths(paths, monthly).running_max, paths[:, 1:].max(axis=1))
+
+    quarterly = ObservationSchedule([0.25, 0.5, 0.75], T=1)
+    summary = simulate_gbm_summary(100.0, 0.03, 0.25, quarterly.dt, 1000, quarterly.N, random_seed=4)
+    with pytest.raises(ValueError):
+        BarrierOption(summary, observation=quarterly)
+    assert summarize_paths(summary) is summary
+
+
+@pytest.mark.parametrize('direction, option_type, K, BARRIER', [
+    ('up', 'call', 100.0, 130.0), ('down', 'put', 105.0, 85.0), ('down', 'call', 95.0, 90.0)])
+def test_pair_matches_direct_pricing_and_in_out_parity(paths, direction, option_type, K, BARRIER):
+    discount_factor = np.exp(-0.05)
+    out_estimate, in_estimate = BarrierOption(paths, discount_factor).price_pair(K, BARRIER, direction, option_type)
+
+    S_T = paths[:, -1]
+    vanilla = np.maximum(0, S_T - K) if option_type == 'call' else np.maximum(0, K - S_T)
+    hit = barrier_hit(paths, BARRIER, direction, 'daily')
+    assert out_estimate.price == pytest.approx(discount_factor * np.where(hit, 0, vanilla).mean(), rel=1e-12)
+    assert out_estimate.price + in_estimate.price == pytest.approx(discount_factor * vanilla.mean(), rel=1e-12)
+    assert out_estimate.hit_rate == in_estimate.hit_rate == pytest.approx(hit.mean())
+
+
+@pytest.mark.parametrize('barrier_type', ['up-and-out', 'up-and-in', 'down-and-out', 'down-and-in'])
+def test_price_grid_std_error_matches_running_moments(barrier_type):
+    shift = 1e8 # pay-offs ~1e8 with a std of ~10: sums_sq / n - mean**2 cancels to noise here
+    paths = simulate_gbm(100, 0.03, 0.25, 1 / 252, 5000, N=20) + shift
+    strikes = np.array([90.0, 100.0])
+    # the last two barriers are never / always hit: every path pays ~1e8 for one of them
+    barriers = shift + (np.array([105.0, 115.0, 1000.0, 50.0]) if barrier_type.startswith('up')
+                        else np.array([85.0, 95.0, -1000.0, 150.0]))
+    prices, std_errors = BarrierOption(paths, 0.97).price_grid(strikes, barriers, barrier_type, 'call', std_error=True)
+
+    for K in strikes:
+        for BARRIER in barriers:
+            hit = paths.max(axis=1) >= BARRIER if barrier_type.startswith('up') else paths.min(axis=1) < BARRIER
+            alive = ~hit if barrier_type.endswith('out') else hit
+            estimate = RunningMoments().update(alive * np.maximum(0, paths[:, -1] - K), hit).estimate(0.97)
+            assert prices.loc[K, BARRIER] == pytest.approx(estimate.price, rel=1e-9)
+            assert std_errors.loc[K, BARRIER] == pytest.approx(estimate.std_error, rel=1e-6)
+
+
+# ----------------------------------- FIRST PASSAGE & REBATES ----------------------------------------------
+
+def test_knock_time_histogram_needs_n_for_a_summary():
+    summary = simulate_gbm_summary(100, 0.03, 0.25, 1 / 252, 2000, 20, barriers=(110,))
+    with pytest.raises(ValueError):
+        knock_time_histogram(summary, 110, 'up')
+    paths = simulate_gbm(100, 0.03, 0.25, 1 / 252, 2000, 20)
+    histogram = knock_time_histogram(paths, 110, 'up')
+    np.testing.assert_array_equal(knock_time_histogram(summary, 110, 'up', N=20), histogram)
+    assert histogram.sum() == (paths.max(axis=1) >= 110).sum()
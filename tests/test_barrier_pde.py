@@ -0,0 +1,41 @@
+import pytest
+
+from barrier_analytic import barrier_price
+from barrier_pde import barrier_pde, pde_price
+from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_put_value
+
+S_0, K, r, T, SIGMA = 100.0, 100.0, 0.04, 1.0, 0.3
+GRID = dict(n_space=800, n_time=400)
+
+
+# ----------------------------------- CRANK-NICOLSON ENGINE ----------------------------------------------
+
+@pytest.mark.parametrize('option_type, closed_form', [('call', black_scholes_call_value),
+                                                      ('put', black_scholes_put_value)])
+def test_vanilla_matches_black_scholes(option_type, closed_form):
+    exact = closed_form(S_0, K, r, T, SIGMA)
+    result = pde_price(S_0, K, r, T, SIGMA, option_type=option_type, **GRID)
+    assert result.price == pytest.approx(exact, rel=5e-5)
+    # second order in space: halving the spot intervals cuts the error about four times
+    coarse = pde_price(S_0, K, r, T, SIGMA, option_type=option_type, n_space=400, n_time=400)
+    assert abs(result.price - exact) < 0.4 * abs(coarse.price - exact)
+    bumped = [pde_price(S, K, r, T, SIGMA, option_type=option_type, **GRID).price for S in (S_0 - 0.5, S_0 + 0.5)]
+    assert result.delta == pytest.approx(bumped[1] - bumped[0], rel=1e-3)
+
+
+@pytest.mark.parametrize('barrier_type, option_type, BARRIER, rebate', [
+    ('up-and-out', 'call', 130.0, 0.0), ('down-and-out', 'put', 80.0, 2.0),
+    ('up-and-in', 'call', 130.0, 0.0), ('down-and-in', 'call', 90.0, 0.0)])
+def test_continuous_barriers_match_the_closed_form(barrier_type, option_type, BARRIER, rebate):
+    result = barrier_pde(S_0, K, BARRIER, r, T, SIGMA, 0.02, barrier_type, option_type, 'continuous', rebate, **GRID)
+    expected = barrier_price(S_0, K, BARRIER, r, T, SIGMA, 0.02, barrier_type, option_type, rebate)
+    assert result.price == pytest.approx(float(expected), abs=5e-4)
+
+
+def test_daily_monitoring_sits_between_continuous_and_none():
+    continuous = barrier_pde(S_0, K, 130.0, r, T, SIGMA, barrier_type='up-and-out', observation='continuous').price
+    daily = barrier_pde(S_0, K, 130.0, r, T, SIGMA, barrier_type='up-and-out', observation='daily').price
+    # the BGK-shifted closed form is accurate to a few 1e-3 for daily monitoring
+    bgk = float(barrier_price(S_0, K, 130.0, r, T, SIGMA, 0.0, 'up-and-out', 'call', 0.0, 1 / 252))
+    assert continuous < daily < black_scholes_call_value(S_0, K, r, T, SIGMA)
+    assert daily == pytest.approx(bgk, abs=5e-3)
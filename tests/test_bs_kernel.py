@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from bs_kernel import GREEKS, bs_greeks
+from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_put_value
+
+# ----------------------------------- BLACK-SCHOLES KERNEL ----------------------------------------------
+
+# Greek -> (bumped argument, Greek it differentiates, sign: theta and charm / color are d/dt = -d/dT)
+KERNEL_BUMPS = {
+    'delta': ('S', 'price', 1), 'vega': ('vol', 'price', 1), 'theta': ('T', 'price', -1),
+    'rho': ('r', 'price', 1), 'gamma': ('S', 'delta', 1), 'vanna': ('vol', 'delta', 1),
+    'charm': ('T', 'delta', -1), 'vomma': ('vol', 'vega', 1), 'speed': ('S', 'gamma', 1),
+    'zomma': ('vol', 'gamma', 1), 'color': ('T', 'gamma', -1), 'ultima': ('vol', 'vomma', 1),
+}
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+@pytest.mark.parametrize('greek', list(KERNEL_BUMPS))
+def test_bs_greeks_match_finite_differences(greek, option_type):
+    args = dict(S=np.array([80.0, 100.0, 125.0]), K=100.0, r=0.03, T=0.75, vol=0.25, div_yield=0.01)
+    bumped, base, sign = KERNEL_BUMPS[greek]
+    h = 1e-4 * max(1.0, float(np.max(args[bumped])))
+
+    up = bs_greeks(**dict(args, **{bumped: args[bumped] + h}), option_type=option_type, greeks=(base,))[base]
+    down = bs_greeks(**dict(args, **{bumped: args[bumped] - h}), option_type=option_type, greeks=(base,))[base]
+    analytic = bs_greeks(**args, option_type=option_type, greeks=GREEKS)[greek]
+    np.testing.assert_allclose(analytic, sign * (up - down) / (2 * h), rtol=1e-5, atol=1e-7)
+
+
+@pytest.mark.parametrize('option_type, closed_form', [('call', black_scholes_call_value),
+                                                      ('put', black_scholes_put_value)])
+def test_price_matches_the_vanilla_pricer_and_fills_out(option_type, closed_form):
+    S = np.linspace(60.0, 140.0, 9)
+    out = {greek: np.empty_like(S) for greek in ('price', 'delta')}
+    result = bs_greeks(S, 100.0, 0.03, 0.75, 0.25, option_type=option_type, greeks=('price', 'delta'), out=out)
+    assert result['price'] is out['price']
+    np.testing.assert_allclose(out['price'], [closed_form(s, 100.0, 0.03, 0.75, 0.25) for s in S], rtol=1e-12)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from gbm import simulate_gbm
+from bump_greeks import bump_greeks
+from Vanilla.blackscholesvanilla import black_scholes_call_value
+
+S_0, K, r, T, SIGMA = 100.0, 95.0, 0.04, 1.0, 0.3
+
+
+def call_payoff(paths):
+    return np.maximum(0, paths[:, -1] - K)
+
+
+# ----------------------------------- BUMP-AND-REVALUE GREEKS ----------------------------------------------
+
+def test_base_scenario_is_the_simulated_price():
+    greeks = bump_greeks(call_payoff, S_0, r, SIGMA, T, 20_000, N=4, div_yield=0.01, random_seed=9)
+    paths = simulate_gbm(S_0, r, SIGMA, T / 4, 20_000, 4, 0.01, random_seed=9)
+    assert greeks.price.value == pytest.approx(np.exp(-r * T) * call_payoff(paths).mean(), rel=1e-12)
+
+
+def test_vanilla_greeks_match_black_scholes():
+    greeks = bump_greeks(call_payoff, S_0, r, SIGMA, T, 100_000, N=4, random_seed=9)
+    d1 = (np.log(S_0 / K) + (r + 0.5 * SIGMA**2) * T) / (SIGMA * np.sqrt(T))
+    d2 = d1 - SIGMA * np.sqrt(T)
+    expected = dict(price=black_scholes_call_value(S_0, K, r, T, SIGMA), delta=norm.cdf(d1),
+                    gamma=norm.pdf(d1) / (S_0 * SIGMA * np.sqrt(T)), vega=S_0 * norm.pdf(d1) * np.sqrt(T),
+                    rho=K * T * np.exp(-r * T) * norm.cdf(d2))
+    for name, value in expected.items():
+        estimate = getattr(greeks, name)
+        assert abs(estimate.value - value) < 4 * estimate.std_error, name
+    # common random numbers: the delta is far tighter than two independent prices would give
+    assert greeks.delta.std_error * 2 * S_0 * 0.01 < 0.1 * greeks.price.std_error
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from gbm import simulate_gbm, stream_gbm, terminal_prices
+from control_variate import vanilla_control_price, vanilla_control_variate
+
+S_0, K, r, T, sigma, q = 100.0, 105.0, 0.04, 1.0, 0.3, 0.02
+N = 12
+
+
+def put_payoff(block):
+    payoff = np.maximum(0, K - terminal_prices(block))
+    return payoff, payoff > 0
+
+
+def call_payoff(block):
+    payoff = np.maximum(0, terminal_prices(block) - K)
+    return payoff, payoff > 0
+
+
+# ----------------------------------- CONTROL VARIATES ----------------------------------------------
+
+def test_the_control_itself_prices_exactly():
+    paths = simulate_gbm(S_0, r, sigma, T / N, 20_000, N, q, random_seed=1)
+    estimate = vanilla_control_variate(paths, call_payoff, K, S_0, r, T, sigma, q)
+    assert estimate.beta == pytest.approx(1.0)
+    assert estimate.price == pytest.approx(vanilla_control_price(S_0, K, r, T, sigma, q), rel=1e-10)
+
+
+@pytest.mark.parametrize('random_seed', [2, 3, 4])
+def test_control_variate_is_unbiased_against_the_closed_form(random_seed):
+    # a put with the call as control: correlated, but not a copy of the control
+    paths = simulate_gbm(S_0, r, sigma, T / N, 50_000, N, q, random_seed=random_seed)
+    estimate = vanilla_control_variate(paths, put_payoff, K, S_0, r, T, sigma, q)
+    exact = vanilla_control_price(S_0, K, r, T, sigma, q, 'put')
+    assert abs(estimate.price - exact) < 4 * estimate.std_error
+    assert estimate.std_error < estimate.raw_std_error and estimate.variance_reduction_factor > 1
+
+
+def test_control_variate_stream_equals_matrix():
+    matrix = simulate_gbm(S_0, r, sigma, T / N, 5000, N, q, random_seed=5)
+    stream = stream_gbm(S_0, r, sigma, T / N, 5000, N, q, random_seed=5, memory_budget=8 * (N + 1) * 600)
+    got = vanilla_control_variate(stream, put_payoff, K, S_0, r, T, sigma, q)
+    expected = vanilla_control_variate(matrix, put_payoff, K, S_0, r, T, sigma, q)
+    for a, b in zip(got, expected):
+        assert a == pytest.approx(b, rel=1e-10)
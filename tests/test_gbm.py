@@ -0,0 +1,143 @@
+import warnings
+
+import numpy as np
+import pytest
+
+import gbm
+from gbm import (PhiloxNormals, first_hit_step, regenerate_paths, simulate_gbm, simulate_gbm_summary, stream_gbm,
+                 terminal_prices, path_max, path_min)
+
+S_0, MU, SIGMA, Q = 100.0, 0.03, 0.25, 0.01
+N = 20
+DT = 1 / 252
+
+
+# ----------------------------------- GBM PATH ENGINE ----------------------------------------------
+
+def test_simulate_gbm_terminal_log_moments():
+    paths = simulate_gbm(S_0, MU, SIGMA, DT, 200_000, N, Q, random_seed=1)
+    assert paths.shape == (200_000, N + 1) and (paths[:, 0] == S_0).all()
+    T = N * DT
+    log_return = np.log(paths[:, -1] / S_0)
+    assert log_return.mean() == pytest.approx((MU - Q - 0.5 * SIGMA**2) * T, abs=4 * SIGMA * np.sqrt(T / 200_000))
+    assert log_return.var() == pytest.approx(SIGMA**2 * T, rel=0.01)
+
+
+def test_simulate_gbm_writes_into_out():
+    expected = simulate_gbm(S_0, MU, SIGMA, DT, 1000, N, Q, random_seed=2)
+    out = np.empty((1000, N + 1))
+    assert simulate_gbm(S_0, MU, SIGMA, DT, 1000, N, Q, random_seed=2, out=out) is out
+    np.testing.assert_array_equal(out, expected)
+    with pytest.raises(ValueError):
+        simulate_gbm(S_0, MU, SIGMA, DT, 1000, N, Q, out=np.empty((1000, N)))
+
+
+def test_simulate_gbm_float32():
+    paths = simulate_gbm(S_0, MU, SIGMA, DT, 1000, N, Q, random_seed=3, dtype=np.float32)
+    assert paths.dtype == np.float32 and np.isfinite(paths).all()
+    with pytest.raises(ValueError):
+        simulate_gbm(S_0, MU, SIGMA, DT, 1000, N, Q, dtype=np.int64)
+
+
+def test_stream_blocks_concatenate_to_the_matrix():
+    matrix = simulate_gbm(S_0, MU, SIGMA, DT, 4161, N, Q, random_seed=7)
+    blocks = [block.copy() for block in stream_gbm(S_0, MU, SIGMA, DT, 4161, N, Q, random_seed=7,
+                                                   memory_budget=8 * (N + 1) * 500)]
+    assert len(blocks) == 9 and max(len(block) for block in blocks) <= 500
+    np.testing.assert_array_equal(np.concatenate(blocks), matrix)
+
+
+def test_summary_matches_the_path_matrix():
+    paths = simulate_gbm(S_0, MU, SIGMA, DT, 3000, N, Q, random_seed=5)
+    summary = simulate_gbm_summary(S_0, MU, SIGMA, DT, 3000, N, Q, random_seed=5, barriers=(110, 90),
+                                   track_average=True, memory_budget=8 * (N + 1) * 400)
+    for accessor in (terminal_prices, path_max, path_min):
+        np.testing.assert_allclose(accessor(summary), accessor(paths), rtol=1e-12)
+    np.testing.assert_allclose(summary.average, paths.mean(axis=1), rtol=1e-12)
+
+    up, down = paths >= 110, paths < 90
+    for key, crossed in (((110, 'up'), up), ((90, 'down'), down)):
+        expected = np.where(crossed.any(axis=1), crossed.argmax(axis=1), -1)
+        np.testing.assert_array_equal(summary.first_hit[key], expected)
+
+
+def path_normals(paths, mu, sigma, dt, div_yield=0.0):
+    """The standard normals a path matrix was built from."""
+    return (np.diff(np.log(paths), axis=1) - (mu - div_yield - 0.5 * sigma**2) * dt) / (sigma * np.sqrt(dt))
+
+
+def test_sobol_increments_are_standard_normal_and_uncorrelated():
+    z = path_normals(simulate_gbm(S_0, MU, SIGMA, DT, 4096, N, Q, random_seed=6, sampling='sobol'), MU, SIGMA, DT, Q)
+    np.testing.assert_allclose(z.mean(axis=0), 0.0, atol=0.01)
+    np.testing.assert_allclose(z.std(axis=0), 1.0, atol=0.01)
+    correlation = np.corrcoef(z, rowvar=False)
+    assert np.abs(correlation - np.eye(N)).max() < 0.05
+
+
+def test_sobol_stream_equals_the_matrix():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore') # 4161 is not a power of 2
+        matrix = simulate_gbm(S_0, MU, SIGMA, DT, 4161, N, Q, random_seed=7, sampling='sobol')
+        stream = [block.copy() for block in stream_gbm(S_0, MU, SIGMA, DT, 4161, N, Q, random_seed=7,
+                                                       memory_budget=8 * (N + 1) * 500, sampling='sobol')]
+    np.testing.assert_array_equal(np.concatenate(stream), matrix)
+
+
+@pytest.mark.parametrize('variance_reduction', ['antithetic', 'moment_matching'])
+@pytest.mark.parametrize('sampling', ['pseudo', 'sobol'])
+def test_variance_reduced_stream_equals_the_matrix(sampling, variance_reduction):
+    # blocks of 500 rows and an odd-sized last block: moment matching must still use the whole sample
+    n_sims = 4162 if variance_reduction == 'antithetic' else 4161 # antithetic pairs need an even n_sims
+    kwargs = dict(random_seed=7, sampling=sampling, variance_reduction=variance_reduction)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore') # Sobol' with n_sims not a power of 2
+        matrix = simulate_gbm(S_0, MU, SIGMA, DT, n_sims, N, Q, **kwargs)
+        stream = [block.copy() for block in stream_gbm(S_0, MU, SIGMA, DT, n_sims, N, Q,
+                                                       memory_budget=8 * (N + 1) * 500, **kwargs)]
+    assert np.isfinite(matrix).all()
+    np.testing.assert_array_equal(np.concatenate(stream), matrix)
+
+
+def test_antithetic_rows_are_mirrored():
+    paths = simulate_gbm(S_0, MU, SIGMA, DT, 1000, N, Q, random_seed=8, variance_reduction='antithetic')
+    z = path_normals(paths, MU, SIGMA, DT, Q)
+    np.testing.assert_allclose(z[0::2], -z[1::2], atol=1e-9)
+    with pytest.raises(ValueError):
+        simulate_gbm(S_0, MU, SIGMA, DT, 999, N, Q, variance_reduction='antithetic')
+
+
+def test_moment_matching_over_the_whole_sample():
+    paths = simulate_gbm(S_0, MU, SIGMA, DT, 4161, N, Q, random_seed=9, variance_reduction='moment_matching')
+    z = path_normals(paths, MU, SIGMA, DT, Q)
+    np.testing.assert_allclose(z.mean(axis=0), 0.0, atol=1e-10)
+    np.testing.assert_allclose(z.std(axis=0), 1.0, rtol=1e-10)
+    with pytest.raises(ValueError):
+        simulate_gbm(S_0, MU, SIGMA, DT, 1, N, Q, variance_reduction='moment_matching')
+
+
+def test_regenerate_paths_rebuilds_philox_rows():
+    paths = simulate_gbm(S_0, MU, SIGMA, DT, 3000, N, Q, random_seed=10, sampling='philox')
+    rows = [2999, 0, 1234, 1234, 17]
+    np.testing.assert_array_equal(regenerate_paths(rows, S_0, MU, SIGMA, DT, N, Q, random_seed=10), paths[rows])
+    tail = simulate_gbm(S_0, MU, SIGMA, DT, 1000, N, Q, random_seed=10, sampling='philox', first_path=2000)
+    np.testing.assert_array_equal(tail, paths[2000:])
+
+
+def test_philox_top_uniform_stays_finite(monkeypatch):
+    # every output word at 2**32 - 1 is the largest 53-bit integer, whose u + half an ulp rounds to 1
+    def all_ones(c0, c1, c2, c3, key):
+        return (np.broadcast_to(gbm.MASK_32, np.broadcast_shapes(c0.shape, c2.shape)),) * 4
+    monkeypatch.setattr(gbm, 'philox4x32', all_ones)
+    z = PhiloxNormals(N, random_seed=1).standard_normal(out=np.empty((3, N)))
+    assert np.isfinite(z).all() and (z > 8).all()
+
+
+def test_first_hit_step_summary_agrees_with_the_matrix_and_checks_direction():
+    paths = simulate_gbm(S_0, MU, SIGMA, DT, 2000, N, Q, random_seed=11)
+    summary = simulate_gbm_summary(S_0, MU, SIGMA, DT, 2000, N, Q, random_seed=11, barriers=(105, 95))
+    for B, direction in ((105, 'up'), (95, 'down')):
+        np.testing.assert_array_equal(first_hit_step(summary, B, direction), first_hit_step(paths, B, direction))
+    with pytest.raises(ValueError, match="'up' barrier"):
+        first_hit_step(summary, 105, 'down')
+    with pytest.raises(ValueError, match="barriers="):
+        first_hit_step(summary, 120, 'up')
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from bs_kernel import bs_greeks
+from digital import digital_price
+from digital_greeks import digital_delta, digital_gamma, digital_vega, digital_theta, digital_rho
+from greek_surface import greek_surface
+from Vanilla.vanilla_greeks import call_theta
+
+SPOTS, VOLS, TENORS = np.array([80.0, 100.0, 120.0]), np.array([0.1, 0.3]), np.array([0.25, 1.0, 2.0, 5.0])
+
+
+# ----------------------------------- GREEK SURFACES ----------------------------------------------
+
+def test_every_kind_of_greek_matches_pointwise_evaluation():
+    cubes = greek_surface(['gamma', 'vanna', 'digital_vega', call_theta], SPOTS, VOLS, TENORS, 100.0, 0.03,
+                          option_type='put', cash_payoff=10.0, output='numpy')
+    assert all(cube.shape == (3, 2, 4) for cube in cubes.values())
+    for i, S in enumerate(SPOTS):
+        for j, vol in enumerate(VOLS):
+            for k, T in enumerate(TENORS):
+                kernel = bs_greeks(S, 100.0, 0.03, T, vol, option_type='put', greeks=('gamma', 'vanna'))
+                assert cubes['gamma'][i, j, k] == pytest.approx(float(kernel['gamma']), rel=1e-12)
+                assert cubes['vanna'][i, j, k] == pytest.approx(float(kernel['vanna']), rel=1e-12)
+                assert cubes['digital_vega'][i, j, k] == pytest.approx(
+                    float(digital_vega(S, 100.0, 0.03, vol, T, 'put', 10.0)), rel=1e-12)
+                assert cubes['call_theta'][i, j, k] == pytest.approx(call_theta(S, 100.0, 0.03, T, vol), rel=1e-12)
+
+
+def test_frame_output_is_indexed_by_spot_vol_tenor():
+    frame = greek_surface(['price', 'delta'], SPOTS, VOLS, TENORS, 100.0, 0.03, output='frame')
+    assert list(frame.columns) == ['price', 'delta'] and frame.index.names == ['spot', 'vol', 'tenor']
+    cube = greek_surface('delta', SPOTS, VOLS, TENORS, 100.0, 0.03, output='numpy')['delta']
+    np.testing.assert_array_equal(frame['delta'].to_numpy().reshape(cube.shape), cube)
+    assert frame.loc[(100.0, 0.3, 1.0), 'price'] == pytest.approx(
+        float(bs_greeks(100.0, 100.0, 0.03, 1.0, 0.3, greeks=('price',))['price']))
+
+
+def test_unknown_greeks_and_outputs_are_rejected():
+    with pytest.raises(ValueError):
+        greek_surface('volga', SPOTS, VOLS, TENORS, 100.0, 0.03)
+    with pytest.raises(ValueError):
+        greek_surface('delta', SPOTS, VOLS, TENORS, 100.0, 0.03, output='table')
+
+
+# ----------------------------------- DIGITAL GREEKS ----------------------------------------------
+
+# Greek -> (bumped argument, sign: theta is d/dt = -d/dT)
+DIGITAL_BUMPS = {
+    digital_delta: ('S', 1), digital_vega: ('sigma', 1), digital_theta: ('T', -1), digital_rho: ('r', 1),
+}
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+@pytest.mark.parametrize('greek', list(DIGITAL_BUMPS), ids=lambda f: f.__name__)
+def test_digital_greeks_match_finite_differences(greek, option_type):
+    args = dict(S=np.array([85.0, 100.0, 115.0]), K=100.0, r=0.04, sigma=0.3, T=0.5)
+    bumped, sign = DIGITAL_BUMPS[greek]
+    h = 1e-5 * max(1.0, float(np.max(args[bumped])))
+
+    up = digital_price(**dict(args, **{bumped: args[bumped] + h}), option_type=option_type, cash_payoff=10.0)
+    down = digital_price(**dict(args, **{bumped: args[bumped] - h}), option_type=option_type, cash_payoff=10.0)
+    analytic = greek(**args, option_type=option_type, cash_payoff=10.0)
+    np.testing.assert_allclose(analytic, sign * (up - down) / (2 * h), rtol=1e-5, atol=1e-8)
+
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_digital_gamma_matches_finite_differences(option_type):
+    S, h = np.array([85.0, 100.0, 115.0]), 1e-3
+    price = [digital_price(S + bump, 100.0, 0.04, 0.3, 0.5, option_type, 10.0) for bump in (h, 0.0, -h)]
+    fd = (price[0] - 2 * price[1] + price[2]) / h**2
+    np.testing.assert_allclose(digital_gamma(S, 100.0, 0.04, 0.3, 0.5, option_type, 10.0), fd, rtol=1e-5, atol=1e-8)
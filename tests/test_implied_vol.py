@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from bs_kernel import bs_greeks
+from implied_vol import implied_vol
+
+# ----------------------------------- IMPLIED VOL ----------------------------------------------
+
+@pytest.mark.parametrize('option_type', ['call', 'put'])
+def test_implied_vol_round_trip(option_type):
+    K = np.array([50.0, 80.0, 100.0, 120.0, 200.0])[:, None, None]
+    T = np.array([0.02, 0.5, 3.0])[None, :, None]
+    vol = np.array([0.05, 0.2, 0.6, 1.5])[None, None, :]
+    price = bs_greeks(100.0, K, 0.03, T, vol, 0.01, option_type, ('price',))['price']
+
+    recovered = implied_vol(price, 100.0, K, 0.03, T, 0.01, option_type)
+    # quotes whose time value is lost in double precision carry no vol information (NaN by design)
+    informative = price - np.maximum(0, (100.0 * np.exp(-0.01 * T) - K * np.exp(-0.03 * T))
+                                     * (1 if option_type == 'call' else -1)) > 1e-10 * price
+    np.testing.assert_allclose(recovered[informative], np.broadcast_to(vol, price.shape)[informative], rtol=1e-8)
+
+
+def test_implied_vol_scalar_and_bounds():
+    price = float(bs_greeks(100.0, 105.0, 0.02, 1.0, 0.3, option_type='call', greeks=('price',))['price'])
+    assert implied_vol(price, 100.0, 105.0, 0.02, 1.0) == pytest.approx(0.3, rel=1e-10)
+    assert np.isnan(implied_vol(150.0, 100.0, 105.0, 0.02, 1.0)) # above the forward: no vol
+    assert np.isnan(implied_vol(1.0, 100.0, 80.0, 0.02, 1.0)) # below intrinsic: no vol
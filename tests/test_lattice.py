@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from lattice import lattice_price
+from barrier_analytic import barrier_price
+from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_put_value
+
+S = np.array([90.0, 100.0, 110.0])
+K, r, T, SIGMA = 100.0, 0.05, 1.0, 0.25
+
+
+# ----------------------------------- BINOMIAL / TRINOMIAL LATTICE ----------------------------------------------
+
+@pytest.mark.parametrize('method', ['binomial', 'trinomial'])
+def test_european_limit_is_black_scholes(method):
+    option_type = np.array(['call', 'put', 'call'])
+    prices = lattice_price(S, K, r, T, SIGMA, option_type=option_type, exercise='european', steps=800, method=method)
+    expected = [black_scholes_call_value(S[0], K, r, T, SIGMA), black_scholes_put_value(S[1], K, r, T, SIGMA),
+                black_scholes_call_value(S[2], K, r, T, SIGMA)]
+    np.testing.assert_allclose(prices, expected, atol=5e-3)
+
+
+def test_trinomial_up_and_out_converges_to_the_closed_form():
+    exact = barrier_price(S, K, 130.0, r, T, SIGMA, 0.0, 'up-and-out', 'call')
+    kwargs = dict(option_type='call', exercise='european', BARRIER=130.0)
+    trinomial = lattice_price(S, K, r, T, SIGMA, steps=800, method='trinomial', **kwargs)
+    binomial = lattice_price(S, K, r, T, SIGMA, steps=800, method='binomial', **kwargs)
+    np.testing.assert_allclose(trinomial, exact, atol=6e-3)
+    # the barrier on a node layer removes the binomial tree's barrier offset
+    assert (np.abs(trinomial - exact) < 0.2 * np.abs(binomial - exact)).all()
+
+    down = lattice_price(S, K, r, T, SIGMA, 0.02, 'put', 'european', 800, 'trinomial', 85.0, 'down-and-out', rebate=1.0)
+    np.testing.assert_allclose(down, barrier_price(S, K, 85.0, r, T, SIGMA, 0.02, 'down-and-out', 'put', 1.0), atol=3e-3)
+
+
+def test_american_put_with_richardson_and_control():
+    # 5.79886 from a 10,000-step binomial tree
+    assert lattice_price(100, 100, 0.06, 1, 0.2, steps=400, richardson=True, control=True) == pytest.approx(5.79886, abs=2e-4)
+    european = lattice_price(100, 100, 0.06, 1, 0.2, exercise='european', steps=400)
+    assert lattice_price(100, 100, 0.06, 1, 0.2, steps=400) > european
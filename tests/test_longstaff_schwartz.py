@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from lattice import lattice_price
+from longstaff_schwartz import longstaff_schwartz
+
+# Bermudan put, S = K = 100, r = 5%, vol 25%, T = 0.5, exercisable on the 10 simulation dates
+ARGS = (100, 100, 0.05, 0.5, 0.25)
+EXERCISE_TIMES = np.arange(1, 11) * 0.05
+
+
+# ----------------------------------- LONGSTAFF-SCHWARTZ ----------------------------------------------
+
+@pytest.mark.parametrize('random_seed', [None, np.random.SeedSequence(4), 4])
+def test_low_estimate_matches_the_bermudan_tree(random_seed):
+    tree = lattice_price(*ARGS, exercise=EXERCISE_TIMES, steps=2000)
+    result = longstaff_schwartz(*ARGS, N=10, N_train=4000, N_test=4000, random_seed=random_seed)
+    assert abs(result.low.price - tree) < 5 * result.low.std_error
+    np.testing.assert_allclose(result.exercise_times, EXERCISE_TIMES)
+
+
+def test_an_int_seed_is_its_seed_sequence():
+    by_int = longstaff_schwartz(*ARGS, N=10, N_train=2000, N_test=2000, random_seed=4)
+    by_sequence = longstaff_schwartz(*ARGS, N=10, N_train=2000, N_test=2000, random_seed=np.random.SeedSequence(4))
+    assert by_int.low.price == by_sequence.low.price
+    np.testing.assert_array_equal(by_int.coefficients, by_sequence.coefficients)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from scipy.stats import norm
+
+from gbm import simulate_gbm
+from barrier_analytic import barrier_price
+from mc_greeks import barrier_greeks
+
+S_0, K, r, T, SIGMA, Q = 100.0, 100.0, 0.04, 1.0, 0.25, 0.01
+
+
+def finite_differences(price, h=1e-3, h_gamma=0.1):
+    """Central differences of price(S, sigma, r) at (S_0, SIGMA, r), as the BarrierGreeks fields."""
+    return dict(
+        price=price(S_0, SIGMA, r),
+        delta=(price(S_0 + h, SIGMA, r) - price(S_0 - h, SIGMA, r)) / (2 * h),
+        gamma=(price(S_0 + h_gamma, SIGMA, r) - 2 * price(S_0, SIGMA, r) + price(S_0 - h_gamma, SIGMA, r)) / h_gamma**2,
+        vega=(price(S_0, SIGMA + h, r) - price(S_0, SIGMA - h, r)) / (2 * h),
+        rho=(price(S_0, SIGMA, r + h) - price(S_0, SIGMA, r - h)) / (2 * h),
+    )
+
+
+def assert_within_std_errors(greeks, expected, n_std=4):
+    for name, value in expected.items():
+        estimate = getattr(greeks, name)
+        assert abs(estimate.value - value) < n_std * estimate.std_error, name
+
+
+# ----------------------------------- PATHWISE & LIKELIHOOD-RATIO GREEKS ----------------------------------------------
+
+@pytest.mark.parametrize('barrier_type, option_type, BARRIER', [('up-and-out', 'call', 125.0),
+                                                                ('down-and-in', 'put', 85.0)])
+def test_smoothed_pathwise_greeks_match_the_closed_form(barrier_type, option_type, BARRIER):
+    paths = simulate_gbm(S_0, r, SIGMA, T / 100, 40_000, 100, Q, random_seed=7)
+    greeks = barrier_greeks(paths, K, BARRIER, r, T, SIGMA, Q, barrier_type, option_type, 'continuous')
+    assert_within_std_errors(greeks, finite_differences(
+        lambda S, sigma, rate: float(barrier_price(S, K, BARRIER, rate, T, sigma, Q, barrier_type, option_type))))
+
+
+def test_likelihood_ratio_greeks_match_the_static_replication():
+    BARRIER = 125.0
+
+    def european_up_and_out(S, sigma, rate):
+        # pays (S_T - K)^+ when S_T < BARRIER: call(K) - call(BARRIER) - (BARRIER - K) digital(BARRIER)
+        def d2(X):
+            return (np.log(S / X) + (rate - Q - 0.5 * sigma**2) * T) / (sigma * np.sqrt(T))
+
+        def call(X):
+            return S * np.exp(-Q * T) * norm.cdf(d2(X) + sigma * np.sqrt(T)) - X * np.exp(-rate * T) * norm.cdf(d2(X))
+        return call(K) - call(BARRIER) - (BARRIER - K) * np.exp(-rate * T) * norm.cdf(d2(BARRIER))
+
+    paths = simulate_gbm(S_0, r, SIGMA, T / 4, 200_000, 4, Q, random_seed=8)
+    greeks = barrier_greeks(paths, K, BARRIER, r, T, SIGMA, Q, 'up-and-out', 'call', 'european')
+    assert_within_std_errors(greeks, finite_differences(european_up_and_out))
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from gbm import simulate_gbm, stream_gbm
+from mc_stats import RunningMoments, randomized_qmc, reduce_payoffs
+from Vanilla.blackscholesvanilla import black_scholes_call_value
+
+N = 20
+DT = 1 / 252
+
+
+def call_payoff(block, K=100.0):
+    payoff = np.maximum(0, block[:, -1] - K)
+    return payoff, payoff > 0
+
+
+# ----------------------------------- RUNNING MOMENTS ----------------------------------------------
+
+def test_running_moments_merge_equals_one_pass():
+    values = np.random.default_rng(0).lognormal(3.0, 1.0, 10_001)
+    one_pass = RunningMoments().update(values, values > 20).estimate(0.9)
+    merged = RunningMoments()
+    for chunk in np.array_split(values, 7):
+        merged.merge(RunningMoments().update(chunk, chunk > 20))
+    for got, expected in zip(merged.estimate(0.9), one_pass):
+        assert got == pytest.approx(expected, rel=1e-12)
+    assert one_pass.price == pytest.approx(0.9 * values.mean(), rel=1e-12)
+    assert one_pass.std_error == pytest.approx(0.9 * values.std(ddof=1) / np.sqrt(values.size), rel=1e-12)
+
+
+def test_paired_moments_average_each_pair_first():
+    values = np.random.default_rng(1).normal(size=2000)
+    paired = RunningMoments(paired=True).update(values).estimate()
+    pair_means = 0.5 * (values[0::2] + values[1::2])
+    assert paired.n_paths == 2000
+    assert paired.price == pytest.approx(values.mean(), rel=1e-12)
+    assert paired.std_error == pytest.approx(pair_means.std(ddof=1) / np.sqrt(1000), rel=1e-12)
+
+
+def test_reduce_payoffs_stream_equals_matrix():
+    matrix = simulate_gbm(100, 0.03, 0.25, DT, 5000, N, random_seed=4)
+    stream = stream_gbm(100, 0.03, 0.25, DT, 5000, N, random_seed=4, memory_budget=8 * (N + 1) * 700)
+    for got, expected in zip(reduce_payoffs(stream, call_payoff, 0.97), reduce_payoffs(matrix, call_payoff, 0.97)):
+        assert got == pytest.approx(expected, rel=1e-12)
+
+
+# ----------------------------------- RANDOMIZED QMC ----------------------------------------------
+
+def test_randomized_qmc_error_estimate_covers_the_closed_form():
+    r, sigma, T = 0.04, 0.3, N * DT
+    exact = black_scholes_call_value(100, 100, r, T, sigma)
+
+    def estimate_fn(paths):
+        return reduce_payoffs(paths, call_payoff, np.exp(-r * T))
+
+    qmc = randomized_qmc(estimate_fn, 100, r, sigma, DT, 1024, N, random_seed=8, n_replicates=8)
+    pseudo = estimate_fn(simulate_gbm(100, r, sigma, DT, 8 * 1024, N, random_seed=8))
+    assert qmc.n_paths == 8 * 1024 and 0 < qmc.std_error < pseudo.std_error / 10
+    assert abs(qmc.price - exact) < 5 * qmc.std_error
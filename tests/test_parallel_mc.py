@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from gbm import simulate_gbm
+from mc_stats import reduce_payoffs
+from parallel_mc import parallel_mc
+
+N = 20
+DT = 1 / 252
+
+
+def up_and_out_payoff(block, K=100.0, BARRIER=115.0):
+    """Picklable pay-off for the process pool: up-and-out call observed on every step."""
+    hit = block.max(axis=1) >= BARRIER
+    return ~hit * np.maximum(0, block[:, -1] - K), hit
+
+
+# ----------------------------------- PARALLEL MONTE-CARLO ----------------------------------------------
+
+def test_parallel_mc_does_not_depend_on_n_workers():
+    kwargs = dict(s_0=100, mu=0.03, sigma=0.25, dt=DT, n_sims=10_000, N=N, random_seed=11, chunk_size=2048)
+    serial = parallel_mc(up_and_out_payoff, n_workers=1, **kwargs)
+    assert parallel_mc(up_and_out_payoff, n_workers=3, **kwargs) == serial
+    assert serial.n_paths == 10_000
+
+
+def test_parallel_mc_chunks_are_spawned_streams():
+    seeds = np.random.SeedSequence(12).spawn(3)
+    paths = np.concatenate([simulate_gbm(100, 0.03, 0.25, DT, n, N, random_seed=seed)
+                            for seed, n in zip(seeds, (1024, 1024, 952))])
+    expected = reduce_payoffs(paths, up_and_out_payoff, 0.98)
+    got = parallel_mc(up_and_out_payoff, 100, 0.03, 0.25, DT, 3000, N, random_seed=12, discount_factor=0.98,
+                      n_workers=1, chunk_size=1024)
+    for a, b in zip(got, expected):
+        assert a == pytest.approx(b, rel=1e-12)
+
+
+def test_parallel_mc_philox_chunks_are_the_serial_paths():
+    pooled = parallel_mc(up_and_out_payoff, 100, 0.03, 0.25, DT, 5000, N, random_seed=5, n_workers=2,
+                         chunk_size=1024, sampling='philox')
+    paths = simulate_gbm(100, 0.03, 0.25, DT, 5000, N, random_seed=5, sampling='philox')
+    for a, b in zip(pooled, reduce_payoffs(paths, up_and_out_payoff)):
+        assert a == pytest.approx(b, rel=1e-12)
@@ -0,0 +1,85 @@
+import gc
+import os
+
+import numpy as np
+
+from gbm import simulate_gbm
+from path_cache import PathCache
+from barrier_monitoring import ObservationSchedule
+
+N = 20
+DT = 1 / 252
+ENTRY_BYTES = 1000 * (N + 1) * 8 # one 1000-path matrix
+
+
+def simulate(cache, s_0):
+    return cache.simulate_gbm(s_0, 0.03, 0.25, DT, 1000, N)
+
+
+# ----------------------------------- PATH CACHE ----------------------------------------------
+
+def test_repeat_requests_are_served_from_ram():
+    cache = PathCache()
+    first = simulate(cache, 100)
+    assert simulate(cache, 100) is first and (cache.hits, cache.misses) == (1, 1)
+    assert not first.flags.writeable
+    np.testing.assert_array_equal(first, simulate_gbm(100, 0.03, 0.25, DT, 1000, N))
+
+
+def test_spilled_entries_come_back_memory_mapped(tmp_path):
+    cache = PathCache(max_bytes=ENTRY_BYTES, spill_dir=str(tmp_path))
+    first = np.array(simulate(cache, 100))
+    simulate(cache, 101) # pushes the first entry to disk
+    assert cache.ram_bytes == ENTRY_BYTES and len(os.listdir(tmp_path)) == 1
+    again = simulate(cache, 100)
+    assert isinstance(again, np.memmap) and cache.hits == 1
+    np.testing.assert_array_equal(again, first)
+
+
+def test_disk_budget_deletes_the_oldest_spills(tmp_path):
+    cache = PathCache(max_bytes=ENTRY_BYTES, spill_dir=str(tmp_path), max_disk_bytes=int(2.5 * ENTRY_BYTES))
+    for s_0 in range(100, 106):
+        simulate(cache, s_0)
+    assert len(os.listdir(tmp_path)) == 2 and cache.disk_bytes <= cache.max_disk_bytes
+    simulate(cache, 100) # the oldest spill was deleted: simulated again
+    assert cache.misses == 7
+
+
+def test_clear_removes_the_temporary_spill_directory():
+    cache = PathCache(max_bytes=ENTRY_BYTES)
+    simulate(cache, 100)
+    simulate(cache, 101)
+    spill_dir = cache.spill_dir
+    assert os.listdir(spill_dir)
+    cache.clear()
+    assert not os.path.exists(spill_dir) and cache.disk_bytes == 0
+    simulate(cache, 100) # still usable after clear
+    assert cache.misses == 3
+
+
+def test_spill_directory_is_removed_with_the_cache():
+    cache = PathCache(max_bytes=ENTRY_BYTES)
+    simulate(cache, 100)
+    simulate(cache, 101)
+    spill_dir = cache.spill_dir
+    del cache
+    gc.collect()
+    assert not os.path.exists(spill_dir)
+
+
+def test_user_spill_directory_is_kept(tmp_path):
+    cache = PathCache(max_bytes=ENTRY_BYTES, spill_dir=str(tmp_path))
+    simulate(cache, 100)
+    simulate(cache, 101)
+    cache.clear()
+    assert os.path.isdir(tmp_path) and not os.listdir(tmp_path)
+
+
+def test_an_array_dt_is_part_of_the_key():
+    monthly = ObservationSchedule.every(1 / 12, T=1)
+    cache = PathCache()
+    first = cache.simulate_gbm(100, 0.03, 0.25, monthly.dt, 1000, monthly.N)
+    second = cache.simulate_gbm(100, 0.03, 0.25, monthly.dt.copy(), 1000, monthly.N)
+    assert second is first and (cache.hits, cache.misses) == (1, 1)
+    cache.simulate_gbm(100, 0.03, 0.25, monthly.dt * 2, 1000, monthly.N)
+    assert cache.misses == 2
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from Vanilla.blackscholesvanilla import black_scholes_call_value, black_scholes_put_value
+from Vanilla import vanilla_greeks
+
+FUNCTIONS = [black_scholes_call_value, black_scholes_put_value, vanilla_greeks.gamma, vanilla_greeks.vega,
+             vanilla_greeks.call_delta, vanilla_greeks.call_theta, vanilla_greeks.call_rho,
+             vanilla_greeks.put_delta, vanilla_greeks.put_theta, vanilla_greeks.put_rho]
+QUOTES = [(45.0, 45.0, 0.02, 164 / 365, 0.25), (100, 80, 0.05, 2, 0.6), (30.0, 60.0, -0.01, 0.01, 0.1)]
+
+
+# ----------------------------------- SCALAR FAST PATH ----------------------------------------------
+
+@pytest.mark.parametrize('fn', FUNCTIONS, ids=lambda f: f.__name__)
+def test_scalar_path_matches_the_array_path(fn):
+    columns = [np.array(column, dtype=np.float64) for column in zip(*QUOTES)]
+    vector = fn(*columns)
+    for i, quote in enumerate(QUOTES):
+        scalar = fn(*quote)
+        assert type(scalar) is float
+        assert scalar == pytest.approx(vector[i], rel=1e-12, abs=1e-300)
+        # elements of an array are np.float64, a float subclass: they take the fast path too
+        assert fn(*(column[i] for column in columns)) == scalar
+
+
+def test_degenerate_scalars_take_the_array_path():
+    # T = 0 is outside the fast path's domain; the array code keeps its NumPy behaviour there
+    with np.errstate(divide='ignore', invalid='ignore'):
+        assert black_scholes_call_value(110.0, 100.0, 0.05, 0.0, 0.2) == pytest.approx(10.0)
+    assert vanilla_greeks.phi(0.0) == pytest.approx(1 / np.sqrt(2 * np.pi))
+    np.testing.assert_allclose(vanilla_greeks.phi(np.array([0.0, 1.0])), np.exp(-0.5 * np.array([0.0, 1.0])) / np.sqrt(2 * np.pi))
@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from gbm import simulate_gbm
+from UpAndOut import UpAndOut_estimate, up_and_out_mtm_matrix
+
+
+# ----------------------------------- MTM MATRIX ----------------------------------------------
+
+def test_mtm_matrix_is_the_scaled_prefix_of_one_simulation(tmp_path):
+    S_0, r, sigma, K, BARRIER, n_sims, N_per_year = 70.0, 0.05, 0.25, 60, 80, 4000, 52
+    tenors, price_factors = (0.5, 1.0), (0.9, 1.1)
+    matrix = up_and_out_mtm_matrix(S_0, price_factors, tenors, r, sigma, K, BARRIER, n_sims, N_per_year,
+                                   excel_file=str(tmp_path / 'mtm.xlsx'))
+
+    for pf in price_factors:
+        # the same normals from each spot directly: GBM is linear in s_0
+        paths = simulate_gbm(S_0 * pf, r, sigma, 1 / N_per_year, n_sims, N_per_year)
+        for T in tenors:
+            expected = UpAndOut_estimate(paths[:, :int(N_per_year * T) + 1], K, BARRIER, np.exp(-r * T), 'daily').price
+            assert matrix.loc[f"{int(pf * 100)}%", T] == pytest.approx(expected, rel=1e-9)
+
+
+def test_mtm_matrix_rejects_a_fractional_number_of_steps(tmp_path):
+    with pytest.raises(ValueError):
+        up_and_out_mtm_matrix(70.0, tenors=(0.1,), N_per_year=252, excel_file=str(tmp_path / 'mtm.xlsx'))
+    with pytest.raises(ValueError):
+        up_and_out_mtm_matrix(70.0, observation='continuous', excel_file=str(tmp_path / 'mtm.xlsx'))